@@ -0,0 +1,117 @@
+"""
+Selecting and deleting many nodes at once, as after a rubber band selection.
+
+An item per node: selecting the items one by one and removing each with Graphics_Node.remove, as
+delete_selected used to, against select_items and remove_items. "delete ms" is how long the view is
+blocked, and the rest of the removal happens in passes of the event loop, of which the longest is shown.
+A virtualized model scene: removing the nodes and their edges through the history, and undoing it.
+
+    python -m benchmark.bench_bulk_delete [node_count] [deleted_count]
+"""
+import sys
+import time
+
+from benchmark.common import application, print_table
+
+SPACING = 250
+
+
+def item_scene(node_count):
+    from PySide6.QtCore import QPoint
+    from PySide6.QtGui import QTransform
+    from src.ui.graphics_node import Graphics_Node
+    from src.ui.graphics_scene import Graphics_Scene
+
+    graphics_scene = Graphics_Scene()
+    columns = int(node_count**0.5) or 1
+    items = [
+        Graphics_Node(f"Node {index}", position=QPoint((index % columns) * SPACING, (index // columns) * SPACING))
+        for index in range(node_count)
+    ]
+    for item in items:
+        graphics_scene.add_node(item)
+    # Build the index before measuring, as a scene which has been painted would have.
+    graphics_scene.itemAt(0, 0, QTransform())
+    return graphics_scene, items
+
+
+def one_by_one(graphics_scene, items):
+    for item in items:
+        item.setSelected(True)
+    selected = time.perf_counter()
+    for item in graphics_scene.selectedItems():
+        item.remove()
+    return selected, list()
+
+
+def bulk(graphics_scene, items):
+    from src.ui.constants import REMOVAL_BATCH
+
+    graphics_scene.select_items(items)
+    selected = time.perf_counter()
+    graphics_scene.remove_items(graphics_scene.selectedItems())
+    deleted = time.perf_counter()
+    passes = list()
+    while graphics_scene._removed_items:
+        start = time.perf_counter()
+        graphics_scene.flush_removed_items(REMOVAL_BATCH)
+        passes.append((time.perf_counter() - start) * 1000)
+    return selected, deleted, passes
+
+
+def model_scene(node_count):
+    from src.model.edge import Edge
+    from src.model.group import Group
+    from src.model.scene import Scene
+    from src.ui.graphics_scene import Graphics_Scene
+
+    scene = Scene()
+    scene.add_group(Group(scene, "/g"))
+    columns = int(node_count**0.5) or 1
+    ids = [f"node-{index}" for index in range(node_count)]
+    scene.add_nodes(
+        ids, groups=["/g"] * node_count,
+        positions=[((index % columns) * SPACING, (index // columns) * SPACING) for index in range(node_count)]
+    )
+    scene.get_group("/g").nodes = list(ids)
+    for index in range(node_count - 1):
+        scene.add_edge(Edge(scene, f"edge-{index}", {'node': ids[index]}, {'node': ids[index + 1]}))
+    scene.build_spatial_index()
+    graphics_scene = Graphics_Scene()
+    graphics_scene.set_model(scene)
+    return graphics_scene, ids
+
+
+def main(node_count=75_000, deleted_count=50_000):
+    application()
+    rows = list()
+    for name, delete in (("bulk", bulk), ("one by one", one_by_one)):
+        graphics_scene, items = item_scene(node_count)
+        start = time.perf_counter()
+        selected, *deleted, passes = delete(graphics_scene, items[:deleted_count])
+        end = time.perf_counter()
+        deleted = deleted[0] if deleted else end
+        rows.append((
+            f"items, {name}", f"{(selected - start) * 1000:.0f}", f"{(deleted - selected) * 1000:.0f}",
+            f"{(end - deleted) * 1000:.0f}" if passes else "-", f"{max(passes):.0f}" if passes else "-", "-"
+        ))
+        assert len(graphics_scene.items()) == 2 * (node_count - deleted_count)
+        # Each scene of items takes gigabytes, so free one before building the next.
+        graphics_scene.clear()
+        del graphics_scene, items
+
+    graphics_scene, ids = model_scene(node_count)
+    start = time.perf_counter()
+    graphics_scene.history.remove_nodes(ids[:deleted_count])
+    graphics_scene.history.scene.journal.flush()
+    deleted = time.perf_counter()
+    graphics_scene.history.undo()
+    graphics_scene.history.scene.journal.flush()
+    undone = time.perf_counter()
+    rows.append(("model, history", "-", f"{(deleted - start) * 1000:.0f}", "-", "-", f"{(undone - deleted) * 1000:.0f}"))
+    print(f"{deleted_count:,} of {node_count:,} nodes")
+    print_table(("scene", "select ms", "delete ms", "removal ms", "longest pass ms", "undo ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,83 @@
+"""
+The conduits to draw at each magnification: counted from every connection for each frame, against read
+from the scene's conduit table.
+
+    python -m benchmark.bench_conduits [group_count] [nodes_per_group]
+"""
+import random
+import statistics
+import sys
+import time
+
+from benchmark.common import print_table, summarise, time_calls
+from benchmark.synthetic import synthetic_scene
+
+DEPTH = 3
+FAN_OUT = 4
+CROSS_EDGES = 0.1
+LEVELS = (-1, 0, 1)
+EDITS = 1000
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def count_connections(scene, level: int) -> dict:
+    """What drawing conduits costs without the table: every connection, walked up to its drawn groups."""
+    def drawn(group):
+        if group is None or group.visible_at(level):
+            return None
+        while group.parent is not None and not group.parent.visible_at(level):
+            group = group.parent
+        return group.id
+
+    conduits = dict()
+    nodes = scene.nodes
+    for edge in scene.edges:
+        start, end = nodes.get(edge.start.get('node')), nodes.get(edge.end.get('node'))
+        if start is None or end is None:
+            continue
+        conduit = (drawn(scene.get_group(start.group)), drawn(scene.get_group(end.group)))
+        if None not in conduit and conduit[0] != conduit[1]:
+            conduits[conduit] = conduits.get(conduit, 0) + 1
+    return conduits
+
+
+def main(group_count=40, nodes_per_group=100):
+    from src.model.edge import Edge
+
+    rng = random.Random(0)
+    scene = synthetic_scene(group_count, nodes_per_group, DEPTH, FAN_OUT)
+    node_ids = list(scene.nodes)
+    for index in range(int(len(scene.edges) * CROSS_EDGES)):
+        start, end = rng.sample(node_ids, 2)
+        scene.add_edge(Edge(scene, f"cross/{index}", {'node': start}, {'node': end}))
+    table, build_ms = timed(scene.build_conduit_table)
+    print(f"{len(scene.nodes):,} nodes, {len(scene.edges):,} connections, {len(table.pairs):,} connected pairs of groups")
+
+    rows = [("build the table", "", f"{build_ms:.1f}", "")]
+    for level in LEVELS:
+        walked, walk_ms = timed(lambda: count_connections(scene, level))
+        conduits, first_ms = timed(lambda: table.at(level))
+        assert conduits == walked
+        again = summarise(time_calls(lambda: table.at(level), 100))["mean_ms"]
+        rows.append((f"conduits at level {level}", f"{walk_ms:.1f}", f"{first_ms:.2f} then {again:.4f}", f"{len(conduits):,}"))
+
+    durations = list()
+    for _ in range(EDITS):
+        start, end = rng.sample(node_ids, 2)
+        new_edge = Edge(scene, "edit", {'node': start}, {'node': end})
+        begin = time.perf_counter()
+        scene.add_edge(new_edge)
+        durations.append((time.perf_counter() - begin) * 1000)
+    for level in LEVELS:
+        assert table.at(level) == count_connections(scene, level)
+    rows.append((f"add a connection, {len(LEVELS)} levels cached", "", f"{statistics.fmean(durations):.4f}", ""))
+    print_table(("operation", "walk connections ms", "table ms", "conduits"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
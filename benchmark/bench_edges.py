@@ -0,0 +1,104 @@
+"""
+Rendering connections with one QGraphicsPathItem each, against a single batched Graphics_Edges item.
+
+Each frame renders the whole scene zoomed out, where connections are straight lines, and a close up of a
+small corner, where they follow their routes and curved ones are drawn as curves. The per item variant
+is skipped above PER_ITEM_LIMIT, where building the items alone takes minutes.
+
+    python -m benchmark.bench_edges [edge_count ...]
+"""
+import random
+import sys
+import time
+
+from benchmark.common import application, print_table, summarise, time_calls
+
+FRAMES = 5
+VIEWPORT = (1920, 1080)
+PER_ITEM_LIMIT = 200_000
+CURVED = 0.25
+
+
+def routes(edge_count, seed=0):
+    """Orthogonal routes with one or two bends, spread over a square which grows with the count."""
+    generator = random.Random(seed)
+    side = 100 * edge_count**0.5
+    result = list()
+    for i in range(edge_count):
+        x0, y0 = generator.uniform(0, side), generator.uniform(0, side)
+        x1, y1 = x0 + generator.uniform(-400, 400), y0 + generator.uniform(-400, 400)
+        middle = (x0 + x1) / 2
+        result.append((str(i), [(x0, y0), (middle, y0), (middle, y1), (x1, y1)], generator.random() < CURVED))
+    return result, side
+
+
+def per_item(scene, edges):
+    from PySide6.QtCore import QPointF
+    from PySide6.QtGui import QPainterPath
+    from PySide6.QtWidgets import QGraphicsPathItem
+    from src.ui.graphics_edges import curve
+
+    for _, points, curved in edges:
+        if curved:
+            path = curve(points)
+        else:
+            path = QPainterPath(QPointF(*points[0]))
+            for point in points[1:]:
+                path.lineTo(QPointF(*point))
+        scene.addItem(QGraphicsPathItem(path))
+
+
+def batched(scene, edges):
+    from src.ui.graphics_edges import Graphics_Edges
+
+    item = Graphics_Edges()
+    item.set_routes(edges)
+    scene.addItem(item)
+
+
+def bench(build, edges, side):
+    from PySide6.QtCore import QRectF
+    from PySide6.QtGui import QImage, QPainter
+    from PySide6.QtWidgets import QGraphicsScene
+
+    scene = QGraphicsScene()
+    start = time.perf_counter()
+    build(scene, edges)
+    # The index is built lazily, on the first render.
+    scene.itemsBoundingRect()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    width, height = VIEWPORT
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    target = QRectF(0, 0, width, height)
+
+    def frame(source):
+        def render():
+            painter = QPainter(image)
+            scene.render(painter, target, source)
+            painter.end()
+        return render
+
+    overview = summarise(time_calls(frame(QRectF(0, 0, side, side * height / width)), FRAMES))
+    close = summarise(time_calls(frame(QRectF(0, 0, width, height)), FRAMES))
+    return build_ms, overview['mean_ms'], close['mean_ms']
+
+
+def main(*edge_counts):
+    application()
+    from src.ui.graphics_edges import Graphics_Edges
+
+    rows = list()
+    for edge_count in edge_counts or (10_000, 100_000, 1_000_000):
+        edges, side = routes(edge_count)
+        for name, build in (("per item", per_item), ("batched", batched)):
+            if build is per_item and edge_count > PER_ITEM_LIMIT:
+                rows.append((name, f"{edge_count:,}", "-", "-", "-"))
+                continue
+            build_ms, overview_ms, close_ms = bench(build, edges, side)
+            rows.append((name, f"{edge_count:,}", f"{build_ms:.0f}", f"{overview_ms:.1f}", f"{close_ms:.1f}"))
+    print_table(("rendering", "edges", "build ms", "overview ms", "close up ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,68 @@
+"""
+Force directed layout of a single group, and writing the result back to its Graphics_Nodes one at a time
+against in one bulk update.
+
+    python -m benchmark.bench_force_layout [member_count ...]
+"""
+import random
+import sys
+import time
+
+from benchmark.common import application, print_table
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def link_length(offsets, links):
+    return sum(abs(offsets[a][0] - offsets[b][0]) + abs(offsets[a][1] - offsets[b][1]) for a, b in links) / len(links)
+
+
+def write_back(count, offsets):
+    from PySide6.QtCore import QPoint
+    from src.ui.graphics_node import Graphics_Node
+    from src.ui.graphics_scene import Graphics_Scene
+
+    scene = Graphics_Scene()
+    nodes = [Graphics_Node(f"Node {i}") for i in range(count)]
+    for node in nodes:
+        scene.add_node(node)
+    scene.items()
+
+    def one_at_a_time():
+        for node, (x, y) in zip(nodes, offsets):
+            node.position = QPoint(round(x) + 1, round(y))
+        scene.items()
+    
+    def bulk():
+        scene.set_node_positions(nodes, offsets)
+        scene.items()
+
+    return timed(one_at_a_time)[1], timed(bulk)[1]
+
+
+def main(*counts):
+    from src.model.force_layout import force_directed
+    from src.model.layout import shelf_pack
+
+    application()
+    rows = list()
+    for count in counts or (500, 1_000, 5_000):
+        rng = random.Random(count)
+        sizes = [(180, 240)] * count
+        links = [(i, rng.randrange(max(0, i - 20), i)) for i in range(1, count)]
+        rng.shuffle(links)
+        offsets, layout_ms = timed(lambda: force_directed(sizes, links))
+        one_ms, bulk_ms = write_back(count, offsets)
+        rows.append((
+            f"{count:,}", f"{layout_ms:.0f}", f"{link_length(shelf_pack(sizes, links), links):.0f}", 
+            f"{link_length(offsets, links):.0f}", f"{one_ms:.1f}", f"{bulk_ms:.1f}"
+        ))
+    print_table(("members", "layout ms", "packed link length", "force link length", "per node ms", "bulk ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,58 @@
+"""
+Frame time of the background grid against viewport size and zoom level.
+
+Each frame pans the viewport by a tenth of its width so that the cost of panning is measured, not just
+the cost of repainting the same rectangle.
+
+    python -m benchmark.bench_grid
+"""
+from benchmark.common import application, print_table, summarise, time_calls
+
+VIEWPORT_SIZES = [(1024, 768), (1920, 1080), (3840, 2160)]
+ZOOM_LEVELS = [-15, -10, -5, 0, 5]
+FRAMES = 20
+
+
+def grid_scale(zoom_level):
+    # Mirrors Graphics_View._set_grid_scale for a view zoomed monotonically from level 0.
+    return 2**(-int(zoom_level / 5))
+
+
+def bench_frames(width, height, zoom_level, frames=FRAMES):
+    from PySide6.QtCore import QRectF
+    from PySide6.QtGui import QImage, QPainter
+    from src.ui.graphics_scene import Graphics_Scene
+
+    scene = Graphics_Scene()
+    scene.rescale_grid(grid_scale(zoom_level))
+    view_scale = 1.25**zoom_level
+    source_width, source_height = width / view_scale, height / view_scale
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    origin = [0.0]
+
+    def frame():
+        painter = QPainter(image)
+        scene.render(
+            painter, QRectF(0, 0, width, height), QRectF(origin[0], 0, source_width, source_height)
+        )
+        painter.end()
+        origin[0] += source_width / 10
+
+    return time_calls(frame, frames)
+
+
+def main():
+    application()
+    rows = list()
+    for width, height in VIEWPORT_SIZES:
+        for zoom_level in ZOOM_LEVELS:
+            result = summarise(bench_frames(width, height, zoom_level))
+            rows.append((
+                f"{width}x{height}", zoom_level,
+                f"{result['mean_ms']:.2f}", f"{result['median_ms']:.2f}", f"{result['max_ms']:.2f}"
+            ))
+    print_table(("viewport", "zoom", "mean ms", "median ms", "max ms"), rows)
+
+
+if __name__ == '__main__':
+    main()
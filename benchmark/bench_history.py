@@ -0,0 +1,85 @@
+"""
+Memory of a full undo history against the scene it edits, and the time to undo and redo it.
+
+The history is HISTORY_LIMIT mixed edits, as an editing session makes them: moves of a few nodes at a time,
+renames, additions and deletions. Memory is what tracemalloc sees allocated while building each.
+
+    python -m benchmark.bench_history [node_count ...]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmark.common import print_table
+
+SPACING = 250
+
+
+def model(node_count):
+    from src.model.edge import Edge
+    from src.model.scene import Scene
+
+    scene = Scene()
+    columns = int(node_count**0.5) or 1
+    scene.add_nodes(
+        [f"node-{index}" for index in range(node_count)],
+        [f"Node {index}" for index in range(node_count)],
+        positions=[((index % columns) * SPACING, (index // columns) * SPACING) for index in range(node_count)]
+    )
+    for index in range(node_count - 1):
+        scene.add_edge(Edge(scene, f"edge-{index}", {'node': f"node-{index}"}, {'node': f"node-{index + 1}"}))
+    scene.build_spatial_index()
+    return scene
+
+
+def edit(history, random_state, step):
+    node_ids = list(history.scene.nodes.keys()) if step == 0 or step % 100 == 0 else edit.node_ids
+    edit.node_ids = node_ids
+    choice = random_state.random()
+    picked = [node_id for node_id in random_state.sample(node_ids, 5) if node_id in history.scene.nodes]
+    if choice < 0.7:
+        history.move_nodes(picked, [(random_state.uniform(0, 10_000), random_state.uniform(0, 10_000)) for _ in picked])
+    elif choice < 0.85:
+        history.set_node_title(picked[0], f"Renamed {step}")
+    elif choice < 0.95:
+        history.add_node(f"added-{step}", "Added", x=random_state.uniform(0, 10_000))
+    else:
+        history.remove_nodes(picked[:2])
+
+
+def main(*node_counts):
+    from src.model.history import HISTORY_LIMIT, History
+
+    rows = list()
+    for node_count in node_counts or (10_000, 100_000):
+        tracemalloc.start()
+        scene = model(node_count)
+        scene_mb = tracemalloc.get_traced_memory()[0] / 2**20
+        history = History(scene)
+        random_state = random.Random(0)
+        before = tracemalloc.get_traced_memory()[0]
+        for step in range(HISTORY_LIMIT):
+            edit(history, random_state, step)
+        # The sampled id list is scratch, not part of the history.
+        del edit.node_ids
+        history_mb = (tracemalloc.get_traced_memory()[0] - before) / 2**20
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        while history.undo():
+            pass
+        undo_ms = (time.perf_counter() - start) * 1000 / HISTORY_LIMIT
+        start = time.perf_counter()
+        while history.redo():
+            pass
+        redo_ms = (time.perf_counter() - start) * 1000 / HISTORY_LIMIT
+        rows.append((
+            f"{node_count:,}", f"{scene_mb:.1f}", f"{history_mb:.2f}", f"{history_mb / scene_mb:.1%}",
+            f"{undo_ms:.3f}", f"{redo_ms:.3f}"
+        ))
+    print_table(("nodes", "scene MB", "history MB", "share", "undo ms", "redo ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,60 @@
+"""
+Startup cost of the model on its own, against the UI, from python -X importtime in a fresh interpreter.
+
+    python -m benchmark.bench_import_time [repeats]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmark.common import print_table
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS = (
+    ("src.headless", "the headless entry point"),
+    ("src.model.loader", "loading super files"),
+    ("src.model.snapshot", "reading snapshots"),
+    ("src.model.layout", "layout"),
+    ("src.ui.graphics_node", "a node item"),
+    ("src.ui.main_window", "the whole UI"),
+)
+
+
+def import_times(module: str) -> tuple[float, float, bool]:
+    """Milliseconds to import the module, and all the imports of the run, and whether Qt was among them."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    module_us, total_us, qt = 0, 0, False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        qt = qt or name.strip().startswith("PySide6")
+        # Only the outermost imports, as each nested one is counted in its importer's cumulative time.
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+            if name.strip() == module:
+                module_us = int(cumulative)
+    return module_us / 1000, total_us / 1000, qt
+
+
+def main(repeats=5):
+    rows = list()
+    for module, description in TARGETS:
+        # The first run may compile the bytecode.
+        import_times(module)
+        runs = [import_times(module) for _ in range(repeats)]
+        rows.append((
+            module, description,
+            f"{statistics.median(run[0] for run in runs):.1f}",
+            f"{statistics.median(run[1] for run in runs):.1f}",
+            "yes" if runs[0][2] else "no",
+        ))
+    print_table(("module", "", "import ms", "all imports ms", "imports Qt"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,74 @@
+"""
+The cost of one edit to the model, journalled and applied to the view, as the graph grows.
+
+Each edit moves a node in the visible rect and flushes the journal to a virtualized Graphics_Scene with its
+tile cache, as the event loop would. The baseline applies the same edit by rebuilding the spatial index and
+refreshing the view, as was needed before the journal.
+
+    python -m benchmark.bench_journal [node_count ...]
+"""
+import sys
+
+from benchmark.common import application, print_table, summarise, time_calls
+
+VIEWPORT = (1920, 1080)
+SPACING = 250
+EDITS = 1000
+REBUILDS = 5
+
+
+def setup(node_count):
+    from PySide6.QtCore import QRectF
+    from src.model.scene import Scene
+    from src.ui.graphics_scene import Graphics_Scene
+
+    scene = Scene()
+    columns = int(node_count**0.5) or 1
+    scene.add_nodes(
+        [f"node-{index}" for index in range(node_count)],
+        positions=[((index % columns) * SPACING, (index // columns) * SPACING) for index in range(node_count)]
+    )
+    scene.build_spatial_index()
+    graphics_scene = Graphics_Scene()
+    graphics_scene.set_model(scene)
+    # Flushed by hand below, rather than on the event loop.
+    scene.journal.schedule = None
+    graphics_scene.update_visible_items(QRectF(0, 0, *VIEWPORT))
+    return scene, graphics_scene
+
+
+def main(*node_counts):
+    application()
+    from src.model.journal import Changes
+
+    rows = list()
+    for node_count in node_counts or (10_000, 100_000, 1_000_000):
+        scene, graphics_scene = setup(node_count)
+        visible = list(graphics_scene.virtualizer.items)
+        step = [0]
+
+        def edit():
+            step[0] += 1
+            node = scene.nodes[visible[step[0] % len(visible)]]
+            scene.move_node(node.id, node.x + (5 if step[0] % 2 else -5), node.y)
+
+        def journalled():
+            edit()
+            scene.journal.flush()
+
+        def rebuilt():
+            edit()
+            # The rebuild stands in for the journal, so drop what it recorded.
+            scene.journal.pending = Changes()
+            scene.build_spatial_index()
+            graphics_scene.virtualizer.refresh()
+
+        for name, function, repeats in (("journal", journalled, EDITS), ("rebuild", rebuilt, REBUILDS)):
+            stats = summarise(time_calls(function, repeats))
+            rows.append((name, f"{node_count:,}", f"{stats['mean_ms']:.3f}", f"{stats['max_ms']:.3f}"))
+        graphics_scene.clear()
+    print_table(("update", "nodes", "mean ms", "max ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
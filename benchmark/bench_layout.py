@@ -0,0 +1,57 @@
+"""
+Full hierarchical layout, sequentially and across a process pool, against re-laying out one edited group.
+
+    python -m benchmark.bench_layout [node_count ...]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark.common import print_table
+from benchmark.synthetic import synthetic_scene
+
+DEPTH = 3
+FAN_OUT = 4
+NODES_PER_GROUP = 50
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(*node_counts):
+    from src.model.layout import Layout_Engine
+    from src.model.node import Node
+
+    groups_per_tree = sum(FAN_OUT**level for level in range(DEPTH))
+    rows = list()
+    for count in node_counts or (10_000, 100_000):
+        group_count = max(1, count // (groups_per_tree * NODES_PER_GROUP))
+        scene = synthetic_scene(group_count, NODES_PER_GROUP, DEPTH, FAN_OUT)
+
+        engine = Layout_Engine(scene)
+        _, sequential_ms = timed(engine.layout)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            _, parallel_ms = timed(Layout_Engine(scene, executor=executor).layout)
+
+        # Add a node to an innermost group and lay out again.
+        group = scene.groups[DEPTH - 1]
+        node = Node(scene, "added", group=group.id)
+        group.nodes.append(node.id)
+        scene.add_node(node)
+        engine.invalidate(group.id)
+        relaid, incremental_ms = timed(engine.update)
+        rows.append((
+            f"{len(scene.nodes):,}", f"{sequential_ms:.0f}", f"{parallel_ms:.0f}", 
+            f"{incremental_ms:.2f}", len(relaid)
+        ))
+
+    print(f"depth {DEPTH}, fan out {FAN_OUT}, {NODES_PER_GROUP} nodes per group, {os.cpu_count()} CPUs")
+    print_table(("nodes", "full ms", "process pool ms", "one group ms", "groups relaid"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,70 @@
+"""
+Load time and peak memory of the streaming super file loader, against json.load of every file.
+
+Peak memory is measured with tracemalloc, i.e. Python allocations made while loading.
+
+    python -m benchmark.bench_loader [group_count] [nodes_per_group]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmark.common import print_table
+from benchmark.synthetic import node_count, write_super_file
+
+DEPTH = 3
+FAN_OUT = 2
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, duration, peak
+
+
+def json_load_all(directory):
+    documents = list()
+    for filename in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, filename), encoding="utf-8") as file:
+            documents.append(json.load(file))
+    return documents
+
+
+def main(group_count=20, nodes_per_group=200):
+    from src.model.loader import Scene_Loader, load_scene
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_super_file(directory, group_count, nodes_per_group, DEPTH, FAN_OUT)
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        def lazy_visible():
+            loader = Scene_Loader()
+            loader.load(path)
+            loader.load_visible(0)
+            return loader.scene
+
+        rows = list()
+        for label, function in (
+            ("json.load (documents only)", lambda: json_load_all(directory)),
+            ("stream, eager", lambda: load_scene(path, lazy=False)),
+            ("stream, lazy (super file)", lambda: load_scene(path)),
+            ("stream, lazy (level 0)", lazy_visible),
+        ):
+            result, duration, peak = measure(function)
+            nodes = len(result.nodes) if hasattr(result, "nodes") else "-"
+            rows.append((label, nodes, f"{duration * 1000:.1f}", f"{peak / 2**20:.1f}"))
+            del result
+
+    print(f"{node_count(group_count, nodes_per_group, DEPTH, FAN_OUT):,} nodes, {size / 2**20:.1f} MiB of JSON")
+    print_table(("loader", "nodes loaded", "ms", "peak MiB"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
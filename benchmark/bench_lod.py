@@ -0,0 +1,73 @@
+"""
+Frame time of a dense scene of Graphics_Nodes across zoom levels, with and without level ranges.
+
+With level ranges the nodes are split into groups which are only visible from magnification -1 upwards,
+as a group's members would be.
+
+    python -m benchmark.bench_lod [node_count]
+"""
+import sys
+
+from benchmark.common import application, print_table, summarise, time_calls
+
+ZOOM_LEVELS = [-20, -15, -10, -5, 0, 5]
+VIEWPORT = (1920, 1080)
+FRAMES = 5
+
+
+def build_scene(node_count, group_size=None):
+    from PySide6.QtCore import QPoint
+    from src.ui.graphics_node import Graphics_Node
+    from src.ui.graphics_scene import Graphics_Scene
+
+    scene = Graphics_Scene()
+    columns = int(node_count**0.5) or 1
+    nodes = list()
+    for i in range(node_count):
+        x, y = i % columns, i // columns
+        node = Graphics_Node(
+            title=f"Node {i}", 
+            parent=None, 
+            position=QPoint((x - columns // 2) * 200, (y - columns // 2) * 260)
+        )
+        scene.add_node(node)
+        nodes.append(node)
+
+    if group_size:
+        for start in range(0, node_count, group_size):
+            scene.level_of_detail.add_range(nodes[start:start + group_size], min_level=-1)
+    return scene
+
+
+def bench_zoom(scene, zoom_level):
+    from PySide6.QtCore import QRectF
+    from PySide6.QtGui import QImage, QPainter
+    from src.ui.level_of_detail import magnification_from_zoom
+
+    width, height = VIEWPORT
+    scene.set_magnification(magnification_from_zoom(zoom_level))
+    view_scale = 1.25**zoom_level
+    source = QRectF(-width / view_scale / 2, -height / view_scale / 2, width / view_scale, height / view_scale)
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+
+    def frame():
+        painter = QPainter(image)
+        scene.render(painter, QRectF(0, 0, width, height), source)
+        painter.end()
+
+    return time_calls(frame, FRAMES)
+
+
+def main(node_count=10_000):
+    application()
+    rows = list()
+    for label, group_size in (("none", None), ("groups", 100)):
+        scene = build_scene(node_count, group_size)
+        for zoom_level in ZOOM_LEVELS:
+            result = summarise(bench_zoom(scene, zoom_level))
+            rows.append((label, zoom_level, f"{result['mean_ms']:.2f}", f"{result['max_ms']:.2f}"))
+    print_table(("level ranges", "zoom", "mean ms", "max ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,69 @@
+"""
+Paint throughput of Graphics_Node, rendered into an offscreen QImage, for each Cache_Mode.
+
+The whole grid of nodes is visible and painted at full detail. One node is moved between frames, as it 
+would be while dragging.
+
+    python -m benchmark.bench_node_paint [node_count]
+"""
+import sys
+
+from benchmark.common import application, print_table, summarise, time_calls
+
+FRAMES = 10
+VIEWPORT = (1920, 1080)
+
+
+def bench_cache_mode(cache_mode, node_count):
+    from PySide6.QtCore import QPoint, QRectF
+    from PySide6.QtGui import QImage, QPainter
+    from src.ui.graphics_node import Graphics_Node
+    from src.ui.graphics_scene import Graphics_Scene
+
+    scene = Graphics_Scene()
+    columns = int(node_count**0.5) or 1
+    nodes = [
+        Graphics_Node(
+            title=f"Node {i}", 
+            parent=None, 
+            position=QPoint((i % columns) * 200, (i // columns) * 260), 
+            cache_mode=cache_mode
+        ) 
+        for i in range(node_count)
+    ]
+    for node in nodes:
+        scene.add_node(node)
+
+    source = scene.itemsBoundingRect()
+    width, height = VIEWPORT
+    # Keep the nodes at full detail by fitting the viewport to the scene without shrinking below 1:1.
+    scale = max(min(width / source.width(), height / source.height()), 0.5)
+    target = QRectF(0, 0, source.width() * scale, source.height() * scale)
+    image = QImage(int(target.width()) + 1, int(target.height()) + 1, QImage.Format.Format_ARGB32_Premultiplied)
+
+    def frame():
+        nodes[0].moveBy(1, 0)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        scene.render(painter, target, source)
+        painter.end()
+
+    return time_calls(frame, FRAMES)
+
+
+def main(node_count=2_000):
+    application()
+    from src.ui.graphics_node import Cache_Mode
+
+    rows = list()
+    for cache_mode in Cache_Mode:
+        result = summarise(bench_cache_mode(cache_mode, node_count))
+        rows.append((
+            cache_mode.name, node_count, f"{result['mean_ms']:.2f}", 
+            f"{node_count / result['mean_ms'] * 1000:,.0f}"
+        ))
+    print_table(("cache mode", "nodes", "mean ms", "nodes / s"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,82 @@
+"""
+Memory per node, and a bulk filter, for a dict of Node objects against the columnar Node_Store.
+
+The filter is "every node at level 3 or deeper in one group". Memory is measured with tracemalloc, and
+extrapolated to 10M nodes. The id strings are shared by both and not counted.
+
+    python -m benchmark.bench_node_store [node_count]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmark.common import print_table
+
+GROUP_SIZE = 1_000
+LEVELS = 8
+FILTER_REPEATS = 5
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    build_ms = (time.perf_counter() - start) * 1000
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, build_ms
+
+
+def timed(function):
+    start = time.perf_counter()
+    for _ in range(FILTER_REPEATS):
+        result = function()
+    return result, (time.perf_counter() - start) * 1000 / FILTER_REPEATS
+
+
+def main(node_count=1_000_000):
+    from src.model.group import Group
+    from src.model.node import Node
+    from src.model.scene import Scene
+
+    scene = Scene()
+    group_ids = [f"/{index}" for index in range(node_count // GROUP_SIZE + 1)]
+    for index, group_id in enumerate(group_ids):
+        scene.add_group(Group(scene, group_id, min_level=index % LEVELS))
+    ids = [f"node-{index}" for index in range(node_count)]
+    groups = [group_ids[index // GROUP_SIZE] for index in range(node_count)]
+
+    def objects():
+        nodes = dict()
+        for index, node_id in enumerate(ids):
+            node = Node(scene, node_id, group=groups[index])
+            node.x, node.y = float(index), float(index)
+            nodes[node_id] = node
+        return nodes
+
+    def columns():
+        store = Scene().nodes
+        store.scene = scene
+        store.extend(ids, groups=groups, positions=[(float(index), float(index)) for index in range(node_count)])
+        return store
+
+    target = group_ids[len(group_ids) // 2 + 3]
+    rows = list()
+    by_id = {group.id: group for group in scene.groups}
+    nodes, size, build_ms = measure(objects)
+    found, filter_ms = timed(lambda: [
+        node.id for node in nodes.values() if node.group == target and by_id[node.group].min_level >= 3
+    ])
+    rows.append(("Node objects", f"{node_count:,}", f"{size / node_count:.0f}", f"{size * 10_000_000 / node_count / 2**30:.1f}", f"{build_ms:.0f}", f"{filter_ms:.1f}", len(found)))
+    del nodes
+
+    store, size, build_ms = measure(columns)
+    found, filter_ms = timed(lambda: store.select(target, min_level=3))
+    rows.append(("Node_Store", f"{node_count:,}", f"{size / node_count:.0f}", f"{size * 10_000_000 / node_count / 2**30:.1f}", f"{build_ms:.0f}", f"{filter_ms:.1f}", len(found)))
+    print_table(("storage", "nodes", "bytes / node", "GiB at 10M", "build ms", "filter ms", "found"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
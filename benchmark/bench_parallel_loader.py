@@ -0,0 +1,48 @@
+"""
+Cold start time of loading every group file, sequentially and in a process pool of increasing size.
+
+    python -m benchmark.bench_parallel_loader [group_count] [nodes_per_group]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark.common import print_table
+from benchmark.synthetic import node_count, write_super_file
+
+DEPTH = 2
+FAN_OUT = 2
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(group_count=32, nodes_per_group=500):
+    from src.model.loader import load_scene
+    from src.model.parallel_loader import Parallel_Scene_Loader
+
+    def parallel(path, workers):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scene_loader = Parallel_Scene_Loader(executor=executor)
+            scene_loader.load(path)
+            scene_loader.wait()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_super_file(directory, group_count, nodes_per_group, DEPTH, FAN_OUT)
+        rows = [("sequential", "-", f"{timed(lambda: load_scene(path, lazy=False)):.1f}")]
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            rows.append(("process pool", workers, f"{timed(lambda: parallel(path, workers)):.1f}"))
+            workers *= 2
+
+    print(f"{group_count} group files, {node_count(group_count, nodes_per_group, DEPTH, FAN_OUT):,} nodes")
+    print_table(("loader", "workers", "ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,65 @@
+"""
+Routing every connection, against routing only the connections affected by dragging a node.
+
+    python -m benchmark.bench_routing [group_count] [drags]
+"""
+import random
+import statistics
+import sys
+import time
+
+from benchmark.common import print_table
+from benchmark.synthetic import synthetic_scene
+
+DEPTH = 3
+FAN_OUT = 4
+NODES_PER_GROUP = 50
+CROSS_EDGES = 0.02
+FRAME_MS = 16
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(group_count=48, drags=200):
+    from src.model.edge import Edge
+    from src.model.layout import Layout_Engine
+    from src.model.routing import Router
+
+    rng = random.Random(0)
+    scene = synthetic_scene(group_count, NODES_PER_GROUP, DEPTH, FAN_OUT)
+    node_ids = list(scene.nodes)
+    # A few connections between groups, so that there are conduits to route through.
+    for index in range(int(len(scene.edges) * CROSS_EDGES)):
+        start, end = rng.sample(node_ids, 2)
+        scene.add_edge(Edge(scene, f"cross/{index}", {'node': start}, {'node': end}))
+    Layout_Engine(scene).layout()
+    scene.build_spatial_index()
+
+    router = Router(scene)
+    _, full_ms = timed(router.route_all)
+
+    durations, counts = list(), list()
+    for _ in range(drags):
+        node = scene.nodes[rng.choice(node_ids)]
+        def drag():
+            scene.move_node(node.id, node.x + rng.uniform(-60, 60), node.y + rng.uniform(-60, 60))
+            router.node_moved(node.id)
+            return router.update(budget_ms=FRAME_MS)
+        routed, ms = timed(drag)
+        durations.append(ms)
+        counts.append(len(routed))
+
+    print(f"{len(scene.nodes):,} nodes, {len(scene.edges):,} connections, {len(router.conduits):,} conduits")
+    print_table(("operation", "ms", "connections routed"), [
+        ("route everything", f"{full_ms:.0f}", f"{len(router.routes):,}"),
+        ("drag a node, mean", f"{statistics.fmean(durations):.2f}", f"{statistics.fmean(counts):.1f}"),
+        ("drag a node, max", f"{max(durations):.2f}", max(counts)),
+    ])
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
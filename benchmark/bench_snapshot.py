@@ -0,0 +1,54 @@
+"""
+Opening a scene from its binary snapshot against loading it from the super file and group files.
+
+    python -m benchmark.bench_snapshot [group_count] [nodes_per_group]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmark.common import print_table
+from benchmark.synthetic import node_count, write_super_file
+
+DEPTH = 2
+FAN_OUT = 2
+LOOKUPS = 1_000
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(group_count=50, nodes_per_group=200):
+    from src.model.loader import load_scene
+    from src.model.snapshot import Snapshot, convert_super_file
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_super_file(directory, group_count, nodes_per_group, DEPTH, FAN_OUT)
+        snapshot_path = os.path.join(directory, "scene.mlod")
+        scene, convert_ms = timed(lambda: convert_super_file(path, snapshot_path))
+        node_ids = random.Random(0).sample(list(scene.nodes), min(LOOKUPS, len(scene.nodes)))
+
+        _, json_ms = timed(lambda: load_scene(path, lazy=False))
+        snapshot, open_ms = timed(lambda: Snapshot(snapshot_path))
+        _, lookup_ms = timed(lambda: [snapshot.get_node(node_id) for node_id in node_ids])
+        _, materialise_ms = timed(snapshot.to_scene)
+        snapshot.close()
+        size = os.path.getsize(snapshot_path)
+
+    print(f"{node_count(group_count, nodes_per_group, DEPTH, FAN_OUT):,} nodes, snapshot {size / 2**20:.1f} MiB")
+    print_table(("operation", "ms"), [
+        ("load JSON (all group files)", f"{json_ms:.1f}"),
+        ("convert JSON to snapshot", f"{convert_ms:.1f}"),
+        ("open snapshot", f"{open_ms:.3f}"),
+        (f"{len(node_ids)} node lookups", f"{lookup_ms:.1f}"),
+        ("snapshot to Scene", f"{materialise_ms:.1f}"),
+    ])
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,80 @@
+"""
+Rectangle queries against the model's spatial index, compared with a linear scan of Scene.nodes.
+
+    python -m benchmark.bench_spatial_index [node_count] [queries]
+"""
+import random
+import sys
+import time
+
+from benchmark.common import print_table
+
+SCENE_SIZE = 30_000
+GROUP_SIZE = 500
+LEVELS = 4
+VIEWPORT = (3840, 2160)
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def build_scene(count, rng):
+    from src.model.group import Group
+    from src.model.node import Node
+    from src.model.scene import Scene
+
+    scene = Scene()
+    for index in range(0, count, GROUP_SIZE):
+        group = Group(scene, f"/{index // GROUP_SIZE}", min_level=index // GROUP_SIZE % LEVELS)
+        scene.add_group(group)
+        for i in range(index, min(index + GROUP_SIZE, count)):
+            node = Node(scene, f"node-{i}", group=group.id)
+            node.x = rng.uniform(-SCENE_SIZE, SCENE_SIZE)
+            node.y = rng.uniform(-SCENE_SIZE, SCENE_SIZE)
+            group.nodes.append(node.id)
+            scene.add_node(node)
+    return scene
+
+
+def linear_scan(scene, rect, level):
+    from src.model.spatial_index import intersects
+
+    groups = {group.id: group for group in scene.groups}
+    return [
+        node.id for node in scene.nodes.values() 
+        if intersects(rect, node.rect) and groups[node.group].visible_at(level)
+    ]
+
+
+def main(count=100_000, queries=200):
+    rng = random.Random(0)
+    scene = build_scene(count, rng)
+    rects = [
+        (rng.uniform(-SCENE_SIZE, SCENE_SIZE), rng.uniform(-SCENE_SIZE, SCENE_SIZE), *VIEWPORT) 
+        for _ in range(queries)
+    ]
+    levels = [rng.randrange(LEVELS) for _ in range(queries)]
+
+    _, build_ms = timed(scene.build_spatial_index)
+    indexed, index_ms = timed(lambda: [scene.nodes_in(rect, level) for rect, level in zip(rects, levels)])
+    scanned, scan_ms = timed(lambda: [linear_scan(scene, rect, level) for rect, level in zip(rects, levels)])
+    assert all(set(a) == set(b) for a, b in zip(indexed, scanned))
+
+    moves = [(f"node-{rng.randrange(count)}", rng.uniform(-SCENE_SIZE, SCENE_SIZE), rng.uniform(-SCENE_SIZE, SCENE_SIZE)) 
+             for _ in range(10_000)]
+    _, move_ms = timed(lambda: [scene.move_node(*move) for move in moves])
+
+    print(f"{count:,} nodes, {queries} viewport queries of {VIEWPORT[0]}x{VIEWPORT[1]}")
+    print_table(("operation", "ms"), [
+        ("bulk load", f"{build_ms:.1f}"),
+        ("linear scan, per query", f"{scan_ms / queries:.3f}"),
+        ("spatial index, per query", f"{index_ms / queries:.3f}"),
+        ("10,000 moves", f"{move_ms:.1f}"),
+    ])
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
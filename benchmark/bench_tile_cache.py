@@ -0,0 +1,80 @@
+"""
+Frame times while panning across a dense region, painting live items against compositing cached tiles.
+
+Each frame moves the 1920x1080 viewport by PAN_STEP pixels and renders the scene offscreen, as the view
+does while dragging. With tiles, the cache prefetches a screen ahead in the direction of motion and the
+worker pool renders between frames, as it would while the event loop waits for the next mouse move.
+
+    python -m benchmark.bench_tile_cache [node_count] [frames]
+"""
+import sys
+import time
+
+from benchmark.common import application, print_table, summarise
+
+VIEWPORT = (1920, 1080)
+SPACING = 220
+PAN_STEP = 40
+# The frame rate the pan aims for. The worker pool gets whatever is left of each frame.
+FRAME_MS = 16
+
+
+def bench(app, model, frames, tiles):
+    from PySide6.QtCore import QRectF
+    from PySide6.QtGui import QImage, QPainter
+    from src.ui.graphics_scene import Graphics_Scene
+
+    graphics_scene = Graphics_Scene()
+    graphics_scene.set_model(model)
+    width, height = VIEWPORT
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    if tiles:
+        graphics_scene.begin_compositing()
+
+    durations = list()
+    for frame in range(frames):
+        rect = QRectF(frame * PAN_STEP, frame * PAN_STEP / 2, width, height)
+        start = time.perf_counter()
+        graphics_scene.update_visible_items(rect)
+        if tiles:
+            graphics_scene.prefetch_tiles(rect, 1.0, motion=(1, 0.5))
+        painter = QPainter(image)
+        graphics_scene.render(painter, QRectF(image.rect()), rect)
+        painter.end()
+        durations.append((time.perf_counter() - start) * 1000)
+        # Idle time until the next frame, in which the worker pool renders and its results are delivered.
+        deadline = start + FRAME_MS / 1000
+        while time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.001)
+    app.processEvents()
+
+    cache = graphics_scene.tile_cache
+    if tiles:
+        cache.pool.waitForDone()
+    return summarise(durations), cache.hits, cache.misses
+
+
+def main(node_count=200_000, frames=120):
+    app = application()
+    from src.model.scene import Scene
+
+    model = Scene()
+    columns = int(node_count**0.5) or 1
+    model.add_nodes(
+        [f"node-{index}" for index in range(node_count)],
+        titles=[f"Node {index}" for index in range(node_count)],
+        positions=[((index % columns) * SPACING, (index // columns) * SPACING) for index in range(node_count)]
+    )
+    model.build_spatial_index()
+
+    rows = list()
+    for name, tiles in (("live items", False), ("tiles", True)):
+        result, hits, misses = bench(app, model, frames, tiles)
+        hit_rate = f"{hits / (hits + misses):.0%}" if hits + misses else "-"
+        rows.append((name, f"{result['mean_ms']:.1f}", f"{result['median_ms']:.1f}", f"{result['max_ms']:.1f}", hit_rate))
+    print_table(("painting", "mean ms", "median ms", "max ms", "tile hits"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,106 @@
+"""
+Cost of dragging one node in a dense scene, for each Graphics_View viewport update mode.
+
+With FullViewportUpdate every frame repaints the whole viewport, with the partial modes the cost should
+follow the dirty region around the dragged node instead. Only the time spent in paintEvent is counted.
+
+    python -m benchmark.bench_view_update [node_count]
+"""
+import sys
+import time
+
+from benchmark.common import application, print_table, summarise
+
+FRAMES = 30
+VIEWPORT = (1920, 1080)
+
+
+def timed_view(parent, update_mode):
+    from src.ui.graphics_view import Graphics_View
+
+    class Timed_View(Graphics_View):
+        def paintEvent(self, event):
+            start = time.perf_counter()
+            super().paintEvent(event)
+            self.durations.append((time.perf_counter() - start) * 1000)
+
+    view = Timed_View(parent, update_mode=update_mode)
+    view.durations = list()
+    return view
+
+
+def status_bar_parent():
+    from PySide6.QtWidgets import QWidget
+
+    class Status_Bar_Parent(QWidget):
+        def set_status_bar_text(self, text: str):
+            pass
+
+    return Status_Bar_Parent()
+
+
+def wait_for_paint(app, view, timeout=1.0):
+    painted = len(view.durations)
+    deadline = time.perf_counter() + timeout
+    while len(view.durations) == painted and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def bench_update_mode(app, update_mode, node_count):
+    from PySide6.QtCore import QPoint
+    from src.ui.graphics_node import Graphics_Node
+    from src.ui.graphics_scene import Graphics_Scene
+
+    parent = status_bar_parent()
+    view = timed_view(parent, update_mode)
+    scene = Graphics_Scene(view)
+    view.setScene(scene)
+    parent.resize(*VIEWPORT)
+    view.resize(*VIEWPORT)
+
+    columns = int(node_count**0.5) or 1
+    nodes = list()
+    for i in range(node_count):
+        node = Graphics_Node(
+            title=f"Node {i}", 
+            parent=None, 
+            position=QPoint((i % columns - columns // 2) * 200, (i // columns - columns // 2) * 260)
+        )
+        scene.add_node(node)
+        nodes.append(node)
+
+    # Show a dense part of the scene, keeping the nodes at full detail.
+    view.scale(0.5, 0.5)
+    view.centerOn(0, 0)
+    parent.show()
+    wait_for_paint(app, view)
+
+    dragged = nodes[min((columns // 2) * columns + columns // 2, len(nodes) - 1)]
+    view.durations.clear()
+    for _ in range(FRAMES):
+        dragged.moveBy(5, 0)
+        wait_for_paint(app, view)
+
+    parent.close()
+    return view.durations
+
+
+def main(node_count=2_000):
+    app = application()
+    from PySide6.QtWidgets import QGraphicsView
+
+    rows = list()
+    for update_mode in (
+        QGraphicsView.ViewportUpdateMode.FullViewportUpdate,
+        QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate,
+        QGraphicsView.ViewportUpdateMode.SmartViewportUpdate,
+        QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate,
+    ):
+        result = summarise(bench_update_mode(app, update_mode, node_count))
+        rows.append((update_mode.name, node_count, f"{result['mean_ms']:.2f}", f"{result['max_ms']:.2f}"))
+    print_table(("update mode", "nodes", "mean ms", "max ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
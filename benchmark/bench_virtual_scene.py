@@ -0,0 +1,82 @@
+"""
+One Graphics_Node per model node, against a virtualized scene which only has items for the visible rect.
+
+Memory is the growth in resident set size while building the scene, so it leaves out the model. Each pan moves a 1920x1080 viewport
+by a third of its width, as a fast drag would.
+
+    python -m benchmark.bench_virtual_scene [node_count ...]
+"""
+import sys
+import time
+
+from benchmark.common import application, print_table, resident_mb, summarise, time_calls
+
+VIEWPORT = (1920, 1080)
+SPACING = 250
+PANS = 100
+
+
+def model(node_count):
+    from src.model.scene import Scene
+
+    scene = Scene()
+    columns = int(node_count**0.5) or 1
+    scene.add_nodes(
+        [f"node-{index}" for index in range(node_count)],
+        positions=[((index % columns) * SPACING, (index // columns) * SPACING) for index in range(node_count)]
+    )
+    scene.build_spatial_index()
+    return scene
+
+
+def per_item(scene):
+    from PySide6.QtCore import QPoint
+    from src.ui.graphics_node import Graphics_Node
+    from src.ui.graphics_scene import Graphics_Scene
+
+    graphics_scene = Graphics_Scene()
+    for node in scene.nodes.values():
+        graphics_scene.add_node(Graphics_Node(node.title, position=QPoint(round(node.x), round(node.y))))
+    return graphics_scene, None
+
+
+def virtualized(scene):
+    from PySide6.QtCore import QRectF
+    from src.ui.graphics_scene import Graphics_Scene
+
+    graphics_scene = Graphics_Scene()
+    graphics_scene.set_model(scene)
+    width, height = VIEWPORT
+    # Wander diagonally over the grid, wrapping around inside it.
+    side = max(len(scene.nodes)**0.5 * SPACING - width, width)
+    position = [0.0]
+
+    def pan():
+        position[0] += width / 3
+        graphics_scene.update_visible_items(QRectF(position[0] % side, position[0] / 2 % side, width, height))
+
+    pan()
+    return graphics_scene, pan
+
+
+def main(*node_counts):
+    application()
+    rows = list()
+    for node_count in node_counts or (10_000, 100_000):
+        scene = model(node_count)
+        # The virtualized scene goes first, so it can't reuse memory freed by the other.
+        for name, build in (("virtualized", virtualized), ("per item", per_item)):
+            before = resident_mb()
+            start = time.perf_counter()
+            graphics_scene, pan = build(scene)
+            build_ms = (time.perf_counter() - start) * 1000
+            grown = resident_mb() - before
+            pan_ms = f"{summarise(time_calls(pan, PANS))['mean_ms']:.2f}" if pan is not None else "-"
+            rows.append((name, f"{node_count:,}", len(graphics_scene.items()), f"{build_ms:.0f}", f"{grown:.0f}", pan_ms))
+            graphics_scene.clear()
+            del graphics_scene
+    print_table(("scene", "nodes", "items", "build ms", "memory MB", "pan ms"), rows)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
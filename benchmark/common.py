@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+import statistics
+
+
+def application():
+    """Return the running QApplication, creating an offscreen one if required."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def resident_mb() -> float:
+    """The process's resident set size. Linux only."""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+def time_calls(function, repeats: int = 10):
+    """Call `function` `repeats` times and return the individual durations in milliseconds."""
+    durations = list()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def summarise(durations):
+    return {
+        "mean_ms": statistics.fmean(durations),
+        "median_ms": statistics.median(durations),
+        "max_ms": max(durations),
+    }
+
+
+def print_table(header, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    for row in [header, *rows]:
+        print("  ".join(str(cell).rjust(width) for cell, width in zip(row, widths)))
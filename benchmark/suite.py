@@ -0,0 +1,248 @@
+"""
+The benchmark suite. Builds a synthetic multilevel graph, measures the app end to end on the offscreen
+Qt platform, and writes the results as JSON, so runs on different commits can be compared.
+
+Measured:
+  build   - generating the model, laying it out, indexing it, and the virtualized Graphics_Scene
+  memory  - growth in resident set size per node of the model, and per item of the Graphics_Scene
+  paint   - rendering the Graphics_Scene into a QImage, overview to close up
+  zoom    - frames of a Graphics_View zoomed out and back in by synthetic wheel events
+  pan     - frames of a Graphics_View dragged with the middle mouse button
+
+    python -m benchmark.suite [--groups 20] [--nodes-per-group 50] [--depth 3] [--fan-out 4] [--output results.json]
+    python -m benchmark.suite --compare before.json after.json [--threshold 0.1]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from benchmark.common import application, print_table, resident_mb, summarise, time_calls
+from benchmark.synthetic import node_count, synthetic_scene
+
+VIEWPORT = (1920, 1080)
+PAINT_SCALES = (0.02, 0.1, 0.5, 1.0)
+PAINT_REPEATS = 5
+ZOOM_STEPS = 20
+PAN_FRAMES = 60
+PAN_STEP = 40
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def environment() -> dict:
+    from PySide6 import QtCore
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pyside": QtCore.__version__,
+        "qt": QtCore.qVersion(),
+        "platform": platform.platform(),
+    }
+
+
+def build(groups: int, nodes_per_group: int, depth: int, fan_out: int) -> tuple:
+    from src.model.layout import Layout_Engine
+    from src.model.scene import union
+    from src.ui.graphics_scene import Graphics_Scene
+
+    memory = resident_mb()
+    scene, model_ms = timed(lambda: synthetic_scene(groups, nodes_per_group, depth, fan_out))
+    _, layout_ms = timed(Layout_Engine(scene).layout)
+    _, index_ms = timed(scene.build_spatial_index)
+    model_mb, memory = resident_mb() - memory, resident_mb()
+
+    def graphics():
+        from PySide6.QtCore import QRectF
+
+        graphics_scene = Graphics_Scene()
+        graphics_scene.set_model(scene)
+        # Items for everything shown at the top level, as an overview of the whole graph needs.
+        graphics_scene.update_visible_items(QRectF(*union([group.rect for group in scene.groups if group.rect is not None])))
+        return graphics_scene
+
+    graphics_scene, graphics_ms = timed(graphics)
+    graphics_mb = resident_mb() - memory
+    results = {
+        "build": {
+            "model_ms": model_ms,
+            "layout_ms": layout_ms,
+            "index_ms": index_ms,
+            "graphics_scene_ms": graphics_ms,
+        },
+        "memory": {
+            "model_bytes_per_node": model_mb * 2**20 / len(scene.nodes),
+            "graphics_scene_bytes_per_item": graphics_mb * 2**20 / max(len(graphics_scene.virtualizer), 1),
+        },
+    }
+    return scene, graphics_scene, results
+
+
+def paint(scene, graphics_scene) -> dict:
+    from PySide6.QtCore import QRectF
+    from PySide6.QtGui import QImage, QPainter
+
+    image = QImage(*VIEWPORT, QImage.Format.Format_ARGB32_Premultiplied)
+    bounds = [group.rect for group in scene.groups if group.parent is None and group.rect is not None]
+    left, top = min(rect[0] for rect in bounds), min(rect[1] for rect in bounds)
+    results = dict()
+    for scale in PAINT_SCALES:
+        source = QRectF(left, top, VIEWPORT[0] / scale, VIEWPORT[1] / scale)
+        graphics_scene.update_visible_items(source)
+
+        def render():
+            painter = QPainter(image)
+            graphics_scene.render(painter, QRectF(image.rect()), source)
+            painter.end()
+
+        results[f"scale_{scale}_ms"] = summarise(time_calls(render, PAINT_REPEATS))["mean_ms"]
+    return results
+
+
+def status_bar_parent():
+    from PySide6.QtWidgets import QWidget
+
+    class Status_Bar_Parent(QWidget):
+        def set_status_bar_text(self, text: str):
+            pass
+
+    return Status_Bar_Parent()
+
+
+def interaction(app, scene, graphics_scene) -> dict:
+    """Frame times, each an input event and the repaint it causes."""
+    from PySide6.QtCore import QEvent, QPoint, QPointF, Qt
+    from PySide6.QtGui import QMouseEvent, QWheelEvent
+    from src.ui.graphics_view import Graphics_View
+
+    parent = status_bar_parent()
+    parent.resize(*VIEWPORT)
+    view = Graphics_View(parent)
+    view.resize(*VIEWPORT)
+    # The scene reports the cursor position through its view, as in Main_Window.
+    graphics_scene.setParent(view)
+    view.setScene(graphics_scene)
+    first = scene.groups[0].rect
+    view.centerOn(first[0] + first[2] / 2, first[1] + first[3] / 2)
+    parent.show()
+    app.processEvents()
+    viewport = view.viewport()
+    centre = QPointF(VIEWPORT[0] / 2, VIEWPORT[1] / 2)
+
+    def frame(event):
+        start = time.perf_counter()
+        app.sendEvent(viewport, event)
+        viewport.repaint()
+        return (time.perf_counter() - start) * 1000
+
+    def wheel(delta):
+        return QWheelEvent(
+            centre, view.mapToGlobal(centre), QPoint(0, 0), QPoint(0, delta), Qt.MouseButton.NoButton,
+            Qt.KeyboardModifier.NoModifier, Qt.ScrollPhase.NoScrollPhase, False
+        )
+
+    def mouse(kind, position, button, buttons):
+        return QMouseEvent(kind, position, view.mapToGlobal(position), button, buttons, Qt.KeyboardModifier.NoModifier)
+
+    zoom = [frame(wheel(-120)) for _ in range(ZOOM_STEPS)] + [frame(wheel(120)) for _ in range(ZOOM_STEPS)]
+
+    middle = Qt.MouseButton.MiddleButton
+    app.sendEvent(viewport, mouse(QEvent.Type.MouseButtonPress, centre, middle, middle))
+    pan = [
+        frame(mouse(QEvent.Type.MouseMove, centre - QPointF(PAN_STEP * step, PAN_STEP * step / 2), Qt.MouseButton.NoButton, middle))
+        for step in range(1, PAN_FRAMES + 1)
+    ]
+    app.sendEvent(viewport, mouse(QEvent.Type.MouseButtonRelease, centre, middle, Qt.MouseButton.NoButton))
+    parent.close()
+    graphics_scene.tile_cache.pool.waitForDone()
+    return {"zoom": summarise(zoom), "pan": summarise(pan)}
+
+
+def run(groups: int, nodes_per_group: int, depth: int, fan_out: int) -> dict:
+    app = application()
+    scene, graphics_scene, results = build(groups, nodes_per_group, depth, fan_out)
+    results["paint"] = paint(scene, graphics_scene)
+    results.update(interaction(app, scene, graphics_scene))
+    # Including the tile cache, and everything Qt allocated along the way.
+    results["memory"]["process_mb"] = resident_mb()
+    return {
+        "environment": environment(),
+        "parameters": {
+            "groups": groups, "nodes_per_group": nodes_per_group, "depth": depth, "fan_out": fan_out,
+            "nodes": node_count(groups, nodes_per_group, depth, fan_out), "viewport": VIEWPORT,
+        },
+        "results": results,
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = dict()
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(before: dict, after: dict, threshold: float) -> list[str]:
+    """Print the two runs side by side. Returns the metrics which grew by more than `threshold`."""
+    if before["parameters"] != after["parameters"]:
+        print("Warning: the runs were made with different parameters", file=sys.stderr)
+    old, new = flatten(before["results"]), flatten(after["results"])
+    rows, regressions = list(), list()
+    for key in old.keys() & new.keys():
+        change = (new[key] - old[key]) / old[key] if old[key] else 0.0
+        if change > threshold:
+            regressions.append(key)
+        rows.append((key, f"{old[key]:.2f}", f"{new[key]:.2f}", f"{change:+.1%}", "worse" if key in regressions else ""))
+    print_table(
+        ("metric", before["environment"]["commit"] or "before", after["environment"]["commit"] or "after", "change", ""),
+        sorted(rows)
+    )
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmark.suite", description=__doc__.splitlines()[1])
+    parser.add_argument("--groups", type=int, default=20, help="top level groups")
+    parser.add_argument("--nodes-per-group", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=3, help="levels of groups, counting the top level")
+    parser.add_argument("--fan-out", type=int, default=4, help="sub-groups per group")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two results files")
+    parser.add_argument("--threshold", type=float, default=0.1, help="growth counted as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        runs = list()
+        for path in args.compare:
+            with open(path, encoding="utf-8") as file:
+                runs.append(json.load(file))
+        return 1 if compare(*runs, args.threshold) else 0
+
+    results = run(args.groups, args.nodes_per_group, args.depth, args.fan_out)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,114 @@
+"""Synthetic multilevel graphs, written in the README's super file / group file format."""
+import json
+import os
+import random
+import uuid
+
+
+def node_data(rng: random.Random, name: str) -> dict:
+    return {
+        "node id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "node name": name,
+        "inputs": [{
+            "type": "socket",
+            "socket id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "socket type": "string",
+            "description": "Input String",
+            "parameter": ""
+        }]
+    }
+
+
+def group_data(rng: random.Random, name: str, nodes_per_group: int, depth: int, fan_out: int, level: int) -> dict:
+    nodes = [node_data(rng, f"{name}.{i}") for i in range(nodes_per_group)]
+    connections = [
+        {
+            "id": "",
+            "start": {"node": start["node id"], "socket": start["inputs"][0]["socket id"]},
+            "end": {"node": end["node id"], "socket": end["inputs"][0]["socket id"]},
+            "type": "straight"
+        }
+        for start, end in zip(nodes, nodes[1:])
+    ]
+    group = {
+        "group_name": name,
+        "levels": [level, None],
+        "ports": [{"type": "conduit", "id": str(uuid.UUID(int=rng.getrandbits(128))), "description": ""}],
+        "nodes": nodes,
+        "connections": connections,
+    }
+    if depth > 1:
+        group["sub-groups"] = [
+            group_data(rng, f"{name}.{i}", nodes_per_group, depth - 1, fan_out, level + 1) 
+            for i in range(fan_out)
+        ]
+    return group
+
+
+def write_super_file(
+    directory: str, 
+    group_count: int = 10, 
+    nodes_per_group: int = 100, 
+    depth: int = 2, 
+    fan_out: int = 2, 
+    seed: int = 0
+) -> str:
+    """
+    Write a super file referencing `group_count` group files, each holding a hierarchy `depth` groups deep
+    with `fan_out` sub-groups per group. Returns the path of the super file.
+    """
+    rng = random.Random(seed)
+    groups = list()
+    for index in range(group_count):
+        name = f"Group {index}"
+        filename = f"group-{index}.json"
+        group = group_data(rng, name, nodes_per_group, depth, fan_out, 1)
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as file:
+            json.dump({"name": name, "ports": group["ports"], "groups": group.get("sub-groups", []),
+                       "nodes": group["nodes"], "connections": group["connections"]}, file)
+        groups.append({
+            "group_name": name, 
+            "levels": [index % 2, None], 
+            "ports": group["ports"], 
+            "filepath": filename
+        })
+
+    path = os.path.join(directory, "super.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"name": "Synthetic", "ports": [], "groups": groups}, file)
+    return path
+
+
+def node_count(group_count: int, nodes_per_group: int, depth: int, fan_out: int) -> int:
+    groups_per_file = sum(fan_out**level for level in range(depth))
+    return group_count * groups_per_file * nodes_per_group
+
+
+def synthetic_scene(group_count: int = 10, nodes_per_group: int = 100, depth: int = 2, fan_out: int = 2):
+    """The same shape of hierarchy as write_super_file, built directly in memory, with each group's nodes chained."""
+    from src.model.edge import Edge
+    from src.model.group import Group
+    from src.model.node import Node
+    from src.model.scene import Scene
+
+    scene = Scene()
+    stack = [(None, f"/{index}", depth) for index in reversed(range(group_count))]
+    while stack:
+        parent, group_id, remaining = stack.pop()
+        group = Group(scene, group_id, group_id, parent=parent, min_level=depth - remaining)
+        scene.add_group(group)
+        if parent is not None:
+            parent.groups.append(group_id)
+        previous = None
+        for index in range(nodes_per_group):
+            node = Node(scene, f"{group_id}/nodes/{index}", group=group_id)
+            group.nodes.append(node.id)
+            scene.add_node(node)
+            if previous is not None:
+                edge = Edge(scene, f"{group_id}/connections/{index}", {'node': previous}, {'node': node.id})
+                group.edges.append(edge.id)
+                scene.add_edge(edge)
+            previous = node.id
+        if remaining > 1:
+            stack.extend((group, f"{group_id}/{index}", remaining - 1) for index in reversed(range(fan_out)))
+    return scene
@@ -0,0 +1,152 @@
+"""
+The model without a window, for batch jobs and scripts.
+
+    python -m src.headless info SCENE
+    python -m src.headless convert SUPER_FILE SNAPSHOT
+    python -m src.headless layout SCENE SNAPSHOT [--workers N]
+    python -m src.headless export SCENE DIRECTORY --levels 0 1 2 [--svg] [--scale S] [--tile-pixels P] [--workers N]
+
+A SCENE is either a super file, read along with every group file it references, or a snapshot written by
+convert or layout. Each command imports only the parts of the model it uses, and only export imports Qt,
+on the offscreen platform.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+
+def is_snapshot(path: str) -> bool:
+    from src.model.snapshot import MAGIC
+
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def read_scene(path: str):
+    if is_snapshot(path):
+        from src.model.snapshot import Snapshot
+
+        with Snapshot(path) as snapshot:
+            return snapshot.to_scene()
+    from src.model.loader import load_scene
+
+    return load_scene(path, lazy=False)
+
+
+def report(message: str, started: float):
+    print(f"{message} in {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+
+
+def info(args) -> int:
+    started = time.perf_counter()
+    scene = read_scene(args.scene)
+    report(f"Read {args.scene}", started)
+    levels = sorted({level for group in scene.groups for level in (group.min_level, group.max_level) if level is not None})
+    print(f"name         {scene.name}")
+    print(f"nodes        {len(scene.nodes):,}")
+    print(f"connections  {len(scene.edges):,}")
+    print(f"groups       {len(scene.groups):,}, {sum(not group.loaded for group in scene.groups):,} unloaded")
+    print(f"levels       {levels[0]} to {levels[-1]}" if levels else "levels       none")
+    return 0
+
+
+def convert(args) -> int:
+    from src.model.snapshot import convert_super_file
+
+    started = time.perf_counter()
+    scene = convert_super_file(args.super_file, args.snapshot)
+    report(f"Wrote {len(scene.nodes):,} nodes to {args.snapshot}", started)
+    return 0
+
+
+def layout(args) -> int:
+    from src.model.layout import Layout_Engine
+    from src.model.snapshot import write_snapshot
+
+    started = time.perf_counter()
+    scene = read_scene(args.scene)
+    report(f"Read {args.scene}", started)
+    started = time.perf_counter()
+    if args.workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(args.workers) as executor:
+            Layout_Engine(scene, executor=executor).layout()
+    else:
+        Layout_Engine(scene).layout()
+    report(f"Laid out {len(scene.nodes):,} nodes", started)
+    write_snapshot(scene, args.snapshot)
+    return 0
+
+
+def export(args) -> int:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    from src.ui.export import Scene_Exporter
+
+    # Kept referenced until the export is done.
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    started = time.perf_counter()
+    scene = read_scene(args.scene)
+    report(f"Read {args.scene}", started)
+    if args.layout:
+        from src.model.layout import Layout_Engine
+
+        Layout_Engine(scene).layout()
+    exporter = Scene_Exporter(scene, args.directory, args.tile_pixels, args.workers)
+    for level in args.levels:
+        started = time.perf_counter()
+        entry = exporter.export_level(level, args.svg, args.scale)
+        tiles = "" if args.svg else f", {entry['columns'] * entry['rows']:,} tiles"
+        report(f"Rendered level {level} at scale {entry['scale']:.3g}{tiles}", started)
+    started = time.perf_counter()
+    exporter.finish()
+    report("Wrote the last tiles", started)
+    for path in exporter.errors:
+        print(f"Could not write {path}", file=sys.stderr)
+    return 1 if exporter.errors else 0
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.headless", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("info", help="count what a scene holds")
+    command.add_argument("scene")
+    command.set_defaults(run=info)
+
+    command = commands.add_parser("convert", help="compile a super file and its group files into a snapshot")
+    command.add_argument("super_file")
+    command.add_argument("snapshot")
+    command.set_defaults(run=convert)
+
+    command = commands.add_parser("layout", help="lay a scene out and write it as a snapshot")
+    command.add_argument("scene")
+    command.add_argument("snapshot")
+    command.add_argument("--workers", type=int, default=1, help="processes laying out the top level groups")
+    command.set_defaults(run=layout)
+
+    command = commands.add_parser("export", help="render a scene to image tiles or SVG at each magnification")
+    command.add_argument("scene")
+    command.add_argument("directory")
+    command.add_argument("--levels", type=int, nargs="+", default=[0], help="magnifications to export")
+    command.add_argument("--svg", action="store_true", help="write one SVG per level rather than PNG tiles")
+    command.add_argument("--scale", type=float, help="pixels per scene unit, rather than the view's at each level")
+    command.add_argument("--tile-pixels", type=int, default=1024)
+    command.add_argument("--workers", type=int, help="threads encoding and writing tiles")
+    command.add_argument("--layout", action="store_true", help="lay the scene out first")
+    command.set_defaults(run=export)
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    args = parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,21 +1,33 @@
+"""
+The application window. Run from the top of the repository:
+
+    python -m src.main [SUPER_FILE]
+
+Qt is imported only once a window is wanted. Jobs which don't need one should use src.headless, which never
+imports it.
+"""
 import sys
-import os
 
-from pprint import pprint
-from PySide6.QtWidgets import QApplication
-from PySide6 import QtCore
 
-from ui.main_window import Main_Window
+def main(app, filepath: str | None = None):
+    from PySide6 import QtCore
+    from PySide6.QtWidgets import QApplication
 
+    from src.ui.main_window import Main_Window
 
-def main(app):
     main_window = Main_Window(app)
+    if filepath is not None:
+        main_window.open_scene(filepath)
 
     if (sys.flags.interactive != 1) or not hasattr(QtCore, "PYQT_VERSION"):
         QApplication.instance().exec()
 
 
 if __name__ == '__main__':
+    from PySide6.QtWidgets import QApplication
+
     app = QApplication(sys.argv)
 
-    main(app)
+    # Any argument Qt didn't consume is taken to be a super file to open.
+    arguments = app.arguments()[1:]
+    main(app, arguments[0] if arguments else None)
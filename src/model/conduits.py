@@ -0,0 +1,184 @@
+"""
+Connection counts between groups, for drawing conduits in place of connections when zoomed out.
+
+Every connection is counted once, under the groups of the nodes at its two ends. That table changes by one
+count per connection added or removed, and has an entry per pair of groups which are connected, however
+many connections there are between them.
+
+At a magnification where a node's group is hidden, the node is shown by the innermost group around it
+which is drawn: a group is drawn where its parent's subordinates are visible, as in the spatial index. The
+conduits at a magnification are the pairs of those groups, with the counts of every pair of groups inside
+them summed. They are worked out from the group pairs, rather than the connections, the first time each
+magnification is asked for, and kept up to date by each edit afterwards. Connections with a node shown at
+either end, or with both ends in the same drawn group, are not in any conduit.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from src.model.abstract_types import Scene_Type
+from src.model.edge import Edge
+from src.model.node_store import NO_GROUP
+
+# (start group, end group)
+Conduit = tuple[str, str]
+
+
+class Conduit_Table():
+    def __init__(self, scene: Scene_Type) -> None:
+        self.scene = scene
+        # Connections by the groups of their end nodes, (start group, end group) to count.
+        self.pairs = dict()
+        # The pair each counted connection is under.
+        self._edge_pairs = dict()
+        # The connections with an end on each node. Those to a node which isn't in the scene aren't counted.
+        self._node_edges = dict()
+        # Magnification to the conduits drawn at it, and to the group drawn for each hidden group.
+        self._conduits = dict()
+        self._drawn = dict()
+        self.add_edges(scene.edges)
+
+
+    def __len__(self) -> int:
+        """The number of connections counted."""
+        return len(self._edge_pairs)
+
+
+    def at(self, level: int) -> dict[Conduit, int]:
+        """The conduits drawn at magnification `level`, with the number of connections through each."""
+        if level not in self._conduits:
+            conduits = dict()
+            for pair, count in self.pairs.items():
+                conduit = self.conduit(pair, level)
+                if conduit is not None:
+                    conduits[conduit] = conduits.get(conduit, 0) + count
+            self._conduits[level] = conduits
+        return self._conduits[level]
+
+
+    def count(self, start: str, end: str, level: int) -> int:
+        return self.at(level).get((start, end), 0)
+
+
+    def conduit(self, pair: tuple[str | None, str | None], level: int) -> Conduit | None:
+        """The conduit which connections between nodes of the two groups go through at `level`, if any."""
+        start, end = (self._drawn_group(group_id, level) for group_id in pair)
+        if start is None or end is None or start == end:
+            return None
+        return (start, end)
+
+
+    def _drawn_group(self, group_id: str | None, level: int) -> str | None:
+        """The group drawn in place of the nodes of `group_id`, or None when the nodes are shown themselves."""
+        tree = self.scene.group_tree
+        if group_id is None or group_id not in tree:
+            return None
+        visible = tree.visible_at(level)
+        if group_id in visible:
+            return None
+        drawn = self._drawn.setdefault(level, dict())
+        if group_id not in drawn:
+            # Climb to the innermost group whose parent's subordinates are visible, remembering the way.
+            path = [group_id]
+            parent_id = tree.parent[group_id]
+            while parent_id is not None and parent_id not in visible and parent_id not in drawn:
+                path.append(parent_id)
+                parent_id = tree.parent[parent_id]
+            top = drawn[parent_id] if parent_id is not None and parent_id in drawn else path[-1]
+            for each in path:
+                drawn[each] = top
+        return drawn[group_id]
+
+
+    def groups_changed(self):
+        """Forget the conduits worked out so far, after groups were added or their levels changed."""
+        self._conduits.clear()
+        self._drawn.clear()
+
+
+    def add_edge(self, edge: Edge):
+        self.add_edges([edge])
+
+
+    def add_edges(self, edges: Iterable[Edge]):
+        edges = list(edges)
+        node_edges = self._node_edges
+        for edge in edges:
+            start, end = edge.start.get('node'), edge.end.get('node')
+            node_edges.setdefault(start, set()).add(edge)
+            if end != start:
+                node_edges.setdefault(end, set()).add(edge)
+        self._count(edges)
+
+
+    def remove_edges(self, edges: Iterable[Edge]):
+        edges = list(edges)
+        for edge in edges:
+            for node_id in {edge.start.get('node'), edge.end.get('node')}:
+                attached = self._node_edges.get(node_id)
+                if attached is not None:
+                    attached.discard(edge)
+                    if not attached:
+                        del self._node_edges[node_id]
+        self._uncount(edges)
+
+
+    def nodes_added(self, node_ids: Iterable[str]):
+        """Count the connections which now have both of their ends in the scene."""
+        self._count([edge for node_id in node_ids for edge in self._node_edges.get(node_id, ())])
+
+
+    def nodes_removed(self, node_ids: Iterable[str]):
+        self._uncount([edge for node_id in node_ids for edge in self._node_edges.get(node_id, ())])
+
+
+    def _count(self, edges: list[Edge]):
+        # The ends' groups come from the node store's group column, in one lookup for the whole batch.
+        nodes = self.scene.nodes
+        rows, counted, ends = nodes.rows, list(), list()
+        # A connection between two of the nodes added comes up twice.
+        for edge in dict.fromkeys(edges):
+            if edge in self._edge_pairs:
+                continue
+            start, end = rows.get(edge.start.get('node')), rows.get(edge.end.get('node'))
+            if start is not None and end is not None:
+                counted.append(edge)
+                ends += (start, end)
+        if not counted:
+            return
+        codes = nodes.group_codes[np.asarray(ends, dtype=np.intp)].tolist()
+        groups = [nodes.group_ids[code] if code != NO_GROUP else None for code in codes]
+        deltas = dict()
+        for edge, pair in zip(counted, zip(groups[::2], groups[1::2])):
+            self._edge_pairs[edge] = pair
+            deltas[pair] = deltas.get(pair, 0) + 1
+        self._change(deltas)
+
+
+    def _uncount(self, edges: list[Edge]):
+        deltas = dict()
+        for edge in edges:
+            pair = self._edge_pairs.pop(edge, None)
+            if pair is not None:
+                deltas[pair] = deltas.get(pair, 0) - 1
+        self._change(deltas)
+
+
+    def _change(self, deltas: dict[tuple[str | None, str | None], int]):
+        for pair, delta in deltas.items():
+            count = self.pairs.get(pair, 0) + delta
+            if count:
+                self.pairs[pair] = count
+            else:
+                del self.pairs[pair]
+            for level, conduits in self._conduits.items():
+                conduit = self.conduit(pair, level)
+                if conduit is None:
+                    continue
+                count = conduits.get(conduit, 0) + delta
+                if count:
+                    conduits[conduit] = count
+                else:
+                    del conduits[conduit]
@@ -0,0 +1,20 @@
+from src.model.abstract_types import Scene_Type
+
+
+class Edge():
+    def __init__(
+        self, 
+        scene: Scene_Type, 
+        id: str, 
+        start: dict, 
+        end: dict, 
+        type: str = "straight", 
+        knots: list | None = None
+    ) -> None:
+        self.scene = scene
+        self.id = id
+        # Each end is a {"node", "socket"} reference, with a "group" when it lives in another group.
+        self.start = start
+        self.end = end
+        self.type = type
+        self.knots = knots if knots is not None else list()
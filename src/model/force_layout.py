@@ -0,0 +1,196 @@
+"""
+Force directed layout of the members of a single group, for the innermost groups' compact layouts.
+
+Positions, sizes and links are held in NumPy arrays and every step is computed for all members at once.
+Small groups use exact all pairs repulsion. Larger groups bucket the members into a grid of cells CUTOFF
+ideal lengths wide and only repel members in the same or neighbouring cells, as in Fruchterman and
+Reingold's grid variant, with a weak pull towards the centre standing in for the far field.
+
+The converged positions are kept. They are first scaled about their centre to cover about the area the
+members need, which compacts a layout the forces left sparse. Members which then overlap are pushed apart
+along whichever axis they overlap least, and every few rounds the whole layout is spread out a little until
+none do. Scaling keeps every member's place relative to the others, and the pushes are local.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from src.model.layout import SPACING, Size, shelf_pack
+
+ITERATIONS = 40
+EXACT_LIMIT = 300
+GRAVITY = 0.05
+# Repulsion only reaches this many ideal lengths, which is also the width of a grid cell.
+CUTOFF = 1.5
+# The cell itself and half of its neighbours, so that each pair of cells is visited once.
+HALF_NEIGHBOURS = [(0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+SEPARATION_ROUNDS = 200
+# Overlaps still left after this many rounds of pushing spread the layout out by SPREAD.
+SPREAD_EVERY = 5
+SPREAD = 1.1
+
+
+class Force_Layout():
+    def __init__(self, sizes: list[Size], links: list[tuple[int, int]], iterations: int = ITERATIONS) -> None:
+        self.sizes = np.asarray(sizes, dtype=np.float64).reshape(-1, 2)
+        self.links = np.asarray(links, dtype=np.intp).reshape(-1, 2)
+        self.iterations = iterations
+        count = len(self.sizes)
+        # Ideal distance between the centres of two members.
+        self.k = (float(np.sqrt((self.sizes + SPACING).prod(axis=1).mean())) if count else 1.0)
+        # Start from the packed layout, so the result is deterministic and already compact.
+        offsets = np.asarray(shelf_pack([tuple(size) for size in self.sizes], links), dtype=np.float64)
+        self.positions = offsets.reshape(-1, 2) + self.sizes / 2
+
+
+    def repulsion_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.neighbour_pairs(CUTOFF * self.k)
+
+
+    def neighbour_pairs(self, cell: float) -> tuple[np.ndarray, np.ndarray]:
+        """Each pair of members in the same or neighbouring grid cells `cell` wide, once."""
+        count = len(self.positions)
+        cells = np.floor((self.positions - self.positions.min(axis=0)) / cell).astype(np.int64)
+        columns = int(cells[:, 0].max()) + 3
+        keys = (cells[:, 1] + 1) * columns + cells[:, 0] + 1
+        order = np.argsort(keys, kind='stable')
+        # Only occupied cells are kept, so a spread out layout doesn't need a huge grid.
+        occupied, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+        sources, targets = list(), list()
+        for dx, dy in HALF_NEIGHBOURS:
+            neighbour = keys + dy * columns + dx
+            index = np.minimum(np.searchsorted(occupied, neighbour), len(occupied) - 1)
+            neighbour_counts = np.where(occupied[index] == neighbour, counts[index], 0)
+            total = int(neighbour_counts.sum())
+            if total == 0:
+                continue
+            source = np.repeat(np.arange(count), neighbour_counts)
+            first = np.cumsum(neighbour_counts) - neighbour_counts
+            target = order[np.repeat(starts[index], neighbour_counts) + np.arange(total) - np.repeat(first, neighbour_counts)]
+            # Within a cell, take each pair in one direction only.
+            keep = source < target if (dx, dy) == (0, 0) else slice(None)
+            sources.append(source[keep])
+            targets.append(target[keep])
+        return np.concatenate(sources), np.concatenate(targets)
+
+
+    def forces(self) -> np.ndarray:
+        positions = self.positions
+        k = self.k
+        if len(positions) <= EXACT_LIMIT:
+            delta = positions[:, None, :] - positions[None, :, :]
+            distance_squared = np.maximum((delta**2).sum(axis=2), 1.0)
+            force = (delta * (k * k / distance_squared)[:, :, None]).sum(axis=1)
+        else:
+            sources, targets = self.repulsion_pairs()
+            x, y = positions[:, 0], positions[:, 1]
+            dx, dy = x[sources] - x[targets], y[sources] - y[targets]
+            distance_squared = np.maximum(dx * dx + dy * dy, 1.0)
+            # Beyond the cell size the grid variant ignores repulsion, so cut it off there for every pair.
+            weight = np.where(distance_squared < (CUTOFF * k)**2, k * k / distance_squared, 0.0)
+            count = len(positions)
+            force = np.empty_like(positions)
+            for axis, delta in ((0, dx * weight), (1, dy * weight)):
+                force[:, axis] = np.bincount(sources, delta, minlength=count) - np.bincount(targets, delta, minlength=count)
+            force -= GRAVITY * (positions - positions.mean(axis=0))
+
+        if len(self.links):
+            a, b = self.links[:, 0], self.links[:, 1]
+            delta = positions[b] - positions[a]
+            pull = delta * (np.sqrt((delta**2).sum(axis=1)) / k)[:, None]
+            for axis in (0, 1):
+                force[:, axis] += np.bincount(a, pull[:, axis], minlength=len(positions))
+                force[:, axis] -= np.bincount(b, pull[:, axis], minlength=len(positions))
+        return force
+
+
+    def run(self) -> np.ndarray:
+        if len(self.positions) < 2:
+            return self.positions
+        temperature = self.k * math.sqrt(len(self.positions)) / 4
+        for step in range(self.iterations):
+            force = self.forces()
+            length = np.maximum(np.sqrt((force**2).sum(axis=1)), 1e-9)
+            self.positions += force * (np.minimum(length, temperature) / length)[:, None]
+            temperature *= 1 - 1 / (self.iterations - step + 1)
+        return self.positions
+
+
+    def overlaps(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The pairs of members closer than SPACING, with the distance between their centres and how much
+        further apart they need to be along each axis.
+        """
+        count = len(self.positions)
+        if count <= EXACT_LIMIT:
+            sources, targets = np.triu_indices(count, 1)
+        else:
+            # Members this far apart along both axes can't overlap, so neighbouring cells are enough.
+            sources, targets = self.neighbour_pairs(float(self.sizes.max()) + SPACING)
+        delta = self.positions[targets] - self.positions[sources]
+        need = (self.sizes[sources] + self.sizes[targets]) / 2 + SPACING - np.abs(delta)
+        overlapping = (need > 0).all(axis=1)
+        return sources[overlapping], targets[overlapping], delta[overlapping], need[overlapping]
+
+
+    def scale(self, factor: float):
+        centre = self.positions.mean(axis=0)
+        self.positions = centre + (self.positions - centre) * factor
+
+
+    def compact(self):
+        """Scale the layout to cover about the area its members need, spacing included."""
+        needed = float((self.sizes + SPACING).prod(axis=1).sum())
+        covered = float((np.ptp(self.positions, axis=0) + (self.sizes + SPACING).mean(axis=0)).prod())
+        self.scale(math.sqrt(needed / covered))
+
+
+    def separate(self):
+        """Remove the overlaps, moving the members as little as the pairs overlapping need."""
+        count = len(self.positions)
+        for step in range(SEPARATION_ROUNDS):
+            sources, targets, delta, need = self.overlaps()
+            if not len(sources):
+                return
+            if step and step % SPREAD_EVERY == 0:
+                # The pushes of a crowded patch work against each other, so give it room.
+                self.scale(SPREAD)
+                continue
+            # Each of the pair moves half the way, along the axis they overlap least.
+            axis = np.argmin(need, axis=1)
+            rows = np.arange(len(sources))
+            # Members on top of each other part in index order.
+            direction = np.where(delta[rows, axis] != 0, np.sign(delta[rows, axis]), 1.0)
+            shift = direction * need[rows, axis] / 2
+            for each in (0, 1):
+                moved = np.where(axis == each, shift, 0.0)
+                self.positions[:, each] += np.bincount(targets, moved, minlength=count)
+                self.positions[:, each] -= np.bincount(sources, moved, minlength=count)
+
+        sources, targets, delta, need = self.overlaps()
+        if len(sources):
+            # Spreading out about the centre only ever moves members apart, so it can't add an overlap.
+            distance = np.maximum(np.abs(delta), 1e-9)
+            self.scale(float(((distance + need) / distance).min(axis=1).max()))
+
+
+    def offsets(self) -> list[tuple[float, float]]:
+        """The top left corner of each member, from the positions with their overlaps removed."""
+        if len(self.positions) == 0:
+            return list()
+        if len(self.positions) > 1:
+            self.compact()
+        self.separate()
+        corners = self.positions - self.sizes / 2
+        corners -= corners.min(axis=0)
+        return [tuple(corner) for corner in corners.tolist()]
+
+
+def force_directed(sizes: list[Size], links: list[tuple[int, int]]) -> list[tuple[float, float]]:
+    """An arrangement for the Layout_Engine."""
+    layout = Force_Layout(sizes, links)
+    layout.run()
+    return layout.offsets()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from src.model.abstract_types import Scene_Type
+
+
+class Group():
+    def __init__(
+        self, 
+        scene: Scene_Type, 
+        id: str, 
+        name: str = "", 
+        parent: Group | None = None, 
+        min_level: int | None = None, 
+        max_level: int | None = None, 
+        filepath: str | None = None
+    ) -> None:
+        self.scene = scene
+        self.id = id
+        self.name = name
+        self.parent = parent
+        # The range of magnifications at which the group's direct subordinates are visible.
+        self.min_level = min_level
+        self.max_level = max_level
+        # Groups defined in their own file are only read when they are first needed.
+        self.filepath = filepath
+        self.loaded = filepath is None
+        # The bounds of the group's members, (x, y, width, height), once the scene is spatially indexed.
+        self.rect = None
+
+        self.ports = list()
+        self.groups = list()
+        self.nodes = list()
+        self.edges = list()
+
+
+    def visible_at(self, level: int) -> bool:
+        return (
+            (self.min_level is None or level >= self.min_level) and 
+            (self.max_level is None or level <= self.max_level)
+        )
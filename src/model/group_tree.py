@@ -0,0 +1,241 @@
+"""
+The nesting of a Scene's groups, indexed for the questions level of detail and conduit routing keep asking.
+
+Each group gets an interval from a preorder walk, so "is A inside B" is two comparisons and a group's
+descendants are a contiguous slice. The lowest common group of two groups comes from a sparse table of
+minimum depths over an Euler tour of the tree, in constant time. The groups visible at each magnification
+are cached per level once asked for.
+
+Edits keep the parent, child and level maps up to date straight away and patch the visibility caches. Until
+the walk and the sparse table are rebuilt, queries are answered by walking those maps. They are rebuilt, in
+O(n log n), once the walking done since the structure changed has cost about as much, so a run of edits and
+queries, such as loading groups one at a time, doesn't rebuild after every edit.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from src.model.group import Group
+
+NO_MIN_LEVEL = np.iinfo(np.int32).min
+NO_MAX_LEVEL = np.iinfo(np.int32).max
+
+
+class Group_Tree():
+    """Groups by id, under a root of None which stands for the top level of the scene."""
+    def __init__(self, groups: list[Group] = ()) -> None:
+        self.parent = dict()
+        self.children = {None: list()}
+        self.levels = dict()
+        self._visible = dict()
+        self._stale = True
+        # Steps walked through the maps since the structure changed.
+        self._walked = 0
+        for group in groups:
+            self.parent[group.id] = group.parent.id if group.parent is not None else None
+            self.children[group.id] = list()
+            self.levels[group.id] = (group.min_level, group.max_level)
+        for group_id, parent_id in self.parent.items():
+            # A group whose parent isn't in the scene is treated as top level.
+            if parent_id not in self.children:
+                self.parent[group_id] = parent_id = None
+            self.children[parent_id].append(group_id)
+
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+
+    def __contains__(self, group_id) -> bool:
+        return group_id in self.parent
+
+
+    def _build(self):
+        """Number the groups in preorder, and build the Euler tour and its sparse table."""
+        self.order = list()
+        self.enter = dict()
+        self.exit = dict()
+        self.depth = {None: 0}
+        self.first = {None: 0}
+        self.enter[None] = 0
+        self.order.append(None)
+        tour, tour_depths = [None], [0]
+        stack = [(None, iter(self.children[None]))]
+        while stack:
+            group_id, remaining = stack[-1]
+            child_id = next(remaining, None)
+            if child_id is None:
+                stack.pop()
+                self.exit[group_id] = len(self.order) - 1
+                if stack:
+                    # Back up to the parent, which shows up in the tour again after each child.
+                    tour.append(stack[-1][0])
+                    tour_depths.append(self.depth[stack[-1][0]])
+                continue
+            depth = self.depth[group_id] + 1
+            self.depth[child_id] = depth
+            self.enter[child_id] = len(self.order)
+            self.order.append(child_id)
+            self.first[child_id] = len(tour)
+            tour.append(child_id)
+            tour_depths.append(depth)
+            stack.append((child_id, iter(self.children[child_id])))
+
+        self._tour = tour
+        depths = np.asarray(tour_depths, dtype=np.int32)
+        self._tour_depths = depths
+        # table[k][i] is the position of the shallowest entry in tour[i:i + 2**k].
+        table = [np.arange(len(tour))]
+        span = 1
+        while 2 * span <= len(tour):
+            previous = table[-1]
+            left, right = previous[:-span], previous[span:]
+            table.append(np.where(depths[left] <= depths[right], left, right))
+            span *= 2
+        self._table = table
+        self._stale = False
+        self._walked = 0
+
+
+    def _indexed(self) -> bool:
+        """Whether queries can use the preorder numbering, rebuilding it if the walks have cost enough."""
+        count = len(self.parent)
+        if self._stale and self._walked >= count * max(1, count.bit_length()):
+            self._build()
+        return not self._stale
+
+
+    def _path(self, group_id: str | None) -> list[str | None]:
+        """From the group out to None, walked through the parent map."""
+        path = [group_id]
+        while group_id is not None:
+            group_id = self.parent[group_id]
+            path.append(group_id)
+        self._walked += len(path)
+        return path
+
+
+    def is_ancestor(self, ancestor_id: str | None, group_id: str | None) -> bool:
+        """Whether `group_id` is `ancestor_id` or nested inside it."""
+        if not self._indexed():
+            return ancestor_id in self._path(group_id)
+        return self.enter[ancestor_id] <= self.enter[group_id] <= self.exit[ancestor_id]
+
+
+    def common_ancestor(self, a: str | None, b: str | None) -> str | None:
+        """The innermost group holding both, which may be either of them. None is the top level."""
+        if not self._indexed():
+            path = set(self._path(a))
+            return next(each for each in self._path(b) if each in path)
+        left, right = self.first[a], self.first[b]
+        if left > right:
+            left, right = right, left
+        k = (right - left + 1).bit_length() - 1
+        row = self._table[k]
+        i, j = row[left], row[right - (1 << k) + 1]
+        return self._tour[i if self._tour_depths[i] <= self._tour_depths[j] else j]
+
+
+    def ancestors(self, group_id: str | None) -> list[str]:
+        """From the group's parent outwards."""
+        result = list()
+        parent_id = self.parent.get(group_id)
+        while parent_id is not None:
+            result.append(parent_id)
+            parent_id = self.parent[parent_id]
+        return result
+
+
+    def descendants(self, group_id: str | None) -> list[str]:
+        if not self._indexed():
+            # In preorder, as the numbering would give them.
+            result, stack = list(), list(reversed(self.children[group_id]))
+            while stack:
+                each = stack.pop()
+                result.append(each)
+                stack.extend(reversed(self.children[each]))
+            self._walked += len(result) + 1
+            return result
+        return self.order[self.enter[group_id] + 1:self.exit[group_id] + 1]
+
+
+    def group_depth(self, group_id: str | None) -> int:
+        """Top level groups are at depth 1."""
+        if not self._indexed():
+            return len(self._path(group_id)) - 1
+        return self.depth[group_id]
+
+
+    def _visible_at(self, group_id: str, level: int) -> bool:
+        min_level, max_level = self.levels[group_id]
+        return (min_level is None or level >= min_level) and (max_level is None or level <= max_level)
+
+
+    def visible_at(self, level: int) -> set[str]:
+        """The groups whose direct subordinates are visible at magnification `level`, as Group.visible_at."""
+        if level not in self._visible:
+            ids = list(self.levels)
+            mins = np.fromiter(
+                (NO_MIN_LEVEL if min_level is None else min_level for min_level, _ in self.levels.values()),
+                np.int64, len(ids)
+            )
+            maxs = np.fromiter(
+                (NO_MAX_LEVEL if max_level is None else max_level for _, max_level in self.levels.values()),
+                np.int64, len(ids)
+            )
+            visible = np.flatnonzero((mins <= level) & (maxs >= level)).tolist()
+            self._visible[level] = {ids[index] for index in visible}
+        return self._visible[level]
+
+
+    def _patch_visible(self, group_ids: list[str], present: bool):
+        # In place, so an edit costs the groups it touches rather than a copy of each level's set.
+        for level, visible in self._visible.items():
+            if present:
+                visible.update(group_id for group_id in group_ids if self._visible_at(group_id, level))
+            else:
+                visible.difference_update(group_ids)
+
+
+    def add(self, group_id: str, parent_id: str | None = None, min_level: int | None = None, max_level: int | None = None):
+        if group_id in self.parent:
+            raise KeyError(f"Group {group_id} is already in the tree")
+        self.parent[group_id] = parent_id
+        self.children[group_id] = list()
+        self.children[parent_id].append(group_id)
+        self.levels[group_id] = (min_level, max_level)
+        self._patch_visible([group_id], True)
+        self._stale = True
+
+
+    def remove(self, group_id: str) -> list[str]:
+        """Remove a group and everything nested in it. Returns the ids removed."""
+        # Walked from the children rather than the preorder numbering, which would have to be rebuilt first.
+        removed, stack = list(), [group_id]
+        while stack:
+            each = stack.pop()
+            removed.append(each)
+            stack.extend(reversed(self.children[each]))
+        self.children[self.parent[group_id]].remove(group_id)
+        for each in removed:
+            del self.parent[each]
+            del self.children[each]
+            del self.levels[each]
+        self._patch_visible(removed, False)
+        self._stale = True
+        return removed
+
+
+    def reparent(self, group_id: str, parent_id: str | None):
+        if parent_id is not None and (parent_id == group_id or group_id in self.ancestors(parent_id)):
+            raise ValueError(f"Group {parent_id} is inside {group_id}")
+        self.children[self.parent[group_id]].remove(group_id)
+        self.children[parent_id].append(group_id)
+        self.parent[group_id] = parent_id
+        self._stale = True
+
+
+    def set_levels(self, group_id: str, min_level: int | None, max_level: int | None):
+        self.levels[group_id] = (min_level, max_level)
+        self._patch_visible([group_id], False)
+        self._patch_visible([group_id], True)
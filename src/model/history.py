@@ -0,0 +1,213 @@
+"""
+Undo and redo for edits to a Scene.
+
+Rather than copies of the scene, the history keeps one command per edit holding only what the edit changed:
+the ids and old and new positions of the nodes it moved, or the nodes and edges it removed. Undoing or
+redoing a command costs time in proportion to the nodes it touches, and a long history takes little memory
+next to the scene. Removed nodes are kept as tuples of their attributes, and removed edges as the Edge
+objects themselves, which nothing else refers to once they are out of the scene.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+from src.model.node import Node
+from src.model.scene import Scene
+
+HISTORY_LIMIT = 1000
+
+# id, title, group, x, y, inputs, outputs
+Node_Record = tuple[str, str, str | None, float, float, list, list]
+
+
+def node_record(scene: Scene, node_id: str) -> Node_Record:
+    node = scene.nodes[node_id]
+    return (node_id, node.title, node.group, node.x, node.y, node.inputs, node.outputs)
+
+
+def restore_nodes(scene: Scene, records: list[Node_Record]):
+    members = dict()
+    for node_id, title, group_id, x, y, inputs, outputs in records:
+        node = Node(scene, node_id, title, group_id)
+        node.x, node.y = x, y
+        node.inputs, node.outputs = inputs, outputs
+        group = scene.get_group(group_id)
+        if group is not None:
+            if group_id not in members:
+                members[group_id] = set(group.nodes)
+            if node_id not in members[group_id]:
+                members[group_id].add(node_id)
+                group.nodes.append(node_id)
+        scene.add_node(node)
+
+
+class Command(ABC):
+    """An edit which can be applied to a scene and reverted again."""
+    __slots__ = ()
+    text = ""
+
+    @abstractmethod
+    def apply(self, scene: Scene):
+        ...
+
+
+    @abstractmethod
+    def revert(self, scene: Scene):
+        ...
+
+
+class Add_Nodes(Command):
+    __slots__ = ('records',)
+    text = "Add nodes"
+
+    def __init__(self, records: list[Node_Record]) -> None:
+        self.records = records
+
+
+    def apply(self, scene: Scene):
+        restore_nodes(scene, self.records)
+
+
+    def revert(self, scene: Scene):
+        scene.remove_nodes([record[0] for record in self.records])
+
+
+class Remove_Nodes(Command):
+    """Remove nodes along with the edges attached to them. What was removed is recorded when it is applied."""
+    __slots__ = ('node_ids', 'records', 'edges')
+    text = "Remove nodes"
+
+    def __init__(self, node_ids: Iterable[str]) -> None:
+        self.node_ids = list(node_ids)
+        self.records = None
+        self.edges = None
+
+
+    def apply(self, scene: Scene):
+        self.records = [node_record(scene, node_id) for node_id in self.node_ids if node_id in scene.nodes]
+        self.edges = scene.remove_node_edges(self.node_ids)
+        scene.remove_nodes([record[0] for record in self.records])
+
+
+    def revert(self, scene: Scene):
+        restore_nodes(scene, self.records)
+        scene.restore_edges(self.edges)
+        self.records = self.edges = None
+
+
+class Move_Nodes(Command):
+    __slots__ = ('node_ids', 'before', 'after')
+    text = "Move nodes"
+
+    def __init__(self, node_ids: list[str], before: np.ndarray, after: np.ndarray) -> None:
+        self.node_ids = node_ids
+        # (N, 2) arrays of the positions.
+        self.before = before
+        self.after = after
+
+
+    @staticmethod
+    def _move(scene: Scene, node_ids: list[str], positions: np.ndarray):
+        for node_id, (x, y) in zip(node_ids, positions.tolist()):
+            scene.move_node(node_id, x, y)
+
+
+    def apply(self, scene: Scene):
+        self._move(scene, self.node_ids, self.after)
+
+
+    def revert(self, scene: Scene):
+        self._move(scene, self.node_ids, self.before)
+
+
+class Retitle_Node(Command):
+    __slots__ = ('node_id', 'before', 'after')
+    text = "Rename node"
+
+    def __init__(self, node_id: str, before: str, after: str) -> None:
+        self.node_id = node_id
+        self.before = before
+        self.after = after
+
+
+    def apply(self, scene: Scene):
+        scene.set_node_title(self.node_id, self.after)
+
+
+    def revert(self, scene: Scene):
+        scene.set_node_title(self.node_id, self.before)
+
+
+class History():
+    """
+    The undo and redo stacks of a scene. Edits made through the history can be undone, the last `limit`
+    of them at most. Making a new edit forgets the ones which were undone.
+    """
+    def __init__(self, scene: Scene, limit: int = HISTORY_LIMIT) -> None:
+        self.scene = scene
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = list()
+
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+
+    def push(self, command: Command) -> Command:
+        """Apply the command and make it the next to undo."""
+        command.apply(self.scene)
+        self.undo_stack.append(command)
+        self.redo_stack.clear()
+        return command
+
+
+    def undo(self) -> Command | None:
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        command.revert(self.scene)
+        self.redo_stack.append(command)
+        return command
+
+
+    def redo(self) -> Command | None:
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        command.apply(self.scene)
+        self.undo_stack.append(command)
+        return command
+
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+
+    def add_node(self, node_id: str, title: str = "", group: str | None = None, x: float = 0.0, y: float = 0.0):
+        return self.push(Add_Nodes([(node_id, title, group, float(x), float(y), list(), list())]))
+
+
+    def remove_nodes(self, node_ids: Iterable[str]):
+        return self.push(Remove_Nodes(node_ids))
+
+
+    def move_nodes(self, node_ids: list[str], positions) -> Move_Nodes:
+        nodes = self.scene.nodes
+        before = np.array([(nodes[node_id].x, nodes[node_id].y) for node_id in node_ids], dtype=np.float64).reshape(-1, 2)
+        after = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        return self.push(Move_Nodes(list(node_ids), before, after))
+
+
+    def set_node_title(self, node_id: str, title: str) -> Retitle_Node:
+        return self.push(Retitle_Node(node_id, self.scene.nodes[node_id].title, title))
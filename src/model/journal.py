@@ -0,0 +1,116 @@
+"""
+A journal of the edits made to a Scene's nodes, for the view, layout and routing to follow incrementally.
+
+Edits are coalesced into a Changes until the journal is flushed, and each subscriber then gets the net
+effect: a node moved a hundred times since the last flush is one move, and one added and removed again is
+nothing at all. The model knows nothing of event loops, so a UI passes in a `schedule` function which runs
+the flush on its next tick.
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+from src.model.spatial_index import Rect
+
+
+class Changes():
+    """
+    The net edits since the last flush, by node id. Removed and moved nodes keep the rect they had before,
+    and removed ones their group, since the scene no longer knows either. A node removed and then added
+    again is in both `removed` and `added`, so subscribers should apply the removals first.
+    """
+    def __init__(self) -> None:
+        self.added = set()
+        self.removed = dict()
+        self.moved = dict()
+        self.retitled = set()
+
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.moved or self.retitled)
+
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.moved) + len(self.retitled)
+
+
+    @property
+    def changed(self) -> set[str]:
+        """The nodes still in the scene whose item needs bringing up to date."""
+        return self.added | self.moved.keys() | self.retitled
+
+
+class Journal():
+    def __init__(self, schedule: Callable[[Callable[[], None]], None] | None = None) -> None:
+        # Called with the flush once per batch of edits. Without one, the owner flushes by hand.
+        self.schedule = schedule
+        self.subscribers = list()
+        self.pending = Changes()
+        self._scheduled = False
+
+
+    def subscribe(self, callback: Callable[[Changes], None]):
+        """Edits are only recorded while someone is subscribed."""
+        self.subscribers.append(callback)
+
+
+    def unsubscribe(self, callback: Callable[[Changes], None]):
+        self.subscribers.remove(callback)
+
+
+    def _changed(self):
+        if self.schedule is not None and not self._scheduled:
+            self._scheduled = True
+            self.schedule(self.flush)
+
+
+    def added(self, node_id: str):
+        if not self.subscribers:
+            return
+        self.pending.added.add(node_id)
+        self._changed()
+
+
+    def removed(self, node_id: str, rect: Rect, group_id: str | None):
+        if not self.subscribers:
+            return
+        pending = self.pending
+        if node_id in pending.added:
+            pending.added.discard(node_id)
+            pending.retitled.discard(node_id)
+            pending.moved.pop(node_id, None)
+            # Added since the last flush, so the subscribers never saw it.
+            if node_id not in pending.removed:
+                return
+        else:
+            pending.retitled.discard(node_id)
+            rect = pending.moved.pop(node_id, rect)
+            pending.removed[node_id] = (rect, group_id)
+        self._changed()
+
+
+    def moved(self, node_id: str, old_rect: Rect):
+        if not self.subscribers:
+            return
+        if node_id not in self.pending.added:
+            # Keep the first rect, where the subscribers last saw the node.
+            self.pending.moved.setdefault(node_id, old_rect)
+            self._changed()
+
+
+    def retitled(self, node_id: str):
+        if not self.subscribers:
+            return
+        if node_id not in self.pending.added:
+            self.pending.retitled.add(node_id)
+            self._changed()
+
+
+    def flush(self) -> Changes:
+        """Hand the pending changes to every subscriber, and start a new batch."""
+        changes, self.pending = self.pending, Changes()
+        self._scheduled = False
+        if changes:
+            for callback in list(self.subscribers):
+                callback(changes)
+        return changes
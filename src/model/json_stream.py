@@ -0,0 +1,228 @@
+"""
+An incremental, event based JSON reader.
+
+The file is read in chunks and walked as a stream of (event, value) pairs, so that a caller can step 
+through a document far larger than memory. Whenever the caller asks for a whole value (a node, say) it is
+decoded straight from the buffer by the json module, so only the structure around it is tokenised here.
+"""
+from __future__ import annotations
+
+import json
+import re
+from json.decoder import scanstring
+from typing import IO, Iterator
+
+CHUNK_SIZE = 1 << 16
+
+START_MAP = 'start_map'
+END_MAP = 'end_map'
+START_ARRAY = 'start_array'
+END_ARRAY = 'end_array'
+MAP_KEY = 'map_key'
+VALUE = 'value'
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?')
+CONSTANTS = {'true': True, 'false': False, 'null': None}
+# What can open or close a container or a string, with escapes consumed whole so an escaped quote isn't one.
+STRUCTURE = re.compile(r'\\.|["{}\[\]]', re.DOTALL)
+
+# Container states: a map waiting for a key, a map waiting for a value, an array.
+EXPECT_KEY = 'key'
+EXPECT_VALUE = 'value'
+ARRAY = 'array'
+
+
+class Json_Stream():
+    def __init__(self, file: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+        self._stack = list()
+        self._peeked = None
+
+
+    def _read_more(self) -> bool:
+        """Append the next chunk to the buffer, dropping what has been consumed. False at the end of file."""
+        if self._eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        self._eof = not chunk
+        return not self._eof
+
+
+    def _skip_separators(self) -> str | None:
+        """Step over whitespace, commas and colons. Returns the next significant character, None at the end."""
+        while True:
+            self._position = WHITESPACE.match(self._buffer, self._position).end()
+            if self._position >= len(self._buffer):
+                if not self._read_more():
+                    return None
+                continue
+            char = self._buffer[self._position]
+            if char in ',:' and not self._stack:
+                # Outside any container, as after the root value.
+                raise json.JSONDecodeError("Unexpected character", self._buffer, self._position)
+            if char == ',':
+                if self._stack[-1] == EXPECT_VALUE:
+                    self._stack[-1] = EXPECT_KEY
+            elif char == ':':
+                self._stack[-1] = EXPECT_VALUE
+            else:
+                return char
+            self._position += 1
+
+
+    def _next_token(self) -> tuple[str, object]:
+        char = self._skip_separators()
+        if char is None:
+            raise json.JSONDecodeError("Unexpected end of document", self._buffer, self._position)
+
+        if char in '{[':
+            self._stack.append(EXPECT_KEY if char == '{' else ARRAY)
+            self._position += 1
+            return (START_MAP if char == '{' else START_ARRAY), None
+        if char in '}]':
+            if not self._stack or (self._stack[-1] == ARRAY) != (char == ']'):
+                raise json.JSONDecodeError("Unexpected character", self._buffer, self._position)
+            self._stack.pop()
+            self._position += 1
+            return (END_MAP if char == '}' else END_ARRAY), None
+        if char == '"':
+            while True:
+                try:
+                    value, self._position = scanstring(self._buffer, self._position + 1)
+                    break
+                except json.JSONDecodeError:
+                    if not self._read_more():
+                        raise
+            return (MAP_KEY if self._stack and self._stack[-1] == EXPECT_KEY else VALUE), value
+
+        # "2." or "2e-" could still be the start of a longer number, and "tr" of "true".
+        while len(self._buffer) - self._position < 24 and self._read_more():
+            pass
+        match = NUMBER.match(self._buffer, self._position)
+        if match:
+            self._position = match.end()
+            number = match.group()
+            return VALUE, float(number) if match.group(1) or match.group(2) else int(number)
+        for name, constant in CONSTANTS.items():
+            if self._buffer.startswith(name, self._position):
+                self._position += len(name)
+                return VALUE, constant
+        raise json.JSONDecodeError("Unexpected character", self._buffer, self._position)
+
+
+    def peek(self) -> tuple[str, object]:
+        if self._peeked is None:
+            self._peeked = self._next_token()
+        return self._peeked
+
+
+    def next(self) -> tuple[str, object]:
+        event = self.peek()
+        self._peeked = None
+        return event
+
+
+    def _expect(self, expected: str):
+        event, _ = self.next()
+        if event != expected:
+            raise ValueError(f"Expected {expected}, found {event}")
+
+
+    def value(self):
+        """Build the next complete value."""
+        if self._peeked is None and self._skip_separators() in ('{', '['):
+            return self._decode()
+
+        event, value = self.next()
+        if event == START_MAP:
+            result = dict()
+            while (event := self.next())[0] != END_MAP:
+                result[event[1]] = self.value()
+            return result
+        if event == START_ARRAY:
+            result = list()
+            while not self._at_end():
+                result.append(self.value())
+            return result
+        if event == VALUE:
+            return value
+        raise ValueError(f"Unexpected {event}")
+
+
+    def _decode(self):
+        """
+        Decode the container at the position once the buffer holds all of it. Its end is found by scanning
+        each chunk once as it arrives, rather than decoding from the start again after every chunk.
+        """
+        depth, in_string = 0, False
+        # How far past the position has been scanned.
+        scanned = 0
+        while True:
+            buffer = self._buffer
+            resume = self._position + scanned
+            for match in STRUCTURE.finditer(buffer, resume):
+                resume = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = not in_string
+                elif in_string or len(char) > 1:
+                    continue
+                elif char in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        value, self._position = self._decoder.raw_decode(buffer, self._position)
+                        return value
+            # A backslash at the very end escapes the first character of the next chunk.
+            end = len(buffer) - 1 if buffer.endswith('\\') else len(buffer)
+            scanned = max(resume, end) - self._position
+            if not self._read_more():
+                raise json.JSONDecodeError("Unterminated value", self._buffer, self._position)
+
+
+    def skip(self):
+        """Step over the next value without building it, however large it is."""
+        depth = 0
+        while True:
+            event, _ = self.next()
+            if event in (START_MAP, START_ARRAY):
+                depth += 1
+            elif event in (END_MAP, END_ARRAY):
+                depth -= 1
+            if depth == 0:
+                return
+
+
+    def _at_end(self) -> bool:
+        """True, consuming the closing bracket, when the current container has no more items."""
+        if self._peeked is None and self._skip_separators() not in ('}', ']'):
+            return False
+        if self.peek()[0] in (END_MAP, END_ARRAY):
+            self.next()
+            return True
+        return False
+
+
+    def map_keys(self) -> Iterator[str]:
+        """Walk a map, yielding each key. The caller must consume (or skip) the value of every key."""
+        self._expect(START_MAP)
+        while (event := self.next())[0] != END_MAP:
+            yield event[1]
+
+
+    def array_items(self) -> Iterator[int]:
+        """Walk an array, yielding each index. The caller must consume (or skip) every item."""
+        self._expect(START_ARRAY)
+        index = 0
+        while not self._at_end():
+            yield index
+            index += 1
@@ -0,0 +1,333 @@
+"""
+Hierarchical layout of a Scene, following the README: the constituents of each group are laid out relative
+to the group, innermost groups first, which fixes the size of every group. The top level groups and
+standalone nodes are then placed, and each group's layout is translated into place on the way back down.
+
+Each top level group is an independent subtree, so the first pass can be spread across processes. The
+relative layout of every group is kept, so after an edit only that group, and those of its ancestors whose
+contents changed size, are laid out again.
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import TYPE_CHECKING, Callable
+
+from src.model.journal import Changes
+from src.model.scene import Scene
+
+if TYPE_CHECKING:
+    # Only for annotations. Importing concurrent.futures costs more than the rest of the model bar NumPy.
+    from concurrent.futures import Executor
+
+GROUP_PADDING = 40
+SPACING = 40
+MIN_GROUP_SIZE = (200, 120)
+
+Size = tuple[float, float]
+# Arranges members of the given sizes, some of them linked, and returns each one's offset.
+Arrange = Callable[[list[Size], list[tuple[int, int]]], list[tuple[float, float]]]
+
+
+def link_order(count: int, links: list[tuple[int, int]]) -> list[int]:
+    """Breadth first through the links, so connected members end up next to each other."""
+    neighbours = [list() for _ in range(count)]
+    for a, b in links:
+        neighbours[a].append(b)
+        neighbours[b].append(a)
+    order = list()
+    seen = [False] * count
+    for start in range(count):
+        if seen[start]:
+            continue
+        seen[start] = True
+        queue = deque([start])
+        while queue:
+            member = queue.popleft()
+            order.append(member)
+            for neighbour in neighbours[member]:
+                if not seen[neighbour]:
+                    seen[neighbour] = True
+                    queue.append(neighbour)
+    return order
+
+
+def shelf_pack(sizes: list[Size], links: list[tuple[int, int]]) -> list[tuple[float, float]]:
+    """Pack the members into rows about as wide as the result is tall, in link order."""
+    if not sizes:
+        return list()
+    area = sum((width + SPACING) * (height + SPACING) for width, height in sizes)
+    row_width = max(math.sqrt(area), max(width for width, _ in sizes))
+    offsets = [None] * len(sizes)
+    x = y = row_height = 0
+    for member in link_order(len(sizes), links):
+        width, height = sizes[member]
+        if x > 0 and x + width > row_width:
+            x, y, row_height = 0, y + row_height + SPACING, 0
+        offsets[member] = (x, y)
+        x += width + SPACING
+        row_height = max(row_height, height)
+    return offsets
+
+
+class Group_Layout():
+    """The layout of a group's direct members, relative to the group's top left corner."""
+    def __init__(self, width: float, height: float, nodes: dict, groups: dict) -> None:
+        self.width = width
+        self.height = height
+        self.nodes = nodes
+        self.groups = groups
+
+
+    @property
+    def size(self) -> Size:
+        return (self.width, self.height)
+
+
+def arrange_group(spec: dict, layouts: dict, arrange: Arrange, padding: float) -> Group_Layout:
+    """Lay out one group from a spec, given the layouts of its subgroups."""
+    members = [(('node', node_id), size) for node_id, size in spec['nodes']]
+    members += [(('group', group_id), layouts[group_id].size) for group_id in spec['groups']]
+    indexes = {key: index for index, (key, _) in enumerate(members)}
+    links = [(indexes[a], indexes[b]) for a, b in spec['links'] if a in indexes and b in indexes]
+    offsets = arrange([size for _, size in members], links)
+
+    nodes, groups = dict(), dict()
+    width, height = MIN_GROUP_SIZE if spec['id'] is not None else (0, 0)
+    for ((kind, member_id), (member_width, member_height)), (x, y) in zip(members, offsets):
+        (nodes if kind == 'node' else groups)[member_id] = (x + padding, y + padding)
+        width = max(width, x + member_width + 2 * padding)
+        height = max(height, y + member_height + 2 * padding)
+    return Group_Layout(width, height, nodes, groups)
+
+
+def layout_subtree(spec: dict, arrange: Arrange = shelf_pack, padding: float = GROUP_PADDING) -> dict:
+    """Lay out a group and everything in it, innermost first. Runs in a worker, so only plain data."""
+    layouts = dict()
+    stack = [(spec, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if expanded:
+            layouts[current['id']] = arrange_group(current, layouts, arrange, padding)
+        else:
+            stack.append((current, True))
+            stack.extend((child, False) for child in current['children'])
+    return layouts
+
+
+class Layout_Engine():
+    def __init__(
+        self,
+        scene: Scene,
+        arrange: Arrange = shelf_pack,
+        executor: Executor | None = None,
+        padding: float = GROUP_PADDING
+    ) -> None:
+        self.scene = scene
+        self.arrange = arrange
+        # Top level subtrees are laid out in the executor when one is given, otherwise in this process.
+        self.executor = executor
+        self.padding = padding
+        # Relative layouts keyed by group id. The top level of the scene is keyed by None.
+        self.layouts = dict()
+        self.dirty = set()
+        self._groups = dict()
+        self._children = dict()
+        self._edges = dict()
+        # Parent ids as they were indexed, since the groups themselves change in place.
+        self._parents = dict()
+        # The scene's revision when the indexes above were built.
+        self._revision = None
+
+
+    def _refresh(self):
+        """
+        Index the scene's groups and edges, when they have changed since the last time. Groups which gained
+        or lost a subgroup are laid out again by the next update.
+        """
+        if self._revision == self.scene.revision:
+            return
+        self._revision = self.scene.revision
+        parents, self._parents = self._parents, dict()
+        self._groups = {group.id: group for group in self.scene.groups}
+        self._children = dict()
+        for group in self.scene.groups:
+            parent_id = self._parents[group.id] = group.parent.id if group.parent is not None else None
+            self._children.setdefault(parent_id, list()).append(group)
+            if group.id not in parents:
+                self.invalidate(parent_id)
+            elif parents[group.id] != parent_id:
+                self.invalidate(parent_id)
+                self.invalidate(parents[group.id])
+        for group_id in parents.keys() - self._parents.keys():
+            self.layouts.pop(group_id, None)
+            self.invalidate(parents[group_id])
+        self._edges = {edge.id: edge for edge in self.scene.edges}
+
+
+    def _member(self, node_id: str | None, group_id: str | None) -> tuple[str, str] | None:
+        """The direct member of a group which holds a node: the node itself, or the subgroup it is nested in."""
+        node = self.scene.nodes.get(node_id)
+        if node is None:
+            return None
+        if node.group == group_id:
+            return ('node', node_id)
+        group = self._groups.get(node.group)
+        while group is not None:
+            parent_id = group.parent.id if group.parent is not None else None
+            if parent_id == group_id:
+                return ('group', group.id)
+            group = group.parent
+        return None
+
+
+    def _spec(self, group_id: str | None) -> dict:
+        """
+        The plain data needed to lay out one group. Its links are the group's own connections, or at the top
+        level every connection between different top level members, those through group ports included.
+        """
+        if group_id is not None:
+            group = self._groups[group_id]
+            node_ids, edges = group.nodes, (self._edges.get(edge_id) for edge_id in group.edges)
+        else:
+            node_ids = [node.id for node in self.scene.nodes.values() if node.group not in self._groups]
+            edges = self._edges.values()
+        links = list()
+        for edge in edges:
+            if edge is None:
+                continue
+            a = self._member(edge.start.get('node'), group_id)
+            b = self._member(edge.end.get('node'), group_id)
+            if a is not None and b is not None and a != b:
+                links.append((a, b))
+        nodes = self.scene.nodes
+        return {
+            'id': group_id,
+            'nodes': [(node_id, (nodes[node_id].width, nodes[node_id].height)) for node_id in node_ids if node_id in nodes],
+            'groups': [child.id for child in self._children.get(group_id, ())],
+            'links': links,
+        }
+
+
+    def _subtree_spec(self, group_id: str | None) -> dict:
+        root = self._spec(group_id)
+        stack = [root]
+        while stack:
+            spec = stack.pop()
+            spec['children'] = [self._spec(child_id) for child_id in spec['groups']]
+            stack.extend(spec['children'])
+        return root
+
+
+    def layout(self) -> Scene:
+        """Lay out the whole scene."""
+        self._refresh()
+        subtrees = [self._subtree_spec(group.id) for group in self._children.get(None, ())]
+        if self.executor is not None:
+            futures = [self.executor.submit(layout_subtree, spec, self.arrange, self.padding) for spec in subtrees]
+            results = [future.result() for future in futures]
+        else:
+            results = [layout_subtree(spec, self.arrange, self.padding) for spec in subtrees]
+
+        self.layouts = dict()
+        for result in results:
+            self.layouts.update(result)
+        self.layouts[None] = arrange_group(self._spec(None), self.layouts, self.arrange, 0)
+        self.dirty.clear()
+        self._place(None, 0, 0)
+        return self.scene
+
+
+    def invalidate(self, group_id: str | None):
+        """Mark a group as changed, so that it is laid out again by the next update."""
+        self.dirty.add(group_id)
+
+
+    def scene_changed(self, changes: Changes):
+        """Subscribed to the scene's journal, lays out again the groups whose members came or went."""
+        nodes = self.scene.nodes
+        for node_id in changes.added:
+            if node_id in nodes:
+                self.invalidate(nodes[node_id].group)
+        for _, group_id in changes.removed.values():
+            self.invalidate(group_id)
+
+
+    def update(self) -> list[str | None]:
+        """
+        Lay out the changed groups again. A group whose size changes invalidates its parent, and so on up.
+        Only the subtrees of the outermost groups that were laid out again are moved. Returns the groups which
+        were laid out.
+        """
+        if not self.layouts:
+            self.layout()
+            return [None]
+        self._refresh()
+        depth = lambda group_id: len(self._path(group_id)) if group_id is not None else -1
+        pending = sorted((group_id for group_id in self.dirty if group_id is None or group_id in self._groups), key=depth)
+        self.dirty.clear()
+        relaid = list()
+        while pending:
+            # Deepest first, so a group is only laid out once its subgroups are.
+            group_id = pending.pop()
+            spec = self._spec(group_id)
+            for child_id in spec['groups']:
+                if child_id not in self.layouts:
+                    self.layouts.update(layout_subtree(self._subtree_spec(child_id), self.arrange, self.padding))
+            old_size = self.layouts[group_id].size if group_id in self.layouts else None
+            self.layouts[group_id] = arrange_group(
+                spec, self.layouts, self.arrange, self.padding if group_id is not None else 0
+            )
+            relaid.append(group_id)
+            if group_id is not None and self.layouts[group_id].size != old_size:
+                parent = self._groups[group_id].parent
+                parent_id = parent.id if parent is not None else None
+                if parent_id not in pending:
+                    pending.append(parent_id)
+                    pending.sort(key=depth)
+
+        # Subtrees relaid without changing size can sit apart, so each outermost one is moved.
+        relaid_ids = set(relaid)
+        for group_id in relaid:
+            ancestors = [None] + self._path(group_id)[:-1] if group_id is not None else []
+            if any(ancestor in relaid_ids for ancestor in ancestors):
+                continue
+            self._place(group_id, *self._origin(group_id))
+        return relaid
+
+
+    def _path(self, group_id: str | None) -> list[str]:
+        path = list()
+        group = self._groups.get(group_id)
+        while group is not None:
+            path.append(group.id)
+            group = group.parent
+        return path[::-1]
+
+
+    def _origin(self, group_id: str | None) -> tuple[float, float]:
+        x = y = 0
+        for ancestor_id in self._path(group_id):
+            parent = self._groups[ancestor_id].parent
+            dx, dy = self.layouts[parent.id if parent is not None else None].groups[ancestor_id]
+            x, y = x + dx, y + dy
+        return x, y
+
+
+    def group_rect(self, group_id: str) -> tuple[float, float, float, float]:
+        """The laid out bounds of a group, padding included."""
+        return (*self._origin(group_id), *self.layouts[group_id].size)
+
+
+    def _place(self, group_id: str | None, x: float, y: float):
+        """Translate the relative layouts of a subtree into scene positions."""
+        stack = [(group_id, x, y)]
+        while stack:
+            current, origin_x, origin_y = stack.pop()
+            layout = self.layouts[current]
+            for node_id, (dx, dy) in layout.nodes.items():
+                node = self.scene.nodes[node_id]
+                if (node.x, node.y) != (origin_x + dx, origin_y + dy):
+                    self.scene.move_node(node_id, origin_x + dx, origin_y + dy)
+            for child_id, (dx, dy) in layout.groups.items():
+                stack.append((child_id, origin_x + dx, origin_y + dy))
@@ -0,0 +1,194 @@
+"""
+Loader for the super file / group file format described in the README.
+
+Files are walked with a Json_Stream, so only one node or connection is ever built in memory at a time.
+Groups which are defined in their own file (by "filepath") are registered unloaded, and only read when
+`load_group` or `load_visible` asks for them.
+"""
+from __future__ import annotations
+
+import os
+
+from src.model.edge import Edge
+from src.model.group import Group
+from src.model.json_stream import CHUNK_SIZE, Json_Stream
+from src.model.node import Node
+from src.model.scene import Scene
+
+
+def parse_levels(group_data: dict) -> tuple[int | None, int | None]:
+    """A group has either a single "level", or a "levels" [min, max] range where either end may be null."""
+    if 'levels' in group_data:
+        min_level, max_level = group_data['levels']
+        return min_level, max_level
+    level = group_data.get('level')
+    return level, level
+
+
+def missing_ports(declared_ports: list[dict], defined_ports: list[dict]) -> list[str]:
+    defined = {port.get('id') for port in defined_ports}
+    return [port.get('id') for port in declared_ports if port.get('id') not in defined]
+
+
+def load_scene(filepath: str, lazy: bool = True, chunk_size: int = CHUNK_SIZE) -> Scene:
+    loader = Scene_Loader(chunk_size=chunk_size)
+    loader.load(filepath)
+    if not lazy:
+        loader.load_all()
+    return loader.scene
+
+
+class Scene_Loader():
+    def __init__(self, scene: Scene | None = None, chunk_size: int = CHUNK_SIZE) -> None:
+        self.scene = scene if scene is not None else Scene()
+        self.chunk_size = chunk_size
+        # Problems found in group files, keyed by group id. They don't stop the rest of the scene loading.
+        self.warnings = dict()
+
+
+    def load(self, filepath: str) -> Scene:
+        """Read the super file. Groups which live in their own files are left unloaded."""
+        with open(filepath, encoding='utf-8') as file:
+            stream = Json_Stream(file, self.chunk_size)
+            self._read_body(stream, None, os.path.dirname(os.path.abspath(filepath)))
+        return self.scene
+
+
+    def load_group(self, group: Group) -> Group:
+        if group.loaded:
+            return group
+        declared_ports = list(group.ports)
+        with open(group.filepath, encoding='utf-8') as file:
+            stream = Json_Stream(file, self.chunk_size)
+            file_ports = self._read_body(stream, group, os.path.dirname(group.filepath))
+        group.loaded = True
+        self.scene.index_group(group)
+        self.validate_ports(group, declared_ports, file_ports)
+        return group
+
+
+    def validate_ports(self, group: Group, declared_ports: list[dict], file_ports: list[dict]):
+        """A group file must define at least the ports declared for the group in the super file."""
+        missing = missing_ports(declared_ports, file_ports)
+        if missing:
+            self.warnings[group.id] = f"{group.filepath} does not define the ports {', '.join(missing)}"
+
+
+    def unloaded_groups(self) -> list[Group]:
+        return [group for group in self.scene.groups if not group.loaded]
+
+
+    def load_visible(self, level: int) -> list[Group]:
+        """
+        Load every group whose subordinates are visible at magnification `level`. Loading a group may 
+        reveal further unloaded groups, so repeat until none are left.
+        """
+        loaded = list()
+        while pending := [group for group in self.unloaded_groups() if self._visible(group, level)]:
+            for group in pending:
+                loaded.append(self.load_group(group))
+        return loaded
+
+
+    def load_all(self) -> list[Group]:
+        loaded = list()
+        while pending := self.unloaded_groups():
+            for group in pending:
+                loaded.append(self.load_group(group))
+        return loaded
+
+
+    @staticmethod
+    def _visible(group: Group, level: int) -> bool:
+        return group.visible_at(level) and (group.parent is None or group.parent.visible_at(level))
+
+
+    def _read_body(self, stream: Json_Stream, group: Group | None, directory: str) -> list[dict]:
+        """
+        Read the keys of a super file, group file or inline group into `group` (None for the scene).
+        Returns the ports the body itself defines.
+        """
+        owner = group if group is not None else self.scene
+        group_count = len(group.groups) if group is not None else 0
+        ports = list()
+
+        for key in stream.map_keys():
+            match key:
+                case 'name' | 'group_name':
+                    name = stream.value()
+                    if not owner.name:
+                        owner.name = name
+                case 'level' | 'levels' if group is not None:
+                    group.min_level, group.max_level = parse_levels({key: stream.value()})
+                case 'ports':
+                    ports = stream.value()
+                    self.merge_ports(owner, ports)
+                case 'groups' | 'sub-groups':
+                    for _ in stream.array_items():
+                        self._read_group(stream, group, group_count, directory)
+                        group_count += 1
+                case 'nodes':
+                    for _ in stream.array_items():
+                        self._add_node(stream.value(), group)
+                case 'connections':
+                    for _ in stream.array_items():
+                        self._add_edge(stream.value(), group)
+                case 'filepath' if group is not None:
+                    filepath = stream.value()
+                    if not group.filepath:
+                        group.filepath = os.path.join(directory, filepath)
+                        group.loaded = False
+                case _:
+                    stream.skip()
+        return ports
+
+
+    def _read_group(self, stream: Json_Stream, parent: Group | None, index: int, directory: str):
+        # Groups have no id in the file format, so they are identified by their position in the hierarchy.
+        group_id = f"{parent.id}/{index}" if parent is not None else f"/{index}"
+        group = Group(self.scene, group_id, parent=parent)
+        self.scene.add_group(group)
+        if parent is not None:
+            parent.groups.append(group.id)
+        self._read_body(stream, group, directory)
+
+
+    @staticmethod
+    def merge_ports(owner: Scene | Group, ports: list[dict]):
+        # A group file's ports are a superset of those declared for the group in the super file.
+        known = {port.get('id') for port in owner.ports}
+        owner.ports.extend(port for port in ports if port.get('id') not in known)
+
+
+    def _add_node(self, node_data: dict, group: Group | None):
+        node = Node(
+            self.scene, 
+            node_data['node id'], 
+            node_data.get('node name', ""), 
+            group=group.id if group is not None else None
+        )
+        if 'position' in node_data:
+            node.x, node.y = node_data['position']
+        node.inputs = node_data.get('inputs', list())
+        node.outputs = node_data.get('outputs', list())
+        self.scene.add_node(node)
+        if group is not None:
+            group.nodes.append(node.id)
+
+
+    def _add_edge(self, edge_data: dict, group: Group | None):
+        if group is not None:
+            default_id = f"{group.id}/connections/{len(group.edges)}"
+        else:
+            default_id = f"/connections/{len(self.scene.edges)}"
+        edge = Edge(
+            self.scene, 
+            edge_data.get('id') or default_id, 
+            edge_data['start'], 
+            edge_data['end'], 
+            type=edge_data.get('type', "straight"), 
+            knots=edge_data.get('knots')
+        )
+        self.scene.add_edge(edge)
+        if group is not None:
+            group.edges.append(edge.id)
@@ -1,12 +1,25 @@
 from src.model.abstract_types import Scene_Type
-from src.ui.graphics_node import Graphics_Node
+
+NODE_WIDTH = 180
+NODE_HEIGHT = 240
 
 
 class Node():
-    def __init__(self, scene: Scene_Type, id: str, title: str = "") -> None:
+    width = NODE_WIDTH
+    height = NODE_HEIGHT
+
+    def __init__(self, scene: Scene_Type, id: str, title: str = "", group: str | None = None) -> None:
         self.scene = scene
         self.id = id 
         self.title = title
+        self.group = group
+        self.x = 0.0
+        self.y = 0.0
         
         self.inputs = list()
         self.outputs = list()
+
+
+    @property
+    def rect(self) -> tuple[float, float, float, float]:
+        return (self.x, self.y, self.width, self.height)
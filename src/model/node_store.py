@@ -0,0 +1,328 @@
+"""
+Columnar storage for the nodes of a Scene.
+
+Rather than one Node object per node, the store keeps a NumPy array per attribute. Node ids are interned to
+row numbers and group ids to small integer codes, and the sockets of the nodes which have any are kept
+aside. Scene.nodes still reads like a dict of nodes: looking one up returns a Node_View, a two slot proxy
+onto its row, while bulk filters work on whole columns at once.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from src.model.abstract_types import Scene_Type
+from src.model.node import NODE_HEIGHT, NODE_WIDTH
+
+NO_GROUP = -1
+# The levels of a group without bounds, so level comparisons need no special case.
+NO_MIN_LEVEL = np.iinfo(np.int32).min
+NO_MAX_LEVEL = np.iinfo(np.int32).max
+INITIAL_CAPACITY = 1024
+# Default for filters which don't restrict the group. None already means "in no group".
+ANY_GROUP = object()
+
+
+class Node_View():
+    """A node of a Node_Store, read and written through to its row."""
+    __slots__ = ('store', 'row')
+    width = NODE_WIDTH
+    height = NODE_HEIGHT
+
+    def __init__(self, store: Node_Store, row: int) -> None:
+        self.store = store
+        self.row = row
+
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Node_View) and self.store is other.store and self.row == other.row
+
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.row))
+
+
+    def __repr__(self) -> str:
+        return f"Node_View({self.id!r})"
+
+
+    @property
+    def id(self) -> str:
+        return self.store.ids[self.row]
+
+
+    @property
+    def scene(self) -> Scene_Type | None:
+        return self.store.scene
+
+
+    @property
+    def title(self) -> str:
+        return self.store.titles[self.row]
+
+    @title.setter
+    def title(self, title: str):
+        self.store.titles[self.row] = title
+
+
+    @property
+    def group(self) -> str | None:
+        code = self.store.group_codes[self.row]
+        return self.store.group_ids[code] if code != NO_GROUP else None
+
+    @group.setter
+    def group(self, group_id: str | None):
+        self.store.group_codes[self.row] = self.store.group_code(group_id)
+
+
+    @property
+    def x(self) -> float:
+        return float(self.store.x[self.row])
+
+    @x.setter
+    def x(self, x: float):
+        self.store.x[self.row] = x
+
+
+    @property
+    def y(self) -> float:
+        return float(self.store.y[self.row])
+
+    @y.setter
+    def y(self, y: float):
+        self.store.y[self.row] = y
+
+
+    @property
+    def rect(self) -> tuple[float, float, float, float]:
+        return (float(self.store.x[self.row]), float(self.store.y[self.row]), self.width, self.height)
+
+
+    # Most nodes have no sockets, so only non empty lists are stored. Assign a new list rather than
+    # appending to the one returned.
+    @property
+    def inputs(self) -> list:
+        return self.store.inputs.get(self.row, list())
+
+    @inputs.setter
+    def inputs(self, inputs: list):
+        self.store.set_sockets(self.store.inputs, self.row, inputs)
+
+
+    @property
+    def outputs(self) -> list:
+        return self.store.outputs.get(self.row, list())
+
+    @outputs.setter
+    def outputs(self, outputs: list):
+        self.store.set_sockets(self.store.outputs, self.row, outputs)
+
+
+class Node_Store():
+    """
+    A mapping of node id to Node_View. A removed node leaves a dead row behind, which filters skip and the
+    next node added takes over, so adding and removing nodes over and over doesn't grow the columns. A view
+    of a removed node may therefore come to read another node.
+    """
+    def __init__(self, scene: Scene_Type | None = None, capacity: int = INITIAL_CAPACITY) -> None:
+        self.scene = scene
+        self.ids = list()
+        self.rows = dict()
+        self.titles = list()
+        self.group_ids = list()
+        self._group_codes = dict()
+        self.inputs = dict()
+        self.outputs = dict()
+        # Dead rows, for nodes added later to reuse.
+        self._free = list()
+
+        self._x = np.zeros(capacity, dtype=np.float64)
+        self._y = np.zeros(capacity, dtype=np.float64)
+        self._groups = np.full(capacity, NO_GROUP, dtype=np.int32)
+        self._alive = np.zeros(capacity, dtype=bool)
+
+
+    # The columns, one entry per row.
+    @property
+    def x(self) -> np.ndarray:
+        return self._x[:len(self.ids)]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y[:len(self.ids)]
+
+    @property
+    def group_codes(self) -> np.ndarray:
+        return self._groups[:len(self.ids)]
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self._alive[:len(self.ids)]
+
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self.rows
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rows)
+
+
+    def __getitem__(self, node_id: str) -> Node_View:
+        return Node_View(self, self.rows[node_id])
+
+
+    def __delitem__(self, node_id: str):
+        row = self.rows.pop(node_id)
+        self._alive[row] = False
+        self._x[row] = self._y[row] = 0
+        self._groups[row] = NO_GROUP
+        self.inputs.pop(row, None)
+        self.outputs.pop(row, None)
+        self._free.append(row)
+
+
+    def get(self, node_id: str, default=None) -> Node_View | None:
+        row = self.rows.get(node_id)
+        return Node_View(self, row) if row is not None else default
+
+
+    def keys(self):
+        return self.rows.keys()
+
+
+    def values(self) -> Iterator[Node_View]:
+        return (Node_View(self, row) for row in self.rows.values())
+
+
+    def items(self) -> Iterator[tuple[str, Node_View]]:
+        return ((node_id, Node_View(self, row)) for node_id, row in self.rows.items())
+
+
+    def group_code(self, group_id: str | None) -> int:
+        if group_id is None:
+            return NO_GROUP
+        code = self._group_codes.get(group_id)
+        if code is None:
+            code = self._group_codes[group_id] = len(self.group_ids)
+            self.group_ids.append(group_id)
+        return code
+
+
+    @staticmethod
+    def set_sockets(sockets: dict, row: int, values: list):
+        if values:
+            sockets[row] = values
+        else:
+            sockets.pop(row, None)
+
+
+    def _reserve(self, count: int):
+        needed = len(self.ids) + max(0, count - len(self._free))
+        if needed <= len(self._x):
+            return
+        capacity = max(needed, 2 * len(self._x))
+        for name, fill in (('_x', 0.0), ('_y', 0.0), ('_groups', NO_GROUP), ('_alive', False)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+
+    def add(self, node) -> Node_View:
+        """Copy in any object with a node's attributes. A node with the id of an existing one replaces it."""
+        if node.id in self.rows:
+            del self[node.id]
+        if self._free:
+            row = self._free.pop()
+            self.ids[row], self.titles[row] = node.id, node.title
+        else:
+            self._reserve(1)
+            row = len(self.ids)
+            self.ids.append(node.id)
+            self.titles.append(node.title)
+        self.rows[node.id] = row
+        self._x[row], self._y[row] = node.x, node.y
+        self._groups[row] = self.group_code(node.group)
+        self._alive[row] = True
+        self.set_sockets(self.inputs, row, node.inputs)
+        self.set_sockets(self.outputs, row, node.outputs)
+        return Node_View(self, row)
+
+
+    def extend(
+        self,
+        ids: list[str],
+        titles: list[str] | None = None,
+        groups: Iterable[str | None] | None = None,
+        positions: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Add many nodes at once, filling the columns in bulk. Returns their rows."""
+        if not self.rows.keys().isdisjoint(ids):
+            for node_id in ids:
+                if node_id in self.rows:
+                    del self[node_id]
+        count = len(ids)
+        titles = titles if titles is not None else [""] * count
+        self._reserve(count)
+        # Dead rows first, then new ones on the end.
+        reused = min(count, len(self._free))
+        free_rows = self._free[len(self._free) - reused:]
+        del self._free[len(self._free) - reused:]
+        for row, node_id, title in zip(free_rows, ids, titles):
+            self.ids[row], self.titles[row] = node_id, title
+        start = len(self.ids)
+        self.ids.extend(ids[reused:])
+        self.titles.extend(titles[reused:])
+        rows = np.concatenate([np.asarray(free_rows, dtype=np.intp), np.arange(start, start + count - reused)])
+        self.rows.update(zip(ids, rows.tolist()))
+        if positions is not None:
+            positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+            self._x[rows], self._y[rows] = positions[:, 0], positions[:, 1]
+        if groups is not None:
+            self._groups[rows] = np.fromiter((self.group_code(group_id) for group_id in groups), np.int32, count)
+        self._alive[rows] = True
+        return rows
+
+
+    def levels(self) -> tuple[np.ndarray, np.ndarray]:
+        """The min and max level of each row, from its group in the scene."""
+        # One entry per group code, with an unbounded one last, so NO_GROUP indexes it.
+        min_levels = np.full(len(self.group_ids) + 1, NO_MIN_LEVEL, dtype=np.int32)
+        max_levels = np.full(len(self.group_ids) + 1, NO_MAX_LEVEL, dtype=np.int32)
+        get_group = self.scene.get_group if self.scene is not None else (lambda group_id: None)
+        for code, group_id in enumerate(self.group_ids):
+            group = get_group(group_id)
+            if group is not None:
+                if group.min_level is not None:
+                    min_levels[code] = group.min_level
+                if group.max_level is not None:
+                    max_levels[code] = group.max_level
+        codes = self.group_codes
+        return min_levels[codes], max_levels[codes]
+
+
+    def select(self, group: str | None = ANY_GROUP, level: int | None = None, min_level: int | None = None) -> list[str]:
+        """
+        The ids of the nodes directly in `group`, visible at magnification `level`, and whose group only
+        shows them from `min_level` up.
+        """
+        mask = self.alive.copy()
+        if group is not ANY_GROUP:
+            code = self._group_codes.get(group) if group is not None else NO_GROUP
+            if code is None:
+                return list()
+            mask &= self.group_codes == code
+        if level is not None or min_level is not None:
+            min_levels, max_levels = self.levels()
+            if level is not None:
+                mask &= (min_levels <= level) & (max_levels >= level)
+            if min_level is not None:
+                mask &= (min_levels >= min_level) & (min_levels != NO_MIN_LEVEL)
+        ids = self.ids
+        return [ids[row] for row in np.flatnonzero(mask).tolist()]
@@ -0,0 +1,213 @@
+"""
+Loads the group files referenced by a super file in a pool of workers.
+
+Each group file is parsed into a detached fragment Scene by a worker. The fragments are merged back into 
+the Scene on the calling thread, strictly in the order the groups were submitted, so the result is the 
+same as a sequential `Scene_Loader.load_all` however the workers are scheduled. Given a magnification, only
+the groups visible at it are submitted, as `Scene_Loader.load_visible` would load them, and `load_visible`
+submits more as the magnification changes.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Callable
+
+from src.model.group import Group
+from src.model.json_stream import CHUNK_SIZE
+from src.model.loader import Scene_Loader
+from src.model.scene import Scene
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+
+def detached_group(group: Group) -> Group:
+    """
+    A copy of `group` without its scene or parent, cheap to send to a worker. It carries over what the super
+    file already defined for the group, so that ids continue from it as they would in a sequential load.
+    """
+    placeholder = Group(None, group.id, group.name, None, group.min_level, group.max_level, group.filepath)
+    placeholder.groups = list(group.groups)
+    placeholder.nodes = list(group.nodes)
+    placeholder.edges = list(group.edges)
+    return placeholder
+
+
+def parse_group_file(placeholder: Group, chunk_size: int = CHUNK_SIZE) -> Scene:
+    """Parse one group file into a fragment Scene whose first group is `placeholder`."""
+    fragment = Scene()
+    placeholder.scene = fragment
+    fragment.add_group(placeholder)
+    Scene_Loader(fragment, chunk_size).load_group(placeholder)
+    return fragment
+
+
+class Parallel_Scene_Loader():
+    def __init__(
+        self, 
+        scene: Scene | None = None, 
+        executor: Executor | None = None, 
+        chunk_size: int = CHUNK_SIZE, 
+        progress: Callable[[int, int, Group], None] | None = None
+    ) -> None:
+        self.loader = Scene_Loader(scene, chunk_size)
+        self.scene = self.loader.scene
+        self.chunk_size = chunk_size
+        self._executor = executor
+        self._owns_executor = executor is None
+        # Called with (groups loaded, groups submitted, group) after every merge.
+        self.progress = progress
+        self.errors = dict()
+        self._pending: deque[tuple[Group, Future]] = deque()
+        self.submitted = 0
+        self.completed = 0
+        # Ids of every group submitted, which is then either loaded or failed.
+        self._requested = set()
+        # The magnification whose groups are loaded, or None for every group.
+        self.level = None
+
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            # Imported here, so only loads which start a pool pay for multiprocessing.
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor()
+        return self._executor
+
+
+    @property
+    def warnings(self) -> dict:
+        return self.loader.warnings
+
+
+    @property
+    def finished(self) -> bool:
+        return not self._pending
+
+
+    def load(self, filepath: str, level: int | None = None) -> Scene:
+        """
+        Read the super file and start loading the group files it references, or only those visible at
+        magnification `level`. Returns immediately.
+        """
+        self.level = level
+        self.loader.load(filepath)
+        self.submit(self._wanted(self.loader.unloaded_groups()))
+        return self.scene
+
+
+    def load_visible(self, level: int) -> list[Group]:
+        """Start loading the groups which become visible at magnification `level`. Returns those submitted."""
+        self.level = level
+        groups = self._wanted(self.loader.unloaded_groups())
+        self.submit(groups)
+        return groups
+
+
+    def _wanted(self, groups: list[Group]) -> list[Group]:
+        """The unloaded groups to load at the current magnification which haven't been submitted already."""
+        return [
+            group for group in groups 
+            if not group.loaded and group.id not in self._requested
+            and (self.level is None or Scene_Loader._visible(group, self.level))
+        ]
+
+
+    def submit(self, groups: list[Group]):
+        for group in groups:
+            self._requested.add(group.id)
+            self._pending.append((group, self.executor.submit(parse_group_file, detached_group(group), self.chunk_size)))
+            self.submitted += 1
+
+
+    def merge_ready(self) -> list[Group]:
+        """Merge the fragments which have arrived, without blocking. Suitable for polling from a UI timer."""
+        merged = list()
+        while self._pending and self._pending[0][1].done():
+            merged.append(self._merge_next())
+        return merged
+
+
+    def wait(self) -> Scene:
+        """Block until every group submitted, including those referenced from other group files, has been merged."""
+        while self._pending:
+            self._merge_next()
+        self.close()
+        return self.scene
+
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+    def _merge_next(self) -> Group:
+        group, future = self._pending.popleft()
+        try:
+            fragment = future.result()
+        except Exception as error:
+            # Whatever parsing raised, a KeyError for a missing field included. The group stays unloaded and
+            # the rest of the scene carries on.
+            self._finish(group, error)
+            from concurrent.futures import BrokenExecutor
+
+            if isinstance(error, BrokenExecutor):
+                self._abandon(error)
+            return group
+        try:
+            self._merge(group, fragment)
+        except (OSError, ValueError) as error:
+            self._finish(group, error)
+            return group
+        self._finish(group)
+        return group
+
+
+    def _abandon(self, error: Exception):
+        """Fail every pending group, after a worker died and took the pool with it."""
+        while self._pending:
+            self._finish(self._pending.popleft()[0], error)
+        if self._owns_executor:
+            # The next submit starts a new pool.
+            self.close()
+
+
+    def _finish(self, group: Group, error: Exception | None = None):
+        if error is not None:
+            self.errors[group.id] = error
+        self.completed += 1
+        if self.progress is not None:
+            self.progress(self.completed, self.submitted, group)
+
+
+    def _merge(self, group: Group, fragment: Scene):
+        placeholder, *sub_groups = fragment.groups
+        declared_ports = list(group.ports)
+
+        for sub_group in sub_groups:
+            sub_group.scene = self.scene
+            if sub_group.parent is placeholder:
+                sub_group.parent = group
+            self.scene.add_group(sub_group)
+        for node in fragment.nodes.values():
+            self.scene.add_node(node)
+        for edge in fragment.edges:
+            edge.scene = self.scene
+            self.scene.add_edge(edge)
+
+        if not group.name:
+            group.name = placeholder.name
+        group.min_level, group.max_level = placeholder.min_level, placeholder.max_level
+        Scene_Loader.merge_ports(group, placeholder.ports)
+        group.groups = placeholder.groups
+        group.nodes = placeholder.nodes
+        group.edges = placeholder.edges
+        group.loaded = True
+        self.scene.index_group(group)
+        self.loader.validate_ports(group, declared_ports, placeholder.ports)
+
+        # Group files may reference further group files.
+        self.submit(self._wanted(sub_groups))
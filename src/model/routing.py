@@ -0,0 +1,459 @@
+"""
+Automatic routing of connections between nodes.
+
+Connections are routed orthogonally, from the right of their start node to the left of their end node,
+around the bounds of any group neither end is inside. A connection between two groups goes through their
+conduit: it leaves its group by the port facing the other group, follows the conduit's route, and enters the
+other group by its port. The conduit is routed once and shared, so its connections bundle together and the
+cost of a long route is paid once per conduit rather than once per connection.
+
+Most pieces can be drawn with a single Z shaped route, which is checked against the obstacles first. The
+rest are routed with A* over a visibility graph of the corners of the obstacles near the piece, and of the
+conduits already routed nearby. Running along a conduit costs less than elsewhere, so routes prefer to
+follow them. Routes are cached, and only those whose end nodes moved, or which pass through a group whose
+bounds changed, are routed again. Once everything has been routed, the scene tells the router about
+connections added or removed, as it does its Conduit_Table.
+"""
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Iterable
+
+import numpy as np
+
+from src.model.edge import Edge
+from src.model.journal import Changes
+from src.model.scene import Scene
+from src.model.spatial_index import Rect, Spatial_Index, contains, intersects
+
+CLEARANCE = 20
+SEARCH_MARGIN = 400
+# The extra cost of each bend, in scene units.
+BEND_COST = 40
+# The cost of running along a conduit already routed, relative to elsewhere.
+CONDUIT_COST = 0.5
+
+Point = tuple[float, float]
+
+
+def bounds(points: list[Point]) -> Rect:
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+
+def segment_hits(a: Point, b: Point, rect: Rect) -> bool:
+    """Whether an axis aligned segment passes through the inside of a rectangle."""
+    left, top = min(a[0], b[0]), min(a[1], b[1])
+    right, bottom = max(a[0], b[0]), max(a[1], b[1])
+    return left < rect[0] + rect[2] and rect[0] < right and top < rect[1] + rect[3] and rect[1] < bottom
+
+
+def difference(rect: Rect, other: Rect | None) -> list[Rect]:
+    """The parts of `rect` outside `other`, as up to four rectangles."""
+    if other is None or not intersects(rect, other):
+        return [rect]
+    x, y, width, height = rect
+    right, bottom = x + width, y + height
+    other_right, other_bottom = other[0] + other[2], other[1] + other[3]
+    parts = list()
+    if y < other[1]:
+        parts.append((x, y, width, other[1] - y))
+    if other_bottom < bottom:
+        parts.append((x, other_bottom, width, bottom - other_bottom))
+    top, low = max(y, other[1]), min(bottom, other_bottom)
+    if x < other[0]:
+        parts.append((x, top, other[0] - x, low - top))
+    if other_right < right:
+        parts.append((other_right, top, right - other_right, low - top))
+    return parts
+
+
+def simplify(points: list[Point]) -> list[Point]:
+    """Drop the points in the middle of straight runs."""
+    simplified = points[:2]
+    for point in points[2:]:
+        (ax, ay), (bx, by) = simplified[-2], simplified[-1]
+        if (ax == bx == point[0]) or (ay == by == point[1]):
+            simplified[-1] = point
+        else:
+            simplified.append(point)
+    return simplified
+
+
+class Route():
+    def __init__(self, points: list[Point], conduit: tuple[str, str] | None = None) -> None:
+        self.points = points
+        self.conduit = conduit
+        self.rect = bounds(points)
+
+
+class Router():
+    def __init__(self, scene: Scene, clearance: float = CLEARANCE) -> None:
+        self.scene = scene
+        # How far routes keep from the groups they go around.
+        self.clearance = clearance
+        self.routes = dict()
+        # Connections to route again on the next update, in the order they were invalidated.
+        self.dirty = dict()
+        # The connections through each conduit. Their number sets its thickness.
+        self.conduits = dict()
+        self._route_index = Spatial_Index()
+        self._edges = dict()
+        # The connections of each node, as dicts for an ordered set.
+        self._node_edges = dict()
+        self._group_rects = dict()
+        self._conduit_routes = dict()
+
+
+    def route_all(self):
+        """Route every connection, and follow the connections added to or removed from the scene afterwards."""
+        if self.scene.node_index is None:
+            self.scene.build_spatial_index()
+        self.scene.router = self
+        self._edges = dict()
+        self._node_edges = dict()
+        self.add_edges(self.scene.edges)
+        self._group_rects = {group.id: group.rect for group in self.scene.groups}
+        self.routes.clear()
+        self.conduits.clear()
+        self._conduit_routes.clear()
+        for edge in self.scene.edges:
+            route = self.route(edge)
+            if route is not None:
+                self.routes[edge.id] = route
+                if route.conduit is not None:
+                    self.conduits.setdefault(route.conduit, set()).add(edge.id)
+        self._route_index = Spatial_Index()
+        self._route_index.bulk_load((edge_id, route.rect, None, None) for edge_id, route in self.routes.items())
+        self.dirty.clear()
+
+
+    def add_edge(self, edge: Edge):
+        self.add_edges([edge])
+
+
+    def add_edges(self, edges: Iterable[Edge]):
+        """Connections added to the scene, routed by the next update."""
+        for edge in edges:
+            self._edges[edge.id] = edge
+            for node_id in (edge.start.get('node'), edge.end.get('node')):
+                self._node_edges.setdefault(node_id, dict())[edge.id] = None
+            self.dirty[edge.id] = None
+
+
+    def remove_edges(self, edges: Iterable[Edge]):
+        """Connections removed from the scene, which lose their routes."""
+        for edge in edges:
+            if self._edges.get(edge.id) is not edge:
+                continue
+            del self._edges[edge.id]
+            self.dirty.pop(edge.id, None)
+            for node_id in (edge.start.get('node'), edge.end.get('node')):
+                attached = self._node_edges.get(node_id)
+                if attached is not None:
+                    attached.pop(edge.id, None)
+                    if not attached:
+                        del self._node_edges[node_id]
+            route = self.routes.pop(edge.id, None)
+            if route is not None:
+                self._route_index.remove(edge.id)
+                if route.conduit is not None:
+                    self.conduits[route.conduit].discard(edge.id)
+
+
+    def node_moved(self, node_id: str):
+        """Invalidate the connections of a node, and those passing through any group it has resized."""
+        for edge_id in self._node_edges.get(node_id, ()):
+            self.dirty[edge_id] = None
+        node = self.scene.nodes.get(node_id)
+        self._groups_resized(node.group if node is not None else None)
+
+
+    def scene_changed(self, changes: Changes):
+        """Subscribed to the scene's journal. Connections to removed nodes lose their routes."""
+        for node_id in changes.added | changes.moved.keys():
+            self.node_moved(node_id)
+        for node_id, (_, group_id) in changes.removed.items():
+            for edge_id in self._node_edges.get(node_id, ()):
+                self.dirty[edge_id] = None
+            self._groups_resized(group_id)
+
+
+    def _groups_resized(self, group_id: str | None):
+        group = self.scene.get_group(group_id)
+        while group is not None:
+            old_rect = self._group_rects.get(group.id)
+            if old_rect == group.rect:
+                break
+            self.group_changed(group.id, old_rect)
+            group = group.parent
+
+
+    def group_changed(self, group_id: str, old_rect: Rect | None = None):
+        """
+        Invalidate the connections through the group's conduits, and those crossing the area it has grown
+        into. Connections which went round it before are still clear of it if it shrank.
+        """
+        group = self.scene.get_group(group_id)
+        self._group_rects[group_id] = group.rect
+        grown = difference(group.rect, old_rect) if group.rect is not None else list()
+        for conduit, points in list(self._conduit_routes.items()):
+            if group_id in conduit or any(segment_hits(a, b, rect) for a, b in zip(points, points[1:]) for rect in grown):
+                del self._conduit_routes[conduit]
+                self.dirty.update(dict.fromkeys(self.conduits.get(conduit, ())))
+        for rect in grown:
+            for edge_id in self._route_index.query(rect):
+                # A group is never in the way of the connections inside it.
+                edge = self._edges[edge_id]
+                if not (self._inside(edge.start.get('node'), group_id) and self._inside(edge.end.get('node'), group_id)):
+                    self.dirty[edge_id] = None
+
+
+    def update(self, budget_ms: float | None = None) -> list[str]:
+        """
+        Route the invalidated connections again. With a budget, stop once it is spent and leave the rest
+        for the next update. Returns the connections which were routed.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000 if budget_ms is not None else None
+        routed = list()
+        slowest = 0.0
+        while self.dirty:
+            started = time.perf_counter()
+            # Don't start a connection that would likely overrun the budget, once one has been routed.
+            if deadline is not None and routed and started + slowest > deadline:
+                break
+            edge_id = next(iter(self.dirty))
+            del self.dirty[edge_id]
+            edge = self._edges.get(edge_id)
+            if edge is not None:
+                self._reroute(edge)
+                routed.append(edge_id)
+            slowest = max(slowest, time.perf_counter() - started)
+        return routed
+
+
+    def _reroute(self, edge: Edge):
+        old = self.routes.pop(edge.id, None)
+        if old is not None:
+            self._route_index.remove(edge.id)
+            if old.conduit is not None:
+                self.conduits[old.conduit].discard(edge.id)
+        route = self.route(edge)
+        if route is None:
+            return
+        self.routes[edge.id] = route
+        self._route_index.insert(edge.id, route.rect)
+        if route.conduit is not None:
+            self.conduits.setdefault(route.conduit, set()).add(edge.id)
+
+
+    def _inside(self, node_id: str, group_id: str) -> bool:
+        node = self.scene.nodes.get(node_id)
+        group = self.scene.get_group(node.group) if node is not None else None
+        while group is not None:
+            if group.id == group_id:
+                return True
+            group = group.parent
+        return False
+
+
+    def _ancestors(self, node_id: str) -> list[str]:
+        path = list()
+        group = self.scene.get_group(self.scene.nodes[node_id].group)
+        while group is not None:
+            path.append(group.id)
+            group = group.parent
+        return path[::-1]
+
+
+    def route(self, edge: Edge) -> Route | None:
+        start_id, end_id = edge.start.get('node'), edge.end.get('node')
+        if start_id not in self.scene.nodes or end_id not in self.scene.nodes:
+            return None
+        start_node, end_node = self.scene.nodes[start_id], self.scene.nodes[end_id]
+        start = (start_node.x + start_node.width, start_node.y + start_node.height / 2)
+        end = (end_node.x, end_node.y + end_node.height / 2)
+
+        start_path, end_path = self._ancestors(start_id), self._ancestors(end_id)
+        depth = 0
+        while depth < min(len(start_path), len(end_path)) and start_path[depth] == end_path[depth]:
+            depth += 1
+        excluded = set(start_path) | set(end_path)
+        if depth == len(start_path) or depth == len(end_path):
+            return Route(self._local(start, end, excluded))
+
+        conduit = (start_path[depth], end_path[depth])
+        path = self.conduit_route(conduit)
+        if path is None:
+            return Route(self._local(start, end, excluded))
+        points = self._local(start, path[0], excluded) + path[1:-1] + self._local(path[-1], end, excluded)
+        return Route(simplify(points), conduit)
+
+
+    def conduit_route(self, conduit: tuple[str, str]) -> list[Point] | None:
+        """
+        The shared route between the ports of two groups, around the other groups in their parent. None while
+        either group has no bounds, not having been laid out or loaded yet.
+        """
+        if conduit not in self._conduit_routes:
+            start_group, end_group = (self.scene.get_group(group_id) for group_id in conduit)
+            if start_group.rect is None or end_group.rect is None:
+                return None
+            start, end = self._ports(start_group.rect, end_group.rect)
+            window = self._window(start, end)
+            obstacles = [
+                group.rect for group in (self.scene.get_group(group_id) for group_id in self.scene.groups_in(window))
+                if group.parent is start_group.parent and group not in (start_group, end_group)
+            ]
+            self._conduit_routes[conduit] = self._search(start, end, obstacles, self._guides(window))
+        return self._conduit_routes[conduit]
+
+
+    def _guides(self, window: Rect) -> list[list[Point]]:
+        """The routes of the conduits which pass through the window."""
+        routes = self._conduit_routes.values()
+        return [points for points in routes if points and intersects(bounds(points), window)]
+
+
+    @staticmethod
+    def _ports(start: Rect, end: Rect) -> tuple[Point, Point]:
+        """The middles of the sides of two groups which face each other."""
+        centres = [(x + width / 2, y + height / 2) for x, y, width, height in (start, end)]
+        dx, dy = centres[1][0] - centres[0][0], centres[1][1] - centres[0][1]
+        if abs(dx) >= abs(dy):
+            side = 1 if dx >= 0 else -1
+            return tuple((centre[0] + sign * side * rect[2] / 2, centre[1]) for centre, rect, sign in zip(centres, (start, end), (1, -1)))
+        side = 1 if dy >= 0 else -1
+        return tuple((centre[0], centre[1] + sign * side * rect[3] / 2) for centre, rect, sign in zip(centres, (start, end), (1, -1)))
+
+
+    def _window(self, start: Point, end: Point) -> Rect:
+        window = bounds([start, end])
+        margin = SEARCH_MARGIN
+        return (window[0] - margin, window[1] - margin, window[2] + 2 * margin, window[3] + 2 * margin)
+
+
+    def _local(self, start: Point, end: Point, excluded: set[str]) -> list[Point]:
+        """A route between two points, around every group in the way other than `excluded`."""
+        window = self._window(start, end)
+        # Groups nested in an obstacle are already inside it, so only the children of the ends' ancestors count.
+        obstacles = list()
+        for group_id in self.scene.groups_in(window):
+            group = self.scene.get_group(group_id)
+            if group_id not in excluded and (group.parent is None or group.parent.id in excluded):
+                obstacles.append(group.rect)
+        middle = (start[0] + end[0]) / 2
+        points = simplify([start, (middle, start[1]), (middle, end[1]), end])
+        if not any(segment_hits(a, b, rect) for a, b in zip(points, points[1:]) for rect in obstacles):
+            return points
+        return self._search(start, end, obstacles, self._guides(window))
+
+
+    def _search(
+        self, start: Point, end: Point, obstacles: list[Rect], guides: list[list[Point]] = ()
+    ) -> list[Point]:
+        """
+        A* over an orthogonal visibility graph: the waypoints are the corners of the obstacles, pushed out by
+        the clearance, and the points of the `guides`, and two waypoints are linked by an L shaped route if
+        neither leg hits an obstacle. Legs are cheaper where they run along a guide. Each step tests the links
+        to every waypoint against every obstacle at once.
+        """
+        clearance = self.clearance
+        rects = np.asarray(obstacles, dtype=np.float64).reshape(-1, 4)
+        lefts, tops = rects[:, 0], rects[:, 1]
+        rights, bottoms = lefts + rects[:, 2], tops + rects[:, 3]
+        corners = np.concatenate([
+            np.stack([lefts - clearance, tops - clearance], axis=1), 
+            np.stack([rights + clearance, tops - clearance], axis=1), 
+            np.stack([lefts - clearance, bottoms + clearance], axis=1), 
+            np.stack([rights + clearance, bottoms + clearance], axis=1), 
+            np.asarray([point for guide in guides for point in guide], dtype=np.float64).reshape(-1, 2),
+        ])
+        inside = (
+            (lefts <= corners[:, :1]) & (corners[:, :1] <= rights) & 
+            (tops <= corners[:, 1:]) & (corners[:, 1:] <= bottoms)
+        ).any(axis=1)
+        # The end is the first waypoint and the start the last.
+        points = np.concatenate([[end], corners[~inside], [start]])
+        xs, ys = points[:, 0], points[:, 1]
+
+        def clear(ax, ay, bx, by):
+            left, right = np.minimum(ax, bx)[:, None], np.maximum(ax, bx)[:, None]
+            top, bottom = np.minimum(ay, by)[:, None], np.maximum(ay, by)[:, None]
+            return ~((left < rights) & (lefts < right) & (top < bottoms) & (tops < bottom)).any(axis=1)
+
+        def clear_across(y, x0, x1):
+            """Legs along a single row only need testing against the obstacles spanning that row."""
+            rows = (tops < y) & (y < bottoms)
+            left, right = np.minimum(x0, x1)[:, None], np.maximum(x0, x1)[:, None]
+            return ~((left < rights[rows]) & (lefts[rows] < right)).any(axis=1)
+
+        def clear_down(x, y0, y1):
+            columns = (lefts < x) & (x < rights)
+            top, bottom = np.minimum(y0, y1)[:, None], np.maximum(y0, y1)[:, None]
+            return ~((top < bottoms[columns]) & (tops[columns] < bottom)).any(axis=1)
+
+        # The guides' horizontal runs as (y, left, right), and their vertical ones as (x, top, bottom).
+        rows, columns = list(), list()
+        for guide in guides:
+            for a, b in zip(guide, guide[1:]):
+                if a[1] == b[1]:
+                    rows.append((a[1], min(a[0], b[0]), max(a[0], b[0])))
+                else:
+                    columns.append((a[0], min(a[1], b[1]), max(a[1], b[1])))
+        rows, columns = (np.asarray(runs, dtype=np.float64).reshape(-1, 3) for runs in (rows, columns))
+
+        def along(lines, fixed, a, b):
+            """How much of each leg, at `fixed` from `a` to `b`, runs along the lines."""
+            if not len(lines):
+                return np.zeros(len(a))
+            low, high = np.minimum(a, b)[:, None], np.maximum(a, b)[:, None]
+            shared = np.clip(np.minimum(high, lines[:, 2]) - np.maximum(low, lines[:, 1]), 0, None)
+            return (shared * (fixed[:, None] == lines[:, 0])).sum(axis=1)
+
+        count = len(points)
+        best = np.full(count, np.inf)
+        done = np.zeros(count, dtype=bool)
+        came_from = dict()
+        # Scaled so that it never overestimates a route running along the guides.
+        heuristic = (np.abs(xs - end[0]) + np.abs(ys - end[1])) * (CONDUIT_COST if guides else 1)
+        best[-1] = 0
+        open_heap = [(heuristic[-1], count - 1)]
+        while open_heap:
+            _, index = heapq.heappop(open_heap)
+            if done[index]:
+                continue
+            if index == 0:
+                route = [tuple(points[0])]
+                while index in came_from:
+                    index, bend = came_from[index]
+                    route += [bend, tuple(points[index])]
+                return simplify([(float(x), float(y)) for x, y in reversed(route)])
+            done[index] = True
+            x, y = xs[index], ys[index]
+            here_x, here_y = np.full(count, x), np.full(count, y)
+            # Across then down, or down then across.
+            across = clear_across(y, here_x, xs) & clear(xs, here_y, xs, ys)
+            down = clear_down(x, here_y, ys) & clear(here_x, ys, xs, ys)
+            length = np.abs(xs - x) + np.abs(ys - y)
+            saved = 1 - CONDUIT_COST
+            # Guides which overlap each other mustn't make a leg cost less than running along one.
+            shared = along(rows, here_y, here_x, xs) + along(columns, xs, here_y, ys)
+            across_cost = length - saved * np.minimum(shared, length)
+            shared = along(columns, here_x, here_y, ys) + along(rows, ys, here_x, xs)
+            down_cost = length - saved * np.minimum(shared, length)
+            across_cost = np.where(across, across_cost, np.inf)
+            down_cost = np.where(down, down_cost, np.inf)
+            cost = best[index] + np.minimum(across_cost, down_cost) + BEND_COST
+            better = ~done & (cost < best)
+            for neighbour in np.flatnonzero(better).tolist():
+                best[neighbour] = cost[neighbour]
+                bend = (xs[neighbour], y) if across_cost[neighbour] <= down_cost[neighbour] else (x, ys[neighbour])
+                came_from[neighbour] = (index, bend)
+                heapq.heappush(open_heap, (cost[neighbour] + heuristic[neighbour], neighbour))
+
+        # No way round, so fall back to a direct route rather than leave it unrouted.
+        middle = (start[0] + end[0]) / 2
+        return simplify([start, (middle, start[1]), (middle, end[1]), end])
@@ -1,24 +1,369 @@
 from __future__ import annotations
 
+from src.model.conduits import Conduit_Table
+from src.model.edge import Edge
+from src.model.group import Group
+from src.model.group_tree import Group_Tree
+from src.model.journal import Journal
 from src.model.node import Node
+from src.model.node_store import Node_Store
+from src.model.spatial_index import Rect, Spatial_Index
 
 def add_node_to_scene(scene: Scene, node_name: str, node_id: str = None):
     new_node = Node(scene, node_name, node_id)
     scene.add_node(new_node=new_node)
 
 
+def union(rects: list[Rect]) -> Rect | None:
+    if not rects:
+        return None
+    left = min(rect[0] for rect in rects)
+    top = min(rect[1] for rect in rects)
+    right = max(rect[0] + rect[2] for rect in rects)
+    bottom = max(rect[1] + rect[3] for rect in rects)
+    return (left, top, right - left, bottom - top)
+
+
+def on_edge(outer: Rect, inner: Rect) -> bool:
+    return (
+        inner[0] <= outer[0] or inner[1] <= outer[1] or 
+        inner[0] + inner[2] >= outer[0] + outer[2] or inner[1] + inner[3] >= outer[1] + outer[3]
+    )
+
+
 class Scene():
     def __init__(self) -> None:
         
-        self.nodes = dict()
+        self.name = ""
+        self.ports = list()
+        # Node id to Node_View, backed by one array per attribute.
+        self.nodes = Node_Store(self)
         self.edges = list()
         self.groups = list()
 
+        # Built on demand by build_spatial_index, then kept up to date.
+        self.node_index = None
+        self.group_index = None
+        self._groups_by_id = dict()
+        self.group_tree = None
+        # Connection counts between groups, built on demand by build_conduit_table.
+        self.conduits = None
+        # The Router which has routed the connections, if any, told of connections added and removed.
+        self.router = None
+        # Edits to the nodes, for the view, layout and routing to follow.
+        self.journal = Journal()
+        # Counts the edits to the groups and connections, which the journal doesn't record.
+        self.revision = 0
+
 
     def add_node(self, new_node: Node):
-        self.nodes[new_node.id] = new_node
+        self.nodes.add(new_node)
+        self._index_node(new_node)
+        self.journal.added(new_node.id)
+        if self.conduits is not None:
+            self.conduits.nodes_added([new_node.id])
+
+
+    def add_nodes(
+        self,
+        ids: list[str],
+        titles: list[str] | None = None,
+        groups: list[str | None] | None = None,
+        positions=None
+    ):
+        """Add many nodes at once, straight into the node store's columns."""
+        self.nodes.extend(ids, titles, groups, positions)
+        if self.node_index is not None:
+            for node_id in ids:
+                self._index_node(self.nodes[node_id])
+        if self.journal.subscribers:
+            for node_id in ids:
+                self.journal.added(node_id)
+        if self.conduits is not None:
+            self.conduits.nodes_added(ids)
+
+
+    def add_edge(self, new_edge: Edge):
+        self.edges.append(new_edge)
+        self.revision += 1
+        if self.conduits is not None:
+            self.conduits.add_edge(new_edge)
+        if self.router is not None:
+            self.router.add_edge(new_edge)
+
+
+    def remove_node_edges(self, node_ids) -> list[tuple[Edge, str | None]]:
+        """
+        Remove the edges with an end on any of the nodes, in one pass over the edges. Returns each with the
+        id of the group listing it, for restore_edges.
+        """
+        node_ids = set(node_ids)
+        removed, kept = list(), list()
+        for edge in self.edges:
+            attached = edge.start.get('node') in node_ids or edge.end.get('node') in node_ids
+            (removed if attached else kept).append(edge)
+        if not removed:
+            return list()
+        self.edges = kept
+        self.revision += 1
+        if self.conduits is not None:
+            self.conduits.remove_edges(removed)
+        if self.router is not None:
+            self.router.remove_edges(removed)
+        owners = dict()
+        removed_ids = {edge.id for edge in removed}
+        for group in self.groups:
+            if not removed_ids.isdisjoint(group.edges):
+                owners.update((edge_id, group.id) for edge_id in group.edges if edge_id in removed_ids)
+                group.edges = [edge_id for edge_id in group.edges if edge_id not in removed_ids]
+        return [(edge, owners.get(edge.id)) for edge in removed]
+
+
+    def restore_edges(self, edges: list[tuple[Edge, str | None]]):
+        self.revision += 1
+        for edge, group_id in edges:
+            self.edges.append(edge)
+            group = self._groups_by_id.get(group_id)
+            if group is not None:
+                group.edges.append(edge.id)
+        if self.conduits is not None:
+            self.conduits.add_edges(edge for edge, _ in edges)
+        if self.router is not None:
+            self.router.add_edges(edge for edge, _ in edges)
+
+
+    def add_group(self, new_group: Group):
+        self.groups.append(new_group)
+        self._groups_by_id[new_group.id] = new_group
+        self.revision += 1
+        if self.group_tree is not None:
+            parent_id = new_group.parent.id if new_group.parent is not None else None
+            self.group_tree.add(new_group.id, parent_id, new_group.min_level, new_group.max_level)
+        if self.conduits is not None:
+            self.conduits.groups_changed()
+
+
+    def reparent_group(self, group_id: str, parent_id: str | None):
+        """Move a group, and everything in it, into another group or to the top level."""
+        group = self._groups_by_id[group_id]
+        new_parent = self._groups_by_id.get(parent_id)
+        ancestor = new_parent
+        while ancestor is not None:
+            if ancestor is group:
+                raise ValueError(f"Group {parent_id} is inside {group_id}")
+            ancestor = ancestor.parent
+        old_parent = group.parent
+        if old_parent is not None and group_id in old_parent.groups:
+            old_parent.groups.remove(group_id)
+        if new_parent is not None:
+            new_parent.groups.append(group_id)
+        group.parent = new_parent
+        self.revision += 1
+        if self.group_tree is not None:
+            self.group_tree.reparent(group_id, parent_id)
+        if self.conduits is not None:
+            self.conduits.groups_changed()
+        if self.group_index is not None and group.rect is not None:
+            # The group is drawn at its new parent's levels.
+            self.group_index.remove(group_id)
+            self.group_index.insert(group_id, group.rect, *self._group_levels(group))
+            self._update_group_bounds(old_parent)
+            self._expand_group_bounds(new_parent, group.rect)
+
 
-    
     def __contains__(self, key):
         return key in self.nodes
 
+
+    def get_group(self, group_id: str | None) -> Group | None:
+        return self._groups_by_id.get(group_id)
+
+
+    def build_group_tree(self) -> Group_Tree:
+        """Index the nesting of the groups. Groups added afterwards are added to the tree as well."""
+        self.group_tree = Group_Tree(self.groups)
+        if self.conduits is not None:
+            self.conduits.groups_changed()
+        return self.group_tree
+
+
+    def build_conduit_table(self) -> Conduit_Table:
+        """Count the connections between each pair of groups. Edits afterwards keep the counts up to date."""
+        if self.group_tree is None:
+            self.build_group_tree()
+        self.conduits = Conduit_Table(self)
+        return self.conduits
+
+
+    def build_spatial_index(self):
+        """Bulk load the node and group indexes from the current positions of the nodes."""
+        self.node_index = Spatial_Index()
+        self.node_index.bulk_load(
+            (node.id, node.rect, *self._node_levels(node)) for node in self.nodes.values()
+        )
+        # Children before parents, so each group's bounds are built from its finished subgroups.
+        for group in sorted(self.groups, key=self._depth, reverse=True):
+            group.rect = self._group_bounds(group)
+        self.group_index = Spatial_Index()
+        self.group_index.bulk_load(
+            (group.id, group.rect, *self._group_levels(group)) for group in self.groups if group.rect is not None
+        )
+
+
+    def move_node(self, node_id: str, x: float, y: float):
+        node = self.nodes[node_id]
+        old_rect = node.rect
+        node.x, node.y = x, y
+        self.journal.moved(node_id, old_rect)
+        if self.node_index is None:
+            return
+        self.node_index.move(node_id, node.rect)
+        group = self._groups_by_id.get(node.group)
+        if group is None or group.rect is None:
+            return
+        # Only a node on the edge of its group can shrink it, otherwise the bounds can only grow.
+        if on_edge(group.rect, old_rect):
+            self._update_group_bounds(group)
+        else:
+            self._expand_group_bounds(group, node.rect)
+
+
+    def remove_node(self, node_id: str):
+        self.remove_nodes([node_id])
+
+
+    def remove_nodes(self, node_ids: list[str]):
+        """
+        Remove many nodes at once. Each group's member list is filtered and its bounds recomputed once,
+        rather than once per node.
+        """
+        groups = dict()
+        for node_id in node_ids:
+            node = self.nodes[node_id]
+            rect, group_id = node.rect, node.group
+            del self.nodes[node_id]
+            groups.setdefault(group_id, set()).add(node_id)
+            self.journal.removed(node_id, rect, group_id)
+            if self.node_index is not None:
+                self.node_index.remove(node_id)
+        if self.conduits is not None:
+            self.conduits.nodes_removed(node_ids)
+        for group_id, removed in groups.items():
+            group = self._groups_by_id.get(group_id)
+            if group is None:
+                continue
+            group.nodes = [node_id for node_id in group.nodes if node_id not in removed]
+            if self.node_index is not None and group.rect is not None:
+                self._update_group_bounds(group)
+
+
+    def set_node_title(self, node_id: str, title: str):
+        self.nodes[node_id].title = title
+        self.journal.retitled(node_id)
+
+
+    def index_group(self, group: Group):
+        """Bring the indexes up to date once a group has been loaded, which may have changed its levels."""
+        if self.group_tree is not None:
+            for group_id in [group.id] + self.group_tree.descendants(group.id):
+                current = self._groups_by_id[group_id]
+                self.group_tree.set_levels(group_id, current.min_level, current.max_level)
+        if self.conduits is not None:
+            self.conduits.groups_changed()
+        if self.node_index is None:
+            return
+        groups = [group]
+        for current in groups:
+            for node_id in current.nodes:
+                if node_id in self.node_index:
+                    self.node_index.set_levels(node_id, current.min_level, current.max_level)
+            for group_id in current.groups:
+                if group_id in self.group_index:
+                    self.group_index.set_levels(group_id, current.min_level, current.max_level)
+                if group_id in self._groups_by_id:
+                    groups.append(self._groups_by_id[group_id])
+        for current in reversed(groups):
+            self._update_group_bounds(current)
+
+
+    def nodes_in(self, rect: Rect, level: int | None = None) -> list[str]:
+        """The ids of the nodes intersecting `rect` which are visible at magnification `level`."""
+        if self.node_index is None:
+            self.build_spatial_index()
+        return self.node_index.query(rect, level)
+
+
+    def groups_in(self, rect: Rect, level: int | None = None) -> list[str]:
+        if self.group_index is None:
+            self.build_spatial_index()
+        return self.group_index.query(rect, level)
+
+
+    def nodes_at(self, x: float, y: float, level: int | None = None) -> list[str]:
+        return self.nodes_in((x, y, 0, 0), level)
+
+
+    def _index_node(self, node: Node):
+        if self.node_index is not None:
+            self.node_index.insert(node.id, node.rect, *self._node_levels(node))
+            self._expand_group_bounds(self._groups_by_id.get(node.group), node.rect)
+
+
+    def _node_levels(self, node: Node) -> tuple[int | None, int | None]:
+        group = self._groups_by_id.get(node.group)
+        return (group.min_level, group.max_level) if group is not None else (None, None)
+
+
+    @staticmethod
+    def _group_levels(group: Group) -> tuple[int | None, int | None]:
+        # A group is drawn wherever its parent's subordinates are.
+        parent = group.parent
+        return (parent.min_level, parent.max_level) if parent is not None else (None, None)
+
+
+    @staticmethod
+    def _depth(group: Group) -> int:
+        depth = 0
+        while group.parent is not None:
+            group = group.parent
+            depth += 1
+        return depth
+
+
+    def _group_bounds(self, group: Group) -> Rect | None:
+        rects = [self.nodes[node_id].rect for node_id in group.nodes if node_id in self.nodes]
+        for group_id in group.groups:
+            subgroup = self._groups_by_id.get(group_id)
+            if subgroup is not None and subgroup.rect is not None:
+                rects.append(subgroup.rect)
+        return union(rects)
+
+
+    def _expand_group_bounds(self, group: Group | None, rect: Rect):
+        """Adding a node can only grow its ancestors, so this avoids rescanning their members."""
+        while group is not None:
+            expanded = union([group.rect, rect]) if group.rect is not None else rect
+            if expanded == group.rect:
+                return
+            if group.rect is None:
+                self.group_index.insert(group.id, expanded, *self._group_levels(group))
+            else:
+                self.group_index.move(group.id, expanded)
+            group.rect = expanded
+            group = group.parent
+
+
+    def _update_group_bounds(self, group: Group | None):
+        """Recompute the bounds of a group and its ancestors, stopping once they no longer change."""
+        while group is not None:
+            rect = self._group_bounds(group)
+            if rect == group.rect:
+                return
+            if group.rect is None:
+                self.group_index.insert(group.id, rect, *self._group_levels(group))
+            elif rect is None:
+                self.group_index.remove(group.id)
+            else:
+                self.group_index.move(group.id, rect)
+            group.rect = rect
+            group = group.parent
@@ -0,0 +1,397 @@
+"""
+A compiled, binary snapshot of a Scene.
+
+The file holds fixed-width node, edge and group tables, a string table for every id, title and name, and
+per-group slices into a shared member table. It is opened with mmap, so opening is constant time and 
+only the pages which are actually touched are read from disk.
+
+Layout (little-endian), each section starting at the offset recorded in the header:
+    header          HEADER
+    string index    STRING_ENTRY per string: (offset into string data, byte length)
+    string data     UTF-8 bytes
+    nodes           NODE per node
+    edges           EDGE per edge
+    groups          GROUP per group
+    members         uint32 node, group and edge indices, sliced by the group table
+    node order      uint32 node indices sorted by node id, for binary search
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from src.model.edge import Edge
+from src.model.group import Group
+from src.model.loader import load_scene
+from src.model.node import Node
+from src.model.scene import Scene
+
+MAGIC = b"MLOD"
+VERSION = 2
+NONE = 0xFFFFFFFF
+NO_LEVEL = -2**31
+
+HEADER = struct.Struct("<4sIII" + "Q" * 12)
+STRING_ENTRY = struct.Struct("<QI")
+# id, title, group index, inputs (JSON), outputs (JSON), x, y
+NODE = struct.Struct("<IIiIIdd")
+# id, (node, socket, group) of the start and the end, type, knots (JSON)
+EDGE = struct.Struct("<IIIIIIIII")
+# id, name, parent index, min level, max level, filepath, loaded, 
+# then (start, count) into the members of its nodes, groups and edges, and its ports (JSON)
+GROUP = struct.Struct("<IIiiiIB3xIIIIIII")
+MEMBER = struct.Struct("<I")
+
+
+class String_Table():
+    def __init__(self) -> None:
+        self.indexes = dict()
+        self.strings = list()
+
+
+    def add(self, value: str | None) -> int:
+        if value is None:
+            return NONE
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+    def add_json(self, value) -> int:
+        return self.add(json.dumps(value, separators=(',', ':')))
+
+
+def json_list(strings: list[str], indexes) -> list:
+    """Decode the JSON strings at `indexes` with a single json.loads."""
+    return json.loads('[' + ','.join([strings[index] for index in indexes]) + ']')
+
+
+def _level(value: int | None) -> int:
+    return NO_LEVEL if value is None else value
+
+
+def edge_end(string, node: int, socket: int, group: int) -> dict:
+    """An edge end with only the keys it was written with, as the JSON loader keeps it."""
+    return {
+        key: string(index)
+        for key, index in (('node', node), ('socket', socket), ('group', group)) if index != NONE
+    }
+
+
+def write_snapshot(scene: Scene, filepath: str):
+    strings = String_Table()
+    node_ids = list(scene.nodes)
+    node_indexes = {node_id: index for index, node_id in enumerate(node_ids)}
+    group_indexes = {group.id: index for index, group in enumerate(scene.groups)}
+    edge_indexes = dict()
+    for index, edge in enumerate(scene.edges):
+        edge_indexes.setdefault(edge.id, index)
+
+    nodes = bytearray()
+    for node in scene.nodes.values():
+        nodes += NODE.pack(
+            strings.add(node.id), 
+            strings.add(node.title), 
+            group_indexes.get(node.group, -1), 
+            strings.add_json(node.inputs), 
+            strings.add_json(node.outputs), 
+            node.x, 
+            node.y
+        )
+
+    edges = bytearray()
+    for edge in scene.edges:
+        edges += EDGE.pack(
+            strings.add(edge.id), 
+            strings.add(edge.start.get('node')), 
+            strings.add(edge.start.get('socket')), 
+            strings.add(edge.start.get('group')), 
+            strings.add(edge.end.get('node')), 
+            strings.add(edge.end.get('socket')), 
+            strings.add(edge.end.get('group')), 
+            strings.add(edge.type), 
+            strings.add_json(edge.knots)
+        )
+
+    groups = bytearray()
+    members = array('I')
+    for group in scene.groups:
+        slices = list()
+        for ids, indexes in ((group.nodes, node_indexes), (group.groups, group_indexes), (group.edges, edge_indexes)):
+            slices += [len(members), len(ids)]
+            members.extend(indexes[member_id] for member_id in ids)
+        groups += GROUP.pack(
+            strings.add(group.id), 
+            strings.add(group.name), 
+            group_indexes[group.parent.id] if group.parent is not None else -1, 
+            _level(group.min_level), 
+            _level(group.max_level), 
+            strings.add(group.filepath), 
+            group.loaded, 
+            *slices, 
+            strings.add_json(group.ports)
+        )
+
+    node_order = array('I', sorted(range(len(node_ids)), key=lambda index: node_ids[index].encode('utf-8')))
+    name, ports = strings.add(scene.name), strings.add_json(scene.ports)
+
+    string_index = bytearray()
+    string_data = bytearray()
+    for value in strings.strings:
+        encoded = value.encode('utf-8')
+        string_index += STRING_ENTRY.pack(len(string_data), len(encoded))
+        string_data += encoded
+
+    if sys.byteorder == 'big':
+        members.byteswap()
+        node_order.byteswap()
+    sections = [string_index, string_data, nodes, edges, groups, members.tobytes(), node_order.tobytes()]
+    offsets = list()
+    offset = HEADER.size
+    for section in sections:
+        offsets.append(offset)
+        offset += len(section)
+
+    with open(filepath, 'wb') as file:
+        file.write(HEADER.pack(
+            MAGIC, VERSION, name, ports, 
+            len(strings.strings), len(node_ids), len(scene.edges), len(scene.groups), len(members), 
+            *offsets
+        ))
+        for section in sections:
+            file.write(section)
+
+
+def convert_super_file(super_file: str, snapshot_path: str) -> Scene:
+    """Load a super file and every group file it references, and write them as a snapshot."""
+    scene = load_scene(super_file, lazy=False)
+    write_snapshot(scene, snapshot_path)
+    return scene
+
+
+class Snapshot():
+    def __init__(self, filepath: str) -> None:
+        self.filepath = filepath
+        with open(filepath, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{filepath} is not a scene snapshot")
+
+        (
+            magic, version, self._name, self._ports, 
+            self.string_count, self.node_count, self.edge_count, self.group_count, self.member_count, 
+            self._string_index, self._string_data, self._nodes, self._edges, self._groups, 
+            self._members, self._node_order
+        ) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{filepath} is not a version {VERSION} scene snapshot")
+
+
+    def close(self):
+        self._map.close()
+
+
+    def __enter__(self) -> Snapshot:
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+    def string(self, index: int) -> str | None:
+        if index == NONE:
+            return None
+        offset, length = STRING_ENTRY.unpack_from(self._map, self._string_index + index * STRING_ENTRY.size)
+        start = self._string_data + offset
+        return self._map[start:start + length].decode('utf-8')
+
+
+    def _json(self, index: int):
+        return json.loads(self.string(index))
+
+
+    def _member(self, index: int) -> int:
+        return MEMBER.unpack_from(self._map, self._members + index * MEMBER.size)[0]
+
+
+    def _members_slice(self, start: int, count: int) -> list[int]:
+        offset = self._members + start * MEMBER.size
+        members = array('I', self._map[offset:offset + count * MEMBER.size])
+        if sys.byteorder == 'big':
+            members.byteswap()
+        return members.tolist()
+
+
+    @property
+    def name(self) -> str:
+        return self.string(self._name)
+
+
+    @property
+    def ports(self) -> list[dict]:
+        return self._json(self._ports)
+
+
+    def node_id(self, index: int) -> str:
+        return self.string(NODE.unpack_from(self._map, self._nodes + index * NODE.size)[0])
+
+
+    def node(self, index: int, scene: Scene | None = None) -> Node:
+        node_id, title, group, inputs, outputs, x, y = NODE.unpack_from(self._map, self._nodes + index * NODE.size)
+        node = Node(scene, self.string(node_id), self.string(title), group=self.group_id(group))
+        node.x, node.y = x, y
+        node.inputs = self._json(inputs)
+        node.outputs = self._json(outputs)
+        return node
+
+
+    def node_index(self, node_id: str) -> int | None:
+        """Binary search of the node order, touching O(log n) entries of the file."""
+        target = node_id.encode('utf-8')
+        low, high = 0, self.node_count
+        while low < high:
+            middle = (low + high) // 2
+            index = MEMBER.unpack_from(self._map, self._node_order + middle * MEMBER.size)[0]
+            if self.node_id(index).encode('utf-8') < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.node_count:
+            index = MEMBER.unpack_from(self._map, self._node_order + low * MEMBER.size)[0]
+            if self.node_id(index) == node_id:
+                return index
+        return None
+
+
+    def get_node(self, node_id: str, scene: Scene | None = None) -> Node | None:
+        index = self.node_index(node_id)
+        return self.node(index, scene) if index is not None else None
+
+
+    def edge(self, index: int, scene: Scene | None = None) -> Edge:
+        (
+            edge_id, start_node, start_socket, start_group, end_node, end_socket, end_group, type, knots
+        ) = EDGE.unpack_from(self._map, self._edges + index * EDGE.size)
+        return Edge(
+            scene, 
+            self.string(edge_id), 
+            edge_end(self.string, start_node, start_socket, start_group), 
+            edge_end(self.string, end_node, end_socket, end_group), 
+            type=self.string(type), 
+            knots=self._json(knots)
+        )
+
+
+    def _group_record(self, index: int) -> tuple:
+        return GROUP.unpack_from(self._map, self._groups + index * GROUP.size)
+
+
+    def group_id(self, index: int) -> str | None:
+        return self.string(self._group_record(index)[0]) if index >= 0 else None
+
+
+    def group(self, index: int, scene: Scene | None = None, parent: Group | None = None) -> Group:
+        """Build a group. Its members are ids, as in a loaded Scene; `parent` is taken as given."""
+        return self._group(index, scene, parent, self.string, self.node_id, self.group_id, self.edge_id)
+
+
+    def _group(self, index, scene, parent, string, node_id, group_id, edge_id) -> Group:
+        (
+            id, name, _, min_level, max_level, filepath, loaded, 
+            nodes_start, nodes_count, groups_start, groups_count, edges_start, edges_count, ports
+        ) = self._group_record(index)
+        group = Group(
+            scene, 
+            string(id), 
+            string(name), 
+            parent, 
+            None if min_level == NO_LEVEL else min_level, 
+            None if max_level == NO_LEVEL else max_level, 
+            string(filepath)
+        )
+        group.loaded = bool(loaded)
+        group.ports = json.loads(string(ports))
+        group.nodes = [node_id(member) for member in self._members_slice(nodes_start, nodes_count)]
+        group.groups = [group_id(member) for member in self._members_slice(groups_start, groups_count)]
+        group.edges = [edge_id(member) for member in self._members_slice(edges_start, edges_count)]
+        return group
+
+
+    def edge_id(self, index: int) -> str:
+        return self.string(EDGE.unpack_from(self._map, self._edges + index * EDGE.size)[0])
+
+
+    def group_parent_index(self, index: int) -> int:
+        return self._group_record(index)[2]
+
+
+    def group_node_indexes(self, index: int) -> list[int]:
+        record = self._group_record(index)
+        return self._members_slice(record[7], record[8])
+
+
+    def strings(self) -> list[str]:
+        """Decode the whole string table at once."""
+        data = self._map[self._string_data:self._nodes].decode('utf-8') if self.string_count else ''
+        table = self._map[self._string_index:self._string_index + self.string_count * STRING_ENTRY.size]
+        if data.isascii():
+            return [data[offset:offset + length] for offset, length in STRING_ENTRY.iter_unpack(table)]
+        raw = self._map[self._string_data:self._nodes]
+        return [raw[offset:offset + length].decode('utf-8') for offset, length in STRING_ENTRY.iter_unpack(table)]
+
+
+    def to_scene(self) -> Scene:
+        """Materialise the whole snapshot as a Scene, decoding the tables in bulk."""
+        strings = self.strings()
+        string = lambda index: strings[index] if index != NONE else None
+
+        nodes = self._map[self._nodes:self._nodes + self.node_count * NODE.size]
+        edges = self._map[self._edges:self._edges + self.edge_count * EDGE.size]
+        node_ids = [strings[record[0]] for record in NODE.iter_unpack(nodes)]
+        edge_ids = [strings[record[0]] for record in EDGE.iter_unpack(edges)]
+        group_ids = [strings[self._group_record(index)[0]] for index in range(self.group_count)]
+
+        scene = Scene()
+        scene.name = self.name
+        scene.ports = self.ports
+        for index in range(self.group_count):
+            scene.add_group(self._group(
+                index, scene, None, string, node_ids.__getitem__, group_ids.__getitem__, edge_ids.__getitem__
+            ))
+        for index, group in enumerate(scene.groups):
+            parent_index = self.group_parent_index(index)
+            group.parent = scene.groups[parent_index] if parent_index >= 0 else None
+
+        # One json.loads over all the records is far cheaper than one per record.
+        node_records = list(NODE.iter_unpack(nodes))
+        inputs = json_list(strings, (record[3] for record in node_records))
+        outputs = json_list(strings, (record[4] for record in node_records))
+        scene.add_nodes(
+            node_ids,
+            [string(record[1]) for record in node_records],
+            [group_ids[record[2]] if record[2] >= 0 else None for record in node_records],
+            [(record[5], record[6]) for record in node_records]
+        )
+        for node_id, node_inputs, node_outputs in zip(node_ids, inputs, outputs):
+            if node_inputs or node_outputs:
+                node = scene.nodes[node_id]
+                node.inputs = node_inputs
+                node.outputs = node_outputs
+
+        edge_records = list(EDGE.iter_unpack(edges))
+        all_knots = json_list(strings, (record[8] for record in edge_records))
+        for (
+            edge_id, start_node, start_socket, start_group, end_node, end_socket, end_group, type, _
+        ), knots in zip(edge_records, all_knots):
+            start = edge_end(string, start_node, start_socket, start_group)
+            end = edge_end(string, end_node, end_socket, end_group)
+            scene.add_edge(Edge(scene, strings[edge_id], start, end, type=string(type), knots=knots))
+        return scene
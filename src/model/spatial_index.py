@@ -0,0 +1,226 @@
+"""
+A spatial index over the model, independent of Qt.
+
+Entries are rectangles (x, y, width, height) keyed by id, each with the range of magnifications at which
+it is visible. Entries sharing a level range are kept in the same bucket, and each bucket is a quadtree,
+so a query at magnification L only walks the buckets visible at L, in O(log n + k).
+"""
+from __future__ import annotations
+
+from typing import Hashable, Iterable
+
+Rect = tuple[float, float, float, float]
+
+SCENE_BOUNDS = (-32_000, -32_000, 64_000, 64_000)
+MAX_ITEMS = 16
+MAX_DEPTH = 12
+
+
+def intersects(a: Rect, b: Rect) -> bool:
+    return a[0] <= b[0] + b[2] and b[0] <= a[0] + a[2] and a[1] <= b[1] + b[3] and b[1] <= a[1] + a[3]
+
+
+def contains(outer: Rect, inner: Rect) -> bool:
+    return (
+        outer[0] <= inner[0] and inner[0] + inner[2] <= outer[0] + outer[2] and 
+        outer[1] <= inner[1] and inner[1] + inner[3] <= outer[1] + outer[3]
+    )
+
+
+def in_range(level: int, min_level: int | None, max_level: int | None) -> bool:
+    return (min_level is None or level >= min_level) and (max_level is None or level <= max_level)
+
+
+class Quad():
+    """
+    A quadtree node. Items stay at the deepest node which wholly contains them, so an item never has to be 
+    split across children.
+    """
+    __slots__ = ('rect', 'depth', 'items', 'children')
+
+    def __init__(self, rect: Rect, depth: int = 0) -> None:
+        self.rect = rect
+        self.depth = depth
+        self.items = dict()
+        self.children = None
+
+
+    def child_for(self, rect: Rect) -> Quad | None:
+        if self.children is None:
+            return None
+        for child in self.children:
+            if contains(child.rect, rect):
+                return child
+        return None
+
+
+    def split(self):
+        x, y, width, height = self.rect
+        half_width, half_height = width / 2, height / 2
+        self.children = [
+            Quad((x + dx * half_width, y + dy * half_height, half_width, half_height), self.depth + 1) 
+            for dy in (0, 1) for dx in (0, 1)
+        ]
+
+
+class Quadtree():
+    def __init__(self, bounds: Rect = SCENE_BOUNDS) -> None:
+        self.root = Quad(bounds)
+        # Where each item lives, for constant time removal.
+        self._locations = dict()
+
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+
+    def bulk_load(self, entries: list[tuple[Hashable, Rect]]):
+        """Build the tree top down in one pass, rather than splitting and redistributing as items arrive."""
+        if not self._locations and entries:
+            # Fit an empty tree to its entries, as anything outside the root's bounds is never pushed down.
+            left = min(min(rect[0] for _, rect in entries), self.root.rect[0])
+            top = min(min(rect[1] for _, rect in entries), self.root.rect[1])
+            right = max(max(rect[0] + rect[2] for _, rect in entries), self.root.rect[0] + self.root.rect[2])
+            bottom = max(max(rect[1] + rect[3] for _, rect in entries), self.root.rect[1] + self.root.rect[3])
+            self.root = Quad((left, top, right - left, bottom - top))
+        stack = [(self.root, entries)]
+        while stack:
+            quad, quad_entries = stack.pop()
+            if quad.children is None and (len(quad.items) + len(quad_entries) <= MAX_ITEMS or quad.depth >= MAX_DEPTH):
+                for key, rect in quad_entries:
+                    self._place(quad, key, rect)
+                continue
+            if quad.children is None:
+                quad.split()
+                quad_entries = quad_entries + list(quad.items.items())
+                for key in quad.items:
+                    del self._locations[key]
+                quad.items.clear()
+            partitions = [list() for _ in quad.children]
+            for key, rect in quad_entries:
+                for index, child in enumerate(quad.children):
+                    if contains(child.rect, rect):
+                        partitions[index].append((key, rect))
+                        break
+                else:
+                    self._place(quad, key, rect)
+            stack.extend((child, partition) for child, partition in zip(quad.children, partitions) if partition)
+
+
+    def _place(self, quad: Quad, key: Hashable, rect: Rect):
+        quad.items[key] = rect
+        self._locations[key] = quad
+
+
+    def insert(self, key: Hashable, rect: Rect):
+        quad = self.root
+        while (child := quad.child_for(rect)) is not None:
+            quad = child
+        self._place(quad, key, rect)
+        if quad.children is None and len(quad.items) > MAX_ITEMS and quad.depth < MAX_DEPTH:
+            items = list(quad.items.items())
+            quad.items.clear()
+            quad.split()
+            for item_key, item_rect in items:
+                self._place(quad.child_for(item_rect) or quad, item_key, item_rect)
+
+
+    def remove(self, key: Hashable) -> Rect:
+        quad = self._locations.pop(key)
+        return quad.items.pop(key)
+
+
+    def move(self, key: Hashable, rect: Rect):
+        quad = self._locations[key]
+        # Stay put if the item still fits here and can't sink any deeper.
+        if (quad is self.root or contains(quad.rect, rect)) and quad.child_for(rect) is None:
+            quad.items[key] = rect
+            return
+        self.remove(key)
+        self.insert(key, rect)
+
+
+    def query(self, rect: Rect) -> list[Hashable]:
+        left, top = rect[0], rect[1]
+        right, bottom = left + rect[2], top + rect[3]
+        found = list()
+        stack = [self.root]
+        while stack:
+            quad = stack.pop()
+            # intersects(), inlined as this is the innermost loop of every query.
+            found.extend(
+                key for key, (x, y, width, height) in quad.items.items() 
+                if x <= right and left <= x + width and y <= bottom and top <= y + height
+            )
+            if quad.children is not None:
+                stack.extend(child for child in quad.children if intersects(rect, child.rect))
+        return found
+
+
+class Spatial_Index():
+    def __init__(self, bounds: Rect = SCENE_BOUNDS) -> None:
+        self.bounds = bounds
+        # One quadtree per (min_level, max_level) range.
+        self.buckets = dict()
+        self._entries = dict()
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+    def _bucket(self, levels: tuple[int | None, int | None]) -> Quadtree:
+        if levels not in self.buckets:
+            self.buckets[levels] = Quadtree(self.bounds)
+        return self.buckets[levels]
+
+
+    def bulk_load(self, entries: Iterable[tuple[Hashable, Rect, int | None, int | None]]):
+        grouped = dict()
+        for key, rect, min_level, max_level in entries:
+            if key in self._entries:
+                self.remove(key)
+            self._entries[key] = (min_level, max_level)
+            grouped.setdefault((min_level, max_level), list()).append((key, rect))
+        for levels, bucket_entries in grouped.items():
+            self._bucket(levels).bulk_load(bucket_entries)
+
+
+    def insert(self, key: Hashable, rect: Rect, min_level: int | None = None, max_level: int | None = None):
+        if key in self._entries:
+            self.remove(key)
+        self._entries[key] = (min_level, max_level)
+        self._bucket((min_level, max_level)).insert(key, rect)
+
+
+    def remove(self, key: Hashable):
+        levels = self._entries.pop(key)
+        self.buckets[levels].remove(key)
+
+
+    def move(self, key: Hashable, rect: Rect):
+        self.buckets[self._entries[key]].move(key, rect)
+
+
+    def set_levels(self, key: Hashable, min_level: int | None, max_level: int | None):
+        rect = self.buckets[self._entries[key]].remove(key)
+        self._entries[key] = (min_level, max_level)
+        self._bucket((min_level, max_level)).insert(key, rect)
+
+
+    def query(self, rect: Rect, level: int | None = None) -> list[Hashable]:
+        """The keys of every entry intersecting `rect`, which are visible at `level` if it is given."""
+        found = list()
+        for (min_level, max_level), bucket in self.buckets.items():
+            if level is None or in_range(level, min_level, max_level):
+                found.extend(bucket.query(rect))
+        return found
+
+
+    def at(self, x: float, y: float, level: int | None = None) -> list[Hashable]:
+        """Hit test a single point."""
+        return self.query((x, y, 0, 0), level)
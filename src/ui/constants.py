@@ -1,9 +1,54 @@
 from PySide6.QtCore import Qt
+from PySide6.QtGui import QKeySequence
 
 
 GRID_SIZE = 20
 LARGE_GRID = 5
+# Each wheel step scales the view by this much, and the magnification changes every LARGE_GRID steps.
+ZOOM_FACTOR = 1.25
+# Largest edge (in device pixels) of a cached grid tile. Above this the grid
+# lines are drawn directly as there are only a handful of them on screen.
+GRID_TILE_MAX_SIZE = 2048
+GRID_TILE_MIN_SIZE = 256
+
+# Level of detail thresholds, in device pixels per scene unit.
+LOD_FULL = 0.5
+LOD_BOX = 0.1
+
+# A virtualized scene keeps items for this fraction of a screen around the visible rect.
+VIRTUAL_MARGIN = 0.5
+
+# Pre-rendered scene tiles are this many pixels square, and the cache keeps this many bytes of them.
+TILE_PIXELS = 256
+TILE_CACHE_BUDGET = 64 * 2**20
+
+# Items deleted in bulk are hidden at once, then taken out of the scene this many per pass of the event loop.
+REMOVAL_BATCH = 200
+# Moving more nodes than this fraction of the scene's items is quicker with the index switched off and rebuilt
+# once. Each node is two items, with its title, so this is a quarter of the nodes.
+BULK_MOVE_FRACTION = 0.125
+
+# Connections are culled in square tiles of this many scene units.
+EDGE_TILE_SIZE = 2048
+# Connections are drawn beneath the nodes.
+EDGE_Z_VALUE = -1
+
+# Exported images are cut into tiles this many pixels square.
+EXPORT_TILE_PIXELS = 1024
+# Scene units of background around the nodes in an export.
+EXPORT_MARGIN = 100
+
+# Where the instrumentation's Chrome trace is written, in the working directory.
+TRACE_FILE = "trace.json"
 
 KEY_MAPPING = {
-    Qt.Key.Key_Delete: "delete_selected"
+    Qt.Key.Key_Delete: "delete_selected",
+    Qt.Key.Key_F2: "toggle_ruler",
+    Qt.Key.Key_F3: "toggle_hud",
+    Qt.Key.Key_F4: "export_trace"
+}
+# Shortcuts with modifiers, which differ between platforms.
+STANDARD_KEY_MAPPING = {
+    QKeySequence.StandardKey.Undo: "undo",
+    QKeySequence.StandardKey.Redo: "redo"
 }
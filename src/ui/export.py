@@ -0,0 +1,181 @@
+"""
+Renders a model Scene to files at chosen magnifications, painted by a Graphics_Scene and its Graphics_Nodes
+just as the window paints them, for reports.
+
+Each level is drawn at the scale the view has at that magnification, or a scale given, over the bounds of
+the nodes. Images are cut into EXPORT_TILE_PIXELS square tiles, so a canvas far larger than memory never
+exists as a single bitmap: the items in a tile are virtualized from the model, the tile is rendered, and it
+is handed to a QThreadPool worker which encodes and writes it while the next one renders. Items can only be
+painted on the GUI thread, so rendering is serial and encoding runs in parallel. At most two tiles per
+worker are waiting at once. An index.json describes where each level's tiles go.
+
+SVG is written one file per level, tile by tile, by QSvgGenerator.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+
+from PySide6.QtCore import QRectF, QRunnable, QSize, QThreadPool, Qt
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtSvg import QSvgGenerator
+
+from src.model.node import NODE_HEIGHT, NODE_WIDTH
+from src.model.scene import Scene
+from src.ui.constants import EXPORT_MARGIN, EXPORT_TILE_PIXELS
+from src.ui.graphics_scene import Graphics_Scene
+from src.ui.graphics_view import DEFAULT_RENDER_HINTS
+from src.ui.level_of_detail import level_scale
+
+INDEX_FILE = "index.json"
+# Tiles rendered and waiting to be written, per worker.
+TILES_PER_WORKER = 2
+
+
+class Tile_Writer(QRunnable):
+    def __init__(self, image: QImage, path: str, done: threading.Semaphore, errors: list) -> None:
+        super().__init__()
+        self.image = image
+        self.path = path
+        self.done = done
+        self.errors = errors
+
+
+    def run(self):
+        try:
+            if not self.image.save(self.path):
+                self.errors.append(self.path)
+        finally:
+            self.image = None
+            self.done.release()
+
+
+class Scene_Exporter():
+    def __init__(
+        self,
+        scene: Scene,
+        directory: str,
+        tile_pixels: int = EXPORT_TILE_PIXELS,
+        workers: int | None = None,
+        margin: float = EXPORT_MARGIN
+    ) -> None:
+        self.scene = scene
+        self.directory = directory
+        self.tile_pixels = tile_pixels
+        self.margin = margin
+        self.graphics_scene = Graphics_Scene()
+        self.graphics_scene.set_model(scene)
+        self.pool = QThreadPool()
+        if workers is not None:
+            self.pool.setMaxThreadCount(workers)
+        self._slots = threading.Semaphore(TILES_PER_WORKER * self.pool.maxThreadCount())
+        # The index entry of each level exported, and the tiles which couldn't be written.
+        self.levels = list()
+        self.errors = list()
+
+
+    def bounds(self) -> QRectF:
+        """The nodes' bounds, with a margin round them."""
+        nodes = self.scene.nodes
+        if not len(nodes):
+            return QRectF()
+        alive = nodes.alive
+        xs, ys = nodes.x[alive], nodes.y[alive]
+        left, top = float(xs.min()) - self.margin, float(ys.min()) - self.margin
+        right, bottom = float(xs.max()) + NODE_WIDTH + self.margin, float(ys.max()) + NODE_HEIGHT + self.margin
+        return QRectF(left, top, right - left, bottom - top)
+
+
+    def show_level(self, level: int):
+        """Show the scene as the view does at magnification `level`."""
+        self.graphics_scene.set_magnification(level)
+        self.graphics_scene.rescale_grid(2**-level)
+
+
+    def render(self, painter: QPainter, target: QRectF, source: QRectF):
+        self.graphics_scene.update_visible_items(source)
+        self.graphics_scene.render(painter, target, source, Qt.AspectRatioMode.IgnoreAspectRatio)
+
+
+    def grid(self, bounds: QRectF, scale: float) -> tuple[int, int]:
+        size = self.tile_pixels / scale
+        return math.ceil(bounds.width() / size), math.ceil(bounds.height() / size)
+
+
+    def export_images(self, level: int, scale: float | None = None) -> dict:
+        """Write the tiles of one level as {level}/{column}_{row}.png. Returns the level's entry in the index."""
+        scale = scale if scale is not None else level_scale(level)
+        bounds = self.bounds()
+        columns, rows = self.grid(bounds, scale)
+        os.makedirs(os.path.join(self.directory, str(level)), exist_ok=True)
+        self.show_level(level)
+        size = self.tile_pixels / scale
+        target = QRectF(0, 0, self.tile_pixels, self.tile_pixels)
+        for row in range(rows):
+            for column in range(columns):
+                source = QRectF(bounds.left() + column * size, bounds.top() + row * size, size, size)
+                # The scene's background brush covers every pixel, so the tiles need no alpha, which makes
+                # them quicker to encode and smaller.
+                image = QImage(self.tile_pixels, self.tile_pixels, QImage.Format.Format_RGB32)
+                painter = QPainter(image)
+                painter.setRenderHints(DEFAULT_RENDER_HINTS)
+                self.render(painter, target, source)
+                painter.end()
+                self._slots.acquire()
+                path = os.path.join(self.directory, str(level), f"{column}_{row}.png")
+                self.pool.start(Tile_Writer(image, path, self._slots, self.errors))
+        return {
+            "level": level, "scale": scale, "origin": [bounds.left(), bounds.top()],
+            "columns": columns, "rows": rows, "tiles": f"{level}/{{column}}_{{row}}.png",
+        }
+
+
+    def export_svg(self, level: int, scale: float | None = None) -> dict:
+        """Write one level as {level}.svg, rendered a tile's worth of the scene at a time."""
+        scale = scale if scale is not None else level_scale(level)
+        bounds = self.bounds()
+        columns, rows = self.grid(bounds, scale)
+        self.show_level(level)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{level}.svg")
+        generator = QSvgGenerator()
+        generator.setFileName(path)
+        generator.setSize(QSize(math.ceil(bounds.width() * scale), math.ceil(bounds.height() * scale)))
+        generator.setViewBox(QRectF(0, 0, bounds.width() * scale, bounds.height() * scale))
+        generator.setTitle(f"{self.scene.name} at level {level}")
+        painter = QPainter(generator)
+        size = self.tile_pixels / scale
+        for row in range(rows):
+            for column in range(columns):
+                source = QRectF(bounds.left() + column * size, bounds.top() + row * size, size, size)
+                target = QRectF(column * self.tile_pixels, row * self.tile_pixels, self.tile_pixels, self.tile_pixels)
+                painter.save()
+                painter.setClipRect(target)
+                self.render(painter, target, source)
+                painter.restore()
+        painter.end()
+        return {"level": level, "scale": scale, "origin": [bounds.left(), bounds.top()], "file": f"{level}.svg"}
+
+
+    def export_level(self, level: int, svg: bool = False, scale: float | None = None) -> dict:
+        entry = self.export_svg(level, scale) if svg else self.export_images(level, scale)
+        self.levels.append(entry)
+        return entry
+
+
+    def finish(self) -> dict:
+        """Wait for the last tiles to be written, and write the index of every level exported. Returns the index."""
+        self.pool.waitForDone()
+        os.makedirs(self.directory, exist_ok=True)
+        index = {"name": self.scene.name, "tile_pixels": self.tile_pixels, "levels": self.levels}
+        with open(os.path.join(self.directory, INDEX_FILE), "w", encoding="utf-8") as file:
+            json.dump(index, file, indent=2)
+        return index
+
+
+    def export(self, levels: list[int], svg: bool = False, scale: float | None = None) -> dict:
+        for level in levels:
+            self.export_level(level, svg, scale)
+        return self.finish()
@@ -0,0 +1,231 @@
+from typing import Iterable, Optional
+from PySide6 import QtGui, QtWidgets
+from PySide6.QtWidgets import QGraphicsItem
+from PySide6.QtCore import Qt, QLineF, QPointF, QRectF
+
+from src.model.edge import Edge
+from src.model.scene import Scene
+from src.ui.constants import EDGE_TILE_SIZE
+from src.ui.graphics_node import item_detail
+from src.ui.instrumentation import INSTRUMENTS
+from src.ui.level_of_detail import Detail
+
+DEFAULT_EDGE_COLOR = '#FFb0bec5'
+# Horizontal reach of a curve's control points, as a fraction of the distance between its ends.
+CURVE_REACH = 0.5
+MIN_CURVE_REACH = 40
+
+Points = list[tuple[float, float]]
+
+
+def curve(points: Points) -> QtGui.QPainterPath:
+    (x0, y0), (x1, y1) = points[0], points[-1]
+    reach = max(abs(x1 - x0) * CURVE_REACH, MIN_CURVE_REACH)
+    path = QtGui.QPainterPath(QPointF(x0, y0))
+    path.cubicTo(QPointF(x0 + reach, y0), QPointF(x1 - reach, y1), QPointF(x1, y1))
+    return path
+
+
+def edge_points(scene: Scene, edge: Edge) -> Points | None:
+    """
+    The route the scene's Router found for a connection, or a straight line between its ends until it has
+    one. None while either end is missing.
+    """
+    router = scene.router
+    if router is not None and edge.id in router.routes and edge.id not in router.dirty:
+        return router.routes[edge.id].points
+    start, end = scene.nodes.get(edge.start.get('node')), scene.nodes.get(edge.end.get('node'))
+    if start is None or end is None:
+        return None
+    return [(start.x + start.width, start.y + start.height / 2), (end.x, end.y + end.height / 2)]
+
+
+class Graphics_Edges(QGraphicsItem):
+    """
+    Every connection of a group or conduit, drawn by a single item.
+
+    Each connection is kept in the tile holding the midpoint of its ends, and each tile remembers the bounds
+    of what it holds, so a paint only visits the tiles that reach the exposed area. The lines of a tile are
+    built the first time it is painted at each level of detail and drawn in one drawLines call. Zoomed out
+    each connection is a straight line between its ends, in between it follows its route, and only up close
+    are curved connections drawn as curves.
+    """
+    def __init__(
+        self,
+        parent: QGraphicsItem | None = None,
+        width: float = 1.0,
+        color: str = DEFAULT_EDGE_COLOR,
+        tile_size: int = EDGE_TILE_SIZE
+    ) -> None:
+        super().__init__(parent)
+        self.tile_size = tile_size
+        self._routes = dict()
+        self._rects = dict()
+        self._tiles = dict()
+        self._tile_bounds = dict()
+        self._edge_tile = dict()
+        self._lines = dict()
+        self._curves = dict()
+        self._bounding_rect = QRectF()
+
+        self._define_pen(width, color)
+        # Painting needs the exposed rect to cull tiles.
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+
+    def _define_pen(self, width: float, color: str):
+        self._pen = QtGui.QPen(QtGui.QColor(color), width)
+        self._pen.setCosmetic(True)
+
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+
+    def set_width(self, width: float):
+        """Conduits are drawn thicker the more connections they carry."""
+        self._pen.setWidthF(width)
+        self.update()
+
+
+    def set_route(self, edge_id: str, points: Points, curved: bool = False):
+        self.set_routes([(edge_id, points, curved)])
+
+
+    def set_routes(self, routes: Iterable[tuple[str, Points, bool]]):
+        """Add or replace many routes with at most a single geometry change."""
+        bounds = self._bounding_rect
+        # The tiles routes were replaced in, which may have shrunk.
+        vacated = set()
+        for edge_id, points, curved in routes:
+            if edge_id in self._routes:
+                vacated.add(self._remove(edge_id))
+            self._routes[edge_id] = (points, curved)
+            xs = [x for x, _ in points]
+            ys = [y for _, y in points]
+            rect = QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+            self._rects[edge_id] = rect
+            tile = self._tile_of(points)
+            self._edge_tile[edge_id] = tile
+            self._tiles.setdefault(tile, dict())[edge_id] = None
+            self._tile_bounds[tile] = self._tile_bounds[tile].united(rect) if tile in self._tile_bounds else rect
+            self._forget(tile)
+            bounds = bounds.united(rect) if not bounds.isNull() else rect
+        self._set_bounds(self._shrink(vacated) if vacated else bounds)
+
+
+    def clear(self):
+        for mapping in (self._routes, self._rects, self._tiles, self._tile_bounds, self._edge_tile, self._lines, self._curves):
+            mapping.clear()
+        self._set_bounds(QRectF())
+
+
+    def remove_route(self, edge_id: str):
+        self.remove_routes([edge_id])
+
+
+    def remove_routes(self, edge_ids: Iterable[str]):
+        vacated = {self._remove(edge_id) for edge_id in edge_ids if edge_id in self._routes}
+        if vacated:
+            self._set_bounds(self._shrink(vacated))
+
+
+    def _remove(self, edge_id: str) -> tuple[int, int]:
+        """Take a route out of its tile, which keeps its old bounds until _shrink. Returns the tile."""
+        del self._routes[edge_id]
+        del self._rects[edge_id]
+        self._curves.pop(edge_id, None)
+        tile = self._edge_tile.pop(edge_id)
+        del self._tiles[tile][edge_id]
+        self._forget(tile)
+        return tile
+
+
+    def _shrink(self, tiles: set[tuple[int, int]]) -> QRectF:
+        """Bound the tiles again by what is left in them. Returns the bounds of all the tiles."""
+        for tile in tiles:
+            rects = [self._rects[edge_id] for edge_id in self._tiles[tile]]
+            if rects:
+                bounds = rects[0]
+                for rect in rects[1:]:
+                    bounds = bounds.united(rect)
+                self._tile_bounds[tile] = bounds
+            else:
+                del self._tiles[tile]
+                del self._tile_bounds[tile]
+        bounds = QRectF()
+        for rect in self._tile_bounds.values():
+            bounds = bounds.united(rect) if not bounds.isNull() else rect
+        return bounds
+
+
+    def _set_bounds(self, bounds: QRectF):
+        """Tell the scene of a geometry change only when the bounds move, which reindexes the item."""
+        if bounds == self._bounding_rect:
+            self.update()
+            return
+        self.prepareGeometryChange()
+        self._bounding_rect = bounds
+
+
+    def _forget(self, tile: tuple[int, int]):
+        for detail in Detail:
+            self._lines.pop((tile, detail), None)
+
+
+    def _tile_of(self, points: Points) -> tuple[int, int]:
+        (x0, y0), (x1, y1) = points[0], points[-1]
+        return (int((x0 + x1) / 2 // self.tile_size), int((y0 + y1) / 2 // self.tile_size))
+
+
+    def boundingRect(self) -> QRectF:
+        # Cosmetic pens are at most a few pixels wide, which this comfortably covers at any zoom that matters.
+        margin = self._pen.widthF() + 1
+        return self._bounding_rect.adjusted(-margin, -margin, margin, margin)
+
+
+    def visible_tiles(self, rect: QRectF) -> list[tuple[int, int]]:
+        return [tile for tile, bounds in self._tile_bounds.items() if self._tiles[tile] and bounds.intersects(rect)]
+
+
+    def tile_lines(self, tile: tuple[int, int], detail: Detail) -> list[QLineF]:
+        key = (tile, detail)
+        if key not in self._lines:
+            lines = list()
+            for edge_id in self._tiles.get(tile, ()):
+                points, curved = self._routes[edge_id]
+                if detail == Detail.POINT:
+                    lines.append(QLineF(*points[0], *points[-1]))
+                elif not (curved and detail == Detail.FULL):
+                    lines.extend(QLineF(*a, *b) for a, b in zip(points, points[1:]))
+            self._lines[key] = lines
+        return self._lines[key]
+
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtWidgets.QStyleOptionGraphicsItem,
+        widget: Optional[QtWidgets.QWidget] = ...
+    ) -> None:
+        detail = item_detail(self, painter, option)
+        painter.setPen(self._pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        exposed = option.exposedRect
+        # QGraphicsScene.render() exposes the whole item, but clips the painter to the target.
+        if painter.hasClipping():
+            exposed = exposed.intersected(painter.clipBoundingRect())
+        tiles = self.visible_tiles(exposed)
+        if INSTRUMENTS.enabled:
+            INSTRUMENTS.count("painted edge tiles", len(tiles))
+        for tile in tiles:
+            lines = self.tile_lines(tile, detail)
+            if lines:
+                painter.drawLines(lines)
+            if detail == Detail.FULL:
+                for edge_id in self._tiles[tile]:
+                    points, curved = self._routes[edge_id]
+                    if curved:
+                        if edge_id not in self._curves:
+                            self._curves[edge_id] = curve(points)
+                        painter.drawPath(self._curves[edge_id])
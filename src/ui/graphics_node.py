@@ -1,21 +1,60 @@
+import math
+from enum import Enum
 from typing import Optional
 from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtWidgets import (
     QGraphicsItem,
     QGraphicsTextItem
 )
-from PySide6.QtCore import Qt, QRect, QPoint
+from PySide6.QtCore import Qt, QRect, QRectF, QPoint, QPointF
+
+from src.ui.instrumentation import INSTRUMENTS
+from src.ui.level_of_detail import DEFAULT_LEVEL_OF_DETAIL, Detail
 
 DEFAULT_BORDER_COLOR = '#FF536267'
 SELECTED_BORDER_COLOR = '#FFd6fffa'
 DEFAULT_BANNER_COLOR = '#FF536267'
 DEFAULT_BACKGROUND_COLOR = '#E685a3b2'
 
+
+class Cache_Mode(Enum):
+    NONE = 0
+    # Qt caches each node in its own pixmap, re-rendered whenever the view transform changes.
+    DEVICE = 1
+    # All nodes with the same geometry and styling share one pixmap per scale.
+    SHARED = 2
+
+def item_detail(item: QGraphicsItem, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionGraphicsItem) -> Detail:
+    level_of_detail = getattr(item.scene(), 'level_of_detail', DEFAULT_LEVEL_OF_DETAIL)
+    return level_of_detail.detail(option.levelOfDetailFromTransform(painter.worldTransform()))
+
+
+class Title_Item(QGraphicsTextItem):
+    def paint(
+        self, 
+        painter: QtGui.QPainter, 
+        option: QtWidgets.QStyleOptionGraphicsItem, 
+        widget: Optional[QtWidgets.QWidget] = ...
+    ) -> None:
+        # Text is by far the most expensive part of a node, and unreadable when small.
+        if item_detail(self, painter, option) == Detail.FULL:
+            super().paint(painter, option, widget)
+
+
 class Graphics_Node(QGraphicsItem):
-    def __init__(self, title, parent: QtWidgets.QWidget | None = None, position: QPoint = QPoint(0, 0)) -> None:
+    def __init__(
+        self, 
+        title, 
+        parent: QtWidgets.QWidget | None = None, 
+        position: QPoint = QPoint(0, 0), 
+        cache_mode: Cache_Mode = Cache_Mode.NONE
+    ) -> None:
         super().__init__(parent)
 
         self.parent = parent
+        self._paths = None
+        self._rect = None
+        self._bounding_rect = None
         self.position: QPoint = position
 
         self._define_colors()
@@ -23,13 +62,15 @@ class Graphics_Node(QGraphicsItem):
         self._define_title(title)
         self._define_geometry()
         self._define_behaviour_flags()
+        self.set_cache_mode(cache_mode)
 
 
     def _define_geometry(self):
-        self.width = 180
-        self.height = 240
-        self.radius = 5
-        self.banner_height = 25
+        self._width = 180
+        self._height = 240
+        self._radius = 5
+        self._banner_height = 25
+        self._invalidate_geometry()
 
 
     def _define_colors(self):
@@ -46,14 +87,14 @@ class Graphics_Node(QGraphicsItem):
         self._default_border_pen  = QtGui.QPen(self._default_border_color)
         self._selected_border_pen = QtGui.QPen(self._selected_border_color)
 
-        self._default_banner_brush  = QtGui.QBrush(self._default_border_color)
+        self._default_banner_brush  = QtGui.QBrush(self._default_banner_color)
         self._selected_banner_brush = QtGui.QBrush(self._selected_border_color)
 
         self._default_background_brush = QtGui.QBrush(self._default_background_color)
 
 
     def _define_title(self, title):
-        self.title_item = QGraphicsTextItem(self)
+        self.title_item = Title_Item(self)
         self.title_item.setPos(self.position)
         self.title_item.setDefaultTextColor(self._title_color)
         self.title = title
@@ -64,6 +105,87 @@ class Graphics_Node(QGraphicsItem):
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
 
 
+    def set_cache_mode(self, cache_mode: Cache_Mode):
+        self.cache_mode = cache_mode
+        if cache_mode == Cache_Mode.DEVICE:
+            self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        else:
+            self.setCacheMode(QGraphicsItem.CacheMode.NoCache)
+
+
+    @property
+    def position(self) -> QPoint:
+        return self._position
+
+    @position.setter
+    def position(self, value: QPoint):
+        self._position = value
+        if hasattr(self, 'title_item'):
+            self.title_item.setPos(value)
+        self._invalidate_geometry()
+
+
+    @property
+    def scene_position(self) -> QPoint:
+        """The position plus the offset the node has been moved or dragged by with setPos."""
+        return self._position + self.pos().toPoint()
+
+
+    @property
+    def width(self):
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+        self._invalidate_geometry()
+
+
+    @property
+    def height(self):
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        self._height = value
+        self._invalidate_geometry()
+
+
+    @property
+    def radius(self):
+        return self._radius
+
+    @radius.setter
+    def radius(self, value):
+        self._radius = value
+        self._invalidate_geometry()
+
+
+    @property
+    def banner_height(self):
+        return self._banner_height
+
+    @banner_height.setter
+    def banner_height(self, value):
+        self._banner_height = value
+        self._invalidate_geometry()
+
+
+    def _invalidate_geometry(self):
+        self.prepareGeometryChange()
+        self._paths = None
+        self._rect = None
+        self._bounding_rect = None
+
+
+    @property
+    def paths(self) -> tuple[QtGui.QPainterPath, QtGui.QPainterPath, QtGui.QPainterPath]:
+        """The (background, title banner, border) paths, built on first use after a geometry change."""
+        if self._paths is None:
+            self._paths = (self._background_path(), self._title_banner_path(), self._border_path())
+        return self._paths
+
+
     @property
     def title(self):
         return self._title
@@ -78,8 +200,24 @@ class Graphics_Node(QGraphicsItem):
         self.scene().removeItem(self)
 
 
-    def boundingRect(self) -> QRect:
-        return QRect(self.position.x(), self.position.y(), self.width, self.height)
+    @property
+    def rect(self) -> QRect:
+        if self._rect is None:
+            self._rect = QRect(self.position.x(), self.position.y(), self.width, self.height)
+        return self._rect
+
+
+    def _border_margin(self) -> float:
+        """The outer half of the border, and a pixel's worth of antialiasing."""
+        return max(self._default_border_pen.widthF(), self._selected_border_pen.widthF()) / 2 + 0.5
+
+
+    def boundingRect(self) -> QRectF:
+        # Include the outer half of the border, as the views don't adjust for antialiasing.
+        if self._bounding_rect is None:
+            margin = self._border_margin()
+            self._bounding_rect = QRectF(self.rect).adjusted(-margin, -margin, margin, margin)
+        return self._bounding_rect
 
 
     def paint(
@@ -88,12 +226,74 @@ class Graphics_Node(QGraphicsItem):
         option: QtWidgets.QStyleOptionGraphicsItem, 
         widget: Optional[QtWidgets.QWidget] = ...
     ) -> None: 
+        if INSTRUMENTS.enabled:
+            INSTRUMENTS.count("painted Graphics_Node")
+        match item_detail(self, painter, option):
+            case Detail.FULL if self.cache_mode == Cache_Mode.SHARED:
+                self._paint_shared_pixmap(painter, option)
+            case Detail.FULL:
+                self._paint_body(painter)
+            case Detail.BOX:
+                self._paint_box(painter)
+            case Detail.POINT:
+                self._paint_point(painter)
+
+
+    def _paint_body(self, painter):
         self._paint_background(painter)
         self._paint_title_banner(painter)
         self._paint_border(painter)
 
 
-    def _paint_title_banner(self, painter):
+    def _paint_shared_pixmap(self, painter, option):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        # The key holds what is actually painted: the brushes, and the border pen for the selection state.
+        border_pen = self._default_border_pen if not self.isSelected() else self._selected_border_pen
+        key = (
+            f"Graphics_Node:{self.width}:{self.height}:{self.radius}:{self.banner_height}:"
+            f"{self._default_background_brush.color().rgba()}:{self._default_banner_brush.color().rgba()}:"
+            f"{border_pen.color().rgba()}:{border_pen.widthF()}:{lod:.3f}"
+        )
+        # Padded by whole pixels, so the outer half of the border isn't clipped and the body stays aligned.
+        padding = math.ceil(self._border_margin() * lod)
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(
+                math.ceil(self.width * lod) + 2 * padding + 1, math.ceil(self.height * lod) + 2 * padding + 1
+            )
+            pixmap.fill(Qt.GlobalColor.transparent)
+            pixmap_painter = QtGui.QPainter(pixmap)
+            pixmap_painter.setRenderHints(painter.renderHints())
+            pixmap_painter.translate(padding, padding)
+            pixmap_painter.scale(lod, lod)
+            pixmap_painter.translate(-self.position.x(), -self.position.y())
+            self._paint_body(pixmap_painter)
+            pixmap_painter.end()
+            QtGui.QPixmapCache.insert(key, pixmap)
+        # Blit in device coordinates, so that Qt takes the untransformed pixmap fast path.
+        origin = painter.worldTransform().map(QPointF(self.position))
+        painter.save()
+        painter.resetTransform()
+        painter.drawPixmap(round(origin.x()) - padding, round(origin.y()) - padding, pixmap)
+        painter.restore()
+
+
+    def _paint_box(self, painter):
+        painter.fillRect(self.rect, self._default_background_brush)
+        painter.fillRect(
+            QRect(self.position.x(), self.position.y(), self.width, self.banner_height), 
+            self._default_banner_brush if not self.isSelected() else self._selected_banner_brush
+        )
+
+
+    def _paint_point(self, painter):
+        painter.fillRect(
+            self.rect, 
+            self._default_banner_brush if not self.isSelected() else self._selected_banner_brush
+        )
+
+
+    def _title_banner_path(self):
         path_title = QtGui.QPainterPath()
         path_title.setFillRule(Qt.FillRule.WindingFill)
         path_title.addRoundedRect(
@@ -102,33 +302,44 @@ class Graphics_Node(QGraphicsItem):
         y_offset = self.position.y() + self.banner_height - self.radius
         path_title.addRect(self.position.x(), y_offset, self.radius, self.radius)
         path_title.addRect(self.position.x() + self.width - self.radius, y_offset, self.radius, self.radius)
+        return path_title
 
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(self._default_banner_brush)
-        painter.drawPath(path_title)
 
-
-    def _paint_background(self, painter):
-        path_title = QtGui.QPainterPath()
-        path_title.setFillRule(Qt.FillRule.WindingFill)
-        path_title.addRoundedRect(
+    def _background_path(self):
+        path_background = QtGui.QPainterPath()
+        path_background.setFillRule(Qt.FillRule.WindingFill)
+        path_background.addRoundedRect(
             self.position.x(), self.position.y() + self.banner_height - self.radius, 
             self.width, self.height - self.banner_height + self.radius,
             self.radius, self.radius
         )
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(self._default_background_brush)
-        painter.drawPath(path_title)
+        return path_background
 
 
-    def _paint_border(self, painter):
+    def _border_path(self):
         path_outline = QtGui.QPainterPath()
         path_outline.addRoundedRect(
             self.position.x(), self.position.y(), self.width, self.height, self.radius, self.radius
         )
+        return path_outline
+
+
+    def _paint_title_banner(self, painter):
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._default_banner_brush)
+        painter.drawPath(self.paths[1])
+
+
+    def _paint_background(self, painter):
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._default_background_brush)
+        painter.drawPath(self.paths[0])
+
+
+    def _paint_border(self, painter):
         painter.setPen(self._default_border_pen if not self.isSelected() else self._selected_border_pen)
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawPath(path_outline)
+        painter.drawPath(self.paths[2])
 
 
     def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import math
+import time
+from collections import deque
+
+import numpy as np
 from PySide6.QtCore import (
     Qt,
+    QPoint,
     QRect,
     QRectF,
-    QLine
+    QPointF,
+    QLine,
+    QTimer
 )
 from PySide6.QtWidgets import (
     QGraphicsScene,
@@ -15,15 +22,37 @@ from PySide6.QtGui import (
     QColor,
     QPainter,
     QPen,
+    QPixmap,
     QMouseEvent,
     QKeyEvent
 )
 
+from src.model.history import History
+from src.model.journal import Changes
+from src.model.scene import Scene
+from src.ui.graphics_edges import Graphics_Edges, edge_points
 from src.ui.graphics_node import Graphics_Node
+from src.ui.graphics_view import Graphics_View
+from src.ui.instrumentation import INSTRUMENTS, Hud, instrumented
+from src.ui.level_of_detail import Level_Of_Detail
+from src.ui.overlay import (
+    Origin_Marker,
+    Overlay,
+    Ruler
+)
+from src.ui.tile_cache import Tile_Cache
+from src.ui.virtualizer import Scene_Virtualizer
 from src.ui.constants import (
+    BULK_MOVE_FRACTION,
+    EDGE_Z_VALUE,
     GRID_SIZE,
+    GRID_TILE_MAX_SIZE,
+    GRID_TILE_MIN_SIZE,
     KEY_MAPPING, 
-    LARGE_GRID
+    LARGE_GRID,
+    REMOVAL_BATCH,
+    STANDARD_KEY_MAPPING,
+    TRACE_FILE
 )
 
 
@@ -35,17 +64,42 @@ class Graphics_Scene(QGraphicsScene):
         self.grid_size = GRID_SIZE 
         self.large_grid = LARGE_GRID 
         self.super_large_grid = LARGE_GRID * LARGE_GRID
+        # Pre-rendered grid tiles keyed by (grid_size, view scale).
+        self._grid_tiles = dict()
 
         self.define_colors()
 
         self.define_pens()
 
+        self.define_overlay()
+
+        self.level_of_detail = Level_Of_Detail()
+        # Set by set_model, when the items are virtualized from a model Scene.
+        self.virtualizer = None
+        self.tile_cache = None
+        # The model's connections, drawn by a single item, and the connections at each node.
+        self.graphics_edges = None
+        self._node_edges = dict()
+        self._edge_count = 0
+        # Edits to the model, which can be undone.
+        self.history = None
+        # Deleted items, hidden and waiting to be taken out of the scene.
+        self._removed_items = deque()
+        # While set, pre-rendered tiles are drawn in place of the virtualized items.
+        self.compositing = False
+
         self.scene_width, self.scene_height = 64_000, 64_000
         self.setSceneRect(-self.scene_width//2, -self.scene_height//2, self.scene_width, self.scene_height)
         self.setBackgroundBrush(self._color_background)
 
         self.functions = {
-            'delete_selected': self.delete_selected,'default': super().keyPressEvent
+            'delete_selected': self.delete_selected,
+            'undo': self.undo,
+            'redo': self.redo,
+            'toggle_hud': self.toggle_hud,
+            'toggle_ruler': self.toggle_ruler,
+            'export_trace': self.export_trace,
+            'default': super().keyPressEvent
         }
 
 
@@ -57,6 +111,13 @@ class Graphics_Scene(QGraphicsScene):
         self._pen_light.setWidthF(self._light_line_width)
         self._pen_dark.setWidthF(self._dark_line_width)
         self._pen_thick_dark.setWidthF(self._dark_thick_line_width)
+        self._grid_tiles.clear()
+        self.invalidate(self.sceneRect(), QGraphicsScene.SceneLayer.BackgroundLayer)
+
+
+    def set_magnification(self, level: int):
+        if level != self.level_of_detail.magnification:
+            self.level_of_detail.set_magnification(level)
 
 
     def define_pens(self):
@@ -71,6 +132,14 @@ class Graphics_Scene(QGraphicsScene):
         self._pen_thick_dark.setWidthF(self._dark_thick_line_width)
 
 
+    def define_overlay(self):
+        self.overlay = Overlay()
+        self.origin_marker = self.overlay.add_decoration(Origin_Marker())
+        self.ruler = self.overlay.add_decoration(Ruler())
+        self.ruler.visible = False
+        self.hud = self.overlay.add_decoration(Hud(INSTRUMENTS))
+
+
     def define_colors(self):
         self._color_background = QColor('#393939')
         self._color_light = QColor('#292929')
@@ -78,8 +147,61 @@ class Graphics_Scene(QGraphicsScene):
 
 
     def drawBackground(self, painter: QPainter, rect: QRectF | QRect) -> None:
+        if INSTRUMENTS.enabled:
+            start = time.perf_counter_ns()
+            self._draw_background(painter, rect)
+            INSTRUMENTS.span("drawBackground", "paint", start)
+        else:
+            self._draw_background(painter, rect)
+
+
+    def _draw_background(self, painter: QPainter, rect: QRectF | QRect):
         super().drawBackground(painter, rect)
-        
+
+        grid_tile = self.grid_tile(painter.worldTransform().m11())
+        if grid_tile is not None:
+            self.draw_grid_tiles(painter, rect, *grid_tile)
+        else:
+            self.draw_grid_lines(painter, rect)
+
+        if self.compositing:
+            self.tile_cache.paint(painter, QRectF(rect), painter.worldTransform().m11(), self.level_of_detail.magnification)
+
+
+    def drawForeground(self, painter: QPainter, rect: QRectF | QRect) -> None:
+        super().drawForeground(painter, rect)
+        if self.hud.visible:
+            INSTRUMENTS.set_value("items", len(self.items()))
+            if self.virtualizer is not None:
+                INSTRUMENTS.set_value("model nodes", len(self.virtualizer.scene.nodes))
+        self.overlay.paint(painter, QRectF(rect))
+
+
+    def toggle_hud(self, event: QKeyEvent | None = None):
+        """Show the timings and counts of each frame. Instrumentation is only switched on while they show."""
+        self.hud.visible = not self.hud.visible
+        INSTRUMENTS.set_enabled(self.hud.visible)
+        self.overlay_changed()
+
+
+    def toggle_ruler(self, event: QKeyEvent | None = None):
+        self.ruler.visible = not self.ruler.visible
+        self.overlay_changed()
+
+
+    def overlay_changed(self):
+        """Repaint the decorations after one is shown or hidden, and let the views follow the fixed ones."""
+        self.invalidate(self.sceneRect(), QGraphicsScene.SceneLayer.ForegroundLayer)
+        for view in self.views():
+            if isinstance(view, Graphics_View):
+                view.follow_overlay()
+
+
+    def export_trace(self, event: QKeyEvent | None = None, path: str = TRACE_FILE):
+        INSTRUMENTS.export_trace(path)
+
+
+    def draw_grid_lines(self, painter: QPainter, rect: QRectF | QRect):
         light_lines, dark_lines, very_dark_lines = self.define_grid_lines(rect)
 
         painter.setPen(self._pen_light)
@@ -91,7 +213,59 @@ class Graphics_Scene(QGraphicsScene):
         painter.setPen(self._pen_thick_dark)
         painter.drawLines(very_dark_lines)        
 
-        self.addEllipse(QRect(-10, -10, 20, 20), QColor("Yellow"))
+
+    def draw_grid_tiles(self, painter: QPainter, rect: QRectF | QRect, tile: QPixmap, period: int):
+        # Blit the tiles in device coordinates, so that Qt takes the untransformed pixmap fast path.
+        transform = painter.worldTransform()
+        first_left = int(math.floor(rect.left() / period)) * period
+        first_top = int(math.floor(rect.top() / period)) * period
+        right = int(math.ceil(rect.right()))
+        bottom = int(math.ceil(rect.bottom()))
+        # Each tile spans from its own rounded edges to the next one's, so neighbours neither gap nor overlap.
+        # The tile is rendered ceil(period * scale) wide, which is never less than that span.
+        columns = [round(transform.map(QPointF(x, 0)).x()) for x in range(first_left, right + period, period)]
+        rows = [round(transform.map(QPointF(0, y)).y()) for y in range(first_top, bottom + period, period)]
+
+        painter.save()
+        painter.resetTransform()
+        for left, next_left in zip(columns, columns[1:]):
+            for top, next_top in zip(rows, rows[1:]):
+                painter.drawPixmap(left, top, tile, 0, 0, next_left - left, next_top - top)
+        painter.restore()
+
+
+    def grid_tile(self, scale: float) -> tuple[QPixmap, int] | None:
+        """
+        Return a pixmap of the grid pre-rendered at `scale`, along with the scene distance it covers.
+        The tiles are cached until `rescale_grid` changes the spacing. Returns None when zoomed in far 
+        enough that drawing the few visible lines directly is cheaper than a tile.
+        """
+        key = (self.grid_size, round(scale, 6))
+        if key not in self._grid_tiles:
+            self._grid_tiles[key] = self._render_grid_tile(scale)
+        return self._grid_tiles[key]
+
+
+    def _render_grid_tile(self, scale: float) -> tuple[QPixmap, int] | None:
+        period = int(self.grid_size) * self.super_large_grid
+        if period * scale > GRID_TILE_MAX_SIZE or period * scale <= 0:
+            return None
+        # Very small tiles are repeated too often, so group several periods into one tile.
+        period *= math.ceil(GRID_TILE_MIN_SIZE / (period * scale))
+        tile_size = math.ceil(period * scale)
+
+        tile = QPixmap(tile_size, tile_size)
+        tile.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(tile)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.scale(scale, scale)
+        # Overlap the tile by one grid square so the lines on its edges are not cut in half.
+        margin = int(self.grid_size)
+        self.draw_grid_lines(painter, QRectF(-margin, -margin, period + 2 * margin, period + 2 * margin))
+        painter.end()
+
+        return tile, period
 
 
     def define_grid_lines(self, rect: QRectF | QRect):
@@ -115,6 +289,8 @@ class Graphics_Scene(QGraphicsScene):
         light_lines = h_light_lines + v_light_lines
         dark_lines = h_dark_lines + v_dark_lines
         very_dark_lines = h_very_dark_lines + v_very_dark_lines
+        if INSTRUMENTS.enabled:
+            INSTRUMENTS.count("grid lines", len(light_lines) + len(dark_lines) + len(very_dark_lines))
         
         return light_lines, dark_lines, very_dark_lines
 
@@ -152,15 +328,221 @@ class Graphics_Scene(QGraphicsScene):
 
     def add_node(self, node: Graphics_Node):
         self.addItem(node)
-    
+
+
+    def set_model(self, scene: Scene | None):
+        """Show a model Scene through a pool of items covering the visible rect, rather than an item per node."""
+        self.end_compositing()
+        if self.virtualizer is not None:
+            for item in list(self.virtualizer.items.values()) + self.virtualizer.pool:
+                self.removeItem(item)
+            self.tile_cache.tiles_changed.disconnect(self._tiles_changed)
+            self.virtualizer.scene.journal.unsubscribe(self.virtualizer.scene_changed)
+            self.virtualizer.scene.journal.unsubscribe(self.tile_cache.scene_changed)
+            self.virtualizer.scene.journal.unsubscribe(self._edges_changed)
+            self.removeItem(self.graphics_edges)
+        self.virtualizer = Scene_Virtualizer(self, scene) if scene is not None else None
+        self.tile_cache = Tile_Cache(scene, parent=self) if scene is not None else None
+        self.history = History(scene) if scene is not None else None
+        self.graphics_edges = Graphics_Edges() if scene is not None else None
+        if scene is not None:
+            self.graphics_edges.setZValue(EDGE_Z_VALUE)
+            self.addItem(self.graphics_edges)
+            self.refresh_edges()
+            self.tile_cache.tiles_changed.connect(self._tiles_changed)
+            # Follow the model's edits, applied once per pass of the event loop.
+            if scene.journal.schedule is None:
+                scene.journal.schedule = lambda flush: QTimer.singleShot(0, flush)
+            scene.journal.subscribe(self.virtualizer.scene_changed)
+            scene.journal.subscribe(self.tile_cache.scene_changed)
+            scene.journal.subscribe(self._edges_changed)
+
+
+    def refresh_edges(self):
+        """Draw every connection of the model again, such as once its Router has routed them."""
+        model = self.virtualizer.scene
+        self._node_edges = dict()
+        for edge in model.edges:
+            for node_id in {edge.start.get('node'), edge.end.get('node')}:
+                self._node_edges.setdefault(node_id, list()).append(edge)
+        self._edge_count = len(model.edges)
+        self.graphics_edges.clear()
+        self._route_edges(model.edges)
+
+
+    def _route_edges(self, edges):
+        model = self.virtualizer.scene
+        routes, missing = list(), list()
+        for edge in edges:
+            points = edge_points(model, edge)
+            if points is None:
+                missing.append(edge.id)
+            else:
+                routes.append((edge.id, points, edge.type == 'bezier'))
+        self.graphics_edges.remove_routes(missing)
+        self.graphics_edges.set_routes(routes)
+
+
+    def _edges_changed(self, changes: Changes):
+        """Subscribed to the model's journal. The connections of nodes which moved, came or went follow them."""
+        if len(self.virtualizer.scene.edges) != self._edge_count:
+            # Connections come and go with their nodes, and with groups loaded in the background.
+            self.refresh_edges()
+            return
+        edges = dict.fromkeys(
+            edge for node_id in changes.changed | changes.removed.keys() for edge in self._node_edges.get(node_id, ())
+        )
+        if edges:
+            self._route_edges(edges)
+
+
+    def update_visible_items(self, rect: QRectF, force: bool = False):
+        if self.virtualizer is not None:
+            self.virtualizer.update(rect, self.level_of_detail.magnification, force)
+
+
+    def begin_compositing(self):
+        """Draw pre-rendered tiles instead of the items, while the view pans or zooms."""
+        if self.tile_cache is not None and not self.compositing:
+            self.compositing = True
+            self.virtualizer.set_visible(False)
+            self.invalidate(self.sceneRect(), QGraphicsScene.SceneLayer.BackgroundLayer)
+
+
+    def end_compositing(self):
+        """Swap the live items back in."""
+        if self.compositing:
+            self.compositing = False
+            self.virtualizer.set_visible(True)
+            self.invalidate(self.sceneRect(), QGraphicsScene.SceneLayer.BackgroundLayer)
+
+
+    def prefetch_tiles(self, rect: QRectF, scale: float, motion: tuple[float, float] = (0, 0), zoom: int = 0):
+        if self.tile_cache is not None:
+            self.tile_cache.prefetch(rect, scale, self.level_of_detail.magnification, motion, zoom)
+
+
+    def _tiles_changed(self, rect: QRectF):
+        if self.compositing:
+            self.invalidate(rect, QGraphicsScene.SceneLayer.BackgroundLayer)
+
+
+    def set_node_positions(self, nodes: list[Graphics_Node], positions):
+        """
+        Move many nodes at once, e.g. from a layout's (N, 2) array of positions. Nodes are moved with setPos,
+        which keeps their painter paths, like a drag. When many of the scene's items move, the index is
+        switched off while they do and rebuilt once, rather than being updated for every node.
+        """
+        positions = np.rint(np.asarray(positions, dtype=np.float64).reshape(-1, 2)).tolist()
+        index_method = self.itemIndexMethod()
+        rebuild = (
+            index_method != QGraphicsScene.ItemIndexMethod.NoIndex and
+            len(nodes) > BULK_MOVE_FRACTION * len(self.items())
+        )
+        if rebuild:
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        for node, (x, y) in zip(nodes, positions):
+            position = node.position
+            node.setPos(x - position.x(), y - position.y())
+        if rebuild:
+            self.setItemIndexMethod(index_method)
+
 
     def delete_selected(self, event: QKeyEvent):
-        for item in self.selectedItems():
-            item.remove()
+        self.remove_items(self.selectedItems())
         super().keyPressEvent(event)
-    
 
 
+    def select_items(self, items: list, selected: bool = True):
+        """Select or deselect many items, emitting selectionChanged once rather than for each item."""
+        blocked = self.blockSignals(True)
+        try:
+            for item in items:
+                item.setSelected(selected)
+        finally:
+            self.blockSignals(blocked)
+        self.selectionChanged.emit()
+
+
+    def remove_items(self, items: list):
+        """
+        Remove many items at once. Items showing model nodes are removed from the model instead, along with
+        the nodes' edges, as one edit which can be undone, and the virtualizer recycles their items.
+
+        Taking an item out of a QGraphicsScene costs time in proportion to the number of items left, whatever
+        the index method, so deleting thousands at once would freeze the view. The other items are hidden
+        straight away, which also deselects them, and then removed REMOVAL_BATCH at a time while the event
+        loop runs.
+        """
+        node_ids, removed = list(), list()
+        for item in items:
+            node_id = getattr(item, 'node_id', None)
+            if node_id is not None and self.history is not None:
+                node_ids.append(node_id)
+            else:
+                removed.append(item)
+        if removed:
+            blocked = self.blockSignals(True)
+            try:
+                for item in removed:
+                    item.hide()
+            finally:
+                self.blockSignals(blocked)
+            self.selectionChanged.emit()
+            if not self._removed_items:
+                QTimer.singleShot(0, self._remove_hidden_items)
+            self._removed_items.extend(removed)
+        if node_ids:
+            self.history.remove_nodes(node_ids)
+
+
+    def _remove_hidden_items(self):
+        self.flush_removed_items(REMOVAL_BATCH)
+        if self._removed_items:
+            QTimer.singleShot(0, self._remove_hidden_items)
+
+
+    def flush_removed_items(self, count: int | None = None):
+        """Take `count` of the deleted items out of the scene, or all of them."""
+        removed = self._removed_items
+        for _ in range(len(removed) if count is None else min(count, len(removed))):
+            item = removed.popleft()
+            if item.scene() is self:
+                self.removeItem(item)
+
+
+    def undo(self, event: QKeyEvent | None = None):
+        if self.history is not None:
+            self.history.undo()
+
+
+    def redo(self, event: QKeyEvent | None = None):
+        if self.history is not None:
+            self.history.redo()
+
+
+    def new_node_id(self) -> str:
+        count = len(self.history.scene.nodes)
+        while f"/new/{count}" in self.history.scene.nodes:
+            count += 1
+        return f"/new/{count}"
+
+
+    def commit_drag(self):
+        """Write the items dragged since the last drag back to the model, as one edit which can be undone."""
+        if self.history is None:
+            return
+        node_ids, positions = list(), list()
+        for node_id, item in self.virtualizer.items.items():
+            if not item.pos().isNull():
+                position = item.scene_position
+                node_ids.append(node_id)
+                positions.append((position.x(), position.y()))
+        if node_ids:
+            self.history.move_nodes(node_ids, positions)
+
+
+    @instrumented("Graphics_Scene.mouseMoveEvent")
     def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent) -> None:
         self.parent()._parent.set_status_bar_text(
             f"({int(event.scenePos().x())}, "
@@ -169,6 +551,7 @@ class Graphics_Scene(QGraphicsScene):
         return super().mouseMoveEvent(event)
 
 
+    @instrumented("Graphics_Scene.mousePressEvent")
     def mousePressEvent(self, event: QMouseEvent) -> None:
         match event.button():
             case Qt.MouseButton.MiddleButton:
@@ -181,6 +564,7 @@ class Graphics_Scene(QGraphicsScene):
                 super().mousePressEvent(event)
 
 
+    @instrumented("Graphics_Scene.mouseReleaseEvent")
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         match event.button():
             case Qt.MouseButton.MiddleButton:
@@ -207,9 +591,15 @@ class Graphics_Scene(QGraphicsScene):
 
     def left_MouseButtonRelease(self, event: QMouseEvent) -> None:
         super().mouseReleaseEvent(event)
+        self.commit_drag()
 
 
     def right_MouseButtonPress(self, event: QMouseEvent) -> None:
+        if self.history is not None:
+            position = event.scenePos()
+            self.history.add_node(self.new_node_id(), "New Node Title", x=position.x(), y=position.y())
+            super().mousePressEvent(event)
+            return
         new_node = Graphics_Node(
             title="New Node Title", 
             parent=None, 
@@ -224,8 +614,12 @@ class Graphics_Scene(QGraphicsScene):
         super().mouseReleaseEvent(event)
 
     
+    @instrumented("Graphics_Scene.keyPressEvent")
     def keyPressEvent(self, event: QKeyEvent) -> None:
         _function_name = KEY_MAPPING.get(event.key(), 'default')
+        for standard_key, function_name in STANDARD_KEY_MAPPING.items():
+            if event.matches(standard_key):
+                _function_name = function_name
         _function = self.functions.get(_function_name, super().keyPressEvent)
         _function(event)
 
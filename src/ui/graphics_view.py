@@ -1,4 +1,5 @@
 import math
+import time
 
 from PySide6.QtWidgets import (
     QWidget, 
@@ -7,39 +8,151 @@ from PySide6.QtWidgets import (
 
 from PySide6.QtGui import (
     QPainter,
+    QPaintEvent,
     QMouseEvent,
+    QResizeEvent,
     QWheelEvent
 )
 from PySide6.QtCore import (
     Qt,
-    QEvent
+    QEvent,
+    QRectF,
+    QTimer,
+    Signal
 )
 
-from src.ui.constants import LARGE_GRID
+from src.ui.constants import LARGE_GRID, ZOOM_FACTOR
 from src.ui.graphics_node import Graphics_Node
+from src.ui.instrumentation import INSTRUMENTS, instrumented
+from src.ui.level_of_detail import magnification_from_zoom
+
+DEFAULT_UPDATE_MODE = QGraphicsView.ViewportUpdateMode.SmartViewportUpdate
+DEFAULT_RENDER_HINTS = QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform
+# Render hints used while panning or zooming, restored once the view has been idle for INTERACTION_IDLE_MS.
+INTERACTION_RENDER_HINTS = QPainter.RenderHint(0)
+INTERACTION_IDLE_MS = 150
+
 
 class Graphics_View(QGraphicsView):
-    def __init__(self, parent: QWidget | None):
+    # Emitted with the new level whenever zooming crosses into another magnification.
+    magnification_changed = Signal(int)
+
+    def __init__(
+        self, 
+        parent: QWidget | None, 
+        update_mode: QGraphicsView.ViewportUpdateMode = DEFAULT_UPDATE_MODE
+    ):
         super().__init__(parent=parent)
 
         self._parent = parent
 
-        self.zoom_factor = 1.25
+        self.zoom_factor = ZOOM_FACTOR
         self.zoom_level = 0
         self.zoom_step = 1
         self.scale_factor = 1
         self._scale = (1, 1)
+        self.update_mode = update_mode
 
         self._define_Behaviour_flags()
+        self._define_interaction_timer()
 
         self._parent.set_status_bar_text(f"{self.pos()}")
 
     def _define_Behaviour_flags(self):
-        self.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+        self.setRenderHints(DEFAULT_RENDER_HINTS)
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)   
-        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
-    
+        self.setViewportUpdateMode(self.update_mode)
+        # The background only depends on the transform, so let the view scroll a cached copy when panning.
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+        # Every item sets its own pens and brushes, and includes its pen width in its bounding rect.
+        self.setOptimizationFlags(
+            QGraphicsView.OptimizationFlag.DontSavePainterState | 
+            QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing
+        )
+
+
+    def _define_interaction_timer(self):
+        self._interaction_timer = QTimer(self)
+        self._interaction_timer.setSingleShot(True)
+        self._interaction_timer.setInterval(INTERACTION_IDLE_MS)
+        self._interaction_timer.timeout.connect(self.end_interaction)
+
+
+    def set_update_mode(self, update_mode: QGraphicsView.ViewportUpdateMode):
+        self.update_mode = update_mode
+        self.follow_overlay()
+
+
+    def follow_overlay(self):
+        """Repaint whole frames while the scene shows a decoration fixed to the device, such as the HUD."""
+        scene = self._graphics_scene()
+        if scene is not None and scene.overlay.fixed_visible():
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        else:
+            self.setViewportUpdateMode(self.update_mode)
+
+
+    def _graphics_scene(self):
+        """The scene, if it is a Graphics_Scene, which the compositing, tiles and grid belong to."""
+        # Imported here, as graphics_scene imports this module.
+        from src.ui.graphics_scene import Graphics_Scene
+
+        scene = self.scene()
+        return scene if isinstance(scene, Graphics_Scene) else None
+
+
+    def begin_interaction(self):
+        """Drop to the cheaper render hints while panning or zooming, until the view goes idle."""
+        if not self._interaction_timer.isActive():
+            self.setRenderHints(INTERACTION_RENDER_HINTS)
+            scene = self._graphics_scene()
+            if scene is not None:
+                scene.begin_compositing()
+        self._interaction_timer.start()
 
+
+    def end_interaction(self):
+        self._interaction_timer.stop()
+        scene = self._graphics_scene()
+        if scene is not None:
+            scene.end_compositing()
+        if self.renderHints() != DEFAULT_RENDER_HINTS:
+            self.setRenderHints(DEFAULT_RENDER_HINTS)
+            self.viewport().update()
+
+
+    def update_visible_items(self, force: bool = False):
+        """Let a virtualized scene bring its items up to date with what the view shows."""
+        scene = self._graphics_scene()
+        if scene is not None:
+            scene.update_visible_items(self.visible_rect(), force)
+
+
+    def visible_rect(self) -> QRectF:
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        if not INSTRUMENTS.enabled:
+            return super().paintEvent(event)
+        start = time.perf_counter_ns()
+        super().paintEvent(event)
+        INSTRUMENTS.span("frame", "paint", start)
+        INSTRUMENTS.end_frame()
+
+
+    @instrumented("Graphics_View.scrollContentsBy")
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        super().scrollContentsBy(dx, dy)
+        self.update_visible_items()
+
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self.update_visible_items()
+
+
+    @instrumented("Graphics_View.mousePressEvent")
     def mousePressEvent(self, event: QMouseEvent) -> None:
         match event.button():
             case Qt.MouseButton.MiddleButton:
@@ -52,6 +165,7 @@ class Graphics_View(QGraphicsView):
                 super().mousePressEvent(event)
 
 
+    @instrumented("Graphics_View.mouseReleaseEvent")
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         match event.button():
             case Qt.MouseButton.MiddleButton:
@@ -64,13 +178,20 @@ class Graphics_View(QGraphicsView):
                 super().mouseReleaseEvent(event)
 
     
+    @instrumented("Graphics_View.mouseMoveEvent")
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
         if self.dragMode() == QGraphicsView.DragMode.ScrollHandDrag:
             dx = float(event.position().x()) - float(self._mouse_anchor.x())
             dy = float(event.position().y()) - float(self._mouse_anchor.y())
             # Scale the translation by the scale to ensure that the view moves appropriately.
+            self.begin_interaction()
             self.translate(dx / (self._scale[0]), dy / (self._scale[1]))
             self._mouse_anchor = event.position()
+            self.update_visible_items()
+            # Content moving right means the view is heading left through the scene.
+            scene = self._graphics_scene()
+            if scene is not None:
+                scene.prefetch_tiles(self.visible_rect(), self._scale[0], motion=(-dx, -dy))
         return super().mouseMoveEvent(event)
 
 
@@ -108,16 +229,32 @@ class Graphics_View(QGraphicsView):
         super().mouseReleaseEvent(event)
 
 
+    @instrumented("Graphics_View.wheelEvent")
     def wheelEvent(self, event: QWheelEvent) -> None:
         zoom_step = math.copysign(1, event.angleDelta().y())
         scale_factor = self.zoom_factor ** zoom_step
+        magnification = self.magnification
+        self.begin_interaction()
         self.scale(scale_factor, scale_factor)
         self._scale = (self.transform().m11(), self.transform().m22())
         self._set_grid_scale(zoom_step)
+        scene = self._graphics_scene()
+        if scene is not None:
+            scene.set_magnification(self.magnification)
+            self.update_visible_items()
+            scene.prefetch_tiles(self.visible_rect(), self._scale[0], zoom=int(zoom_step))
+        if self.magnification != magnification:
+            self.magnification_changed.emit(self.magnification)
+
+
+    @property
+    def magnification(self) -> int:
+        return magnification_from_zoom(self.zoom_level)
 
 
     def _set_grid_scale(self, zoom_step):
         self.zoom_level += zoom_step
-        if self.zoom_level % LARGE_GRID == 0:
-            self.scene().rescale_grid(2**(-(self.zoom_level/LARGE_GRID)))
+        scene = self._graphics_scene()
+        if self.zoom_level % LARGE_GRID == 0 and scene is not None:
+            scene.rescale_grid(2**(-(self.zoom_level/LARGE_GRID)))
                 
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Timings and counters for the hot paths of the view, shown in a HUD and exported as a Chrome trace.
+
+Everything is off until enabled. Call sites test `INSTRUMENTS.enabled` before doing any work, so while
+it is off a hot path pays one attribute lookup and an event handler one extra call. Exported traces load in
+chrome://tracing or ui.perfetto.dev.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import time
+from collections import deque
+
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QColor, QFont, QFontMetricsF, QPainter
+
+from src.ui.overlay import Decoration
+
+# The trace keeps this many of the latest events.
+TRACE_LIMIT = 200_000
+HUD_BACKGROUND_COLOR = '#C0202020'
+HUD_TEXT_COLOR = '#FFE0E0E0'
+HUD_MARGIN = 8
+
+
+class Instrumentation():
+    def __init__(self, limit: int = TRACE_LIMIT) -> None:
+        self.enabled = False
+        # Chrome trace events, in microseconds since the instrumentation was created.
+        self.events = deque(maxlen=limit)
+        # Counts for the frame being painted, and for the last one finished.
+        self.counters = dict()
+        self.frame_counters = dict()
+        # The latest duration in milliseconds, and the latest value, of each span and gauge.
+        self.durations = dict()
+        self.values = dict()
+        self._origin = time.perf_counter_ns()
+
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+
+
+    def clear(self):
+        self.events.clear()
+        self.counters.clear()
+        self.frame_counters.clear()
+        self.durations.clear()
+        self.values.clear()
+
+
+    def span(self, name: str, category: str, start_ns: int, args: dict | None = None):
+        """Record something which ran from `start_ns`, from time.perf_counter_ns, until now."""
+        end_ns = time.perf_counter_ns()
+        self.durations[name] = (end_ns - start_ns) / 1e6
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": 0, "tid": 0,
+            "ts": (start_ns - self._origin) / 1e3, "dur": (end_ns - start_ns) / 1e3
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+
+    def set_value(self, name: str, value: float):
+        self.values[name] = value
+
+
+    def end_frame(self):
+        """Finish the counts of the frame just painted and add them to the trace."""
+        self.frame_counters, self.counters = self.counters, dict()
+        self.events.append({
+            "name": "frame", "ph": "C", "pid": 0, "tid": 0,
+            "ts": (time.perf_counter_ns() - self._origin) / 1e3, "args": {**self.frame_counters, **self.values}
+        })
+
+
+    def trace(self) -> dict:
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+
+    def export_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.trace(), file)
+
+
+INSTRUMENTS = Instrumentation()
+
+
+def instrumented(name: str, category: str = "event"):
+    """Time each call of the decorated function as a span, while the instrumentation is enabled."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not INSTRUMENTS.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                INSTRUMENTS.span(name, category, start)
+        return wrapper
+    return decorate
+
+
+class Hud(Decoration):
+    """The latest timings and counts, drawn in the top left corner of the view."""
+    visible = False
+    fixed = True
+
+    def __init__(self, instruments: Instrumentation = INSTRUMENTS) -> None:
+        self.instruments = instruments
+        self._font = QFont("monospace", 9)
+        self._font.setStyleHint(QFont.StyleHint.Monospace)
+        self._metrics = QFontMetricsF(self._font)
+
+
+    def lines(self) -> list[str]:
+        instruments = self.instruments
+        durations, counters, values = instruments.durations, instruments.frame_counters, instruments.values
+        lines = list()
+        frame = durations.get("frame")
+        if frame is not None:
+            lines.append(f"{'frame':<28} {frame:7.2f} ms {1000 / frame if frame else 0:6.0f} fps")
+        for name, duration in sorted(durations.items()):
+            if name != "frame":
+                lines.append(f"{name:<28} {duration:7.2f} ms")
+        for name, value in sorted({**counters, **values}.items()):
+            lines.append(f"{name:<28} {value:>10,}")
+        return lines
+
+
+    def paint(self, painter: QPainter, rect: QRectF) -> None:
+        lines = self.lines() or ["no frames yet"]
+        # Draw in device pixels, so the HUD stays put whatever the zoom.
+        painter.resetTransform()
+        height = self._metrics.lineSpacing()
+        width = max(self._metrics.horizontalAdvance(line) for line in lines)
+        painter.fillRect(
+            QRectF(HUD_MARGIN, HUD_MARGIN, width + 2 * HUD_MARGIN, height * len(lines) + 2 * HUD_MARGIN),
+            QColor(HUD_BACKGROUND_COLOR)
+        )
+        painter.setFont(self._font)
+        painter.setPen(QColor(HUD_TEXT_COLOR))
+        for index, line in enumerate(lines):
+            painter.drawText(QPointF(2 * HUD_MARGIN, 2 * HUD_MARGIN + self._metrics.ascent() + index * height), line)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from enum import IntEnum
+from PySide6.QtWidgets import QGraphicsItem
+
+from src.ui.constants import (
+    LARGE_GRID,
+    LOD_BOX,
+    LOD_FULL,
+    ZOOM_FACTOR
+)
+
+
+class Detail(IntEnum):
+    POINT = 0
+    BOX = 1
+    FULL = 2
+
+
+def magnification_from_zoom(zoom_level: float) -> int:
+    """The magnification changes once per grid rescale, i.e. every LARGE_GRID zoom steps."""
+    return int(zoom_level // LARGE_GRID)
+
+
+def level_scale(level: int) -> float:
+    """The view's scale when zooming brings it to magnification `level`."""
+    return ZOOM_FACTOR ** (level * LARGE_GRID)
+
+
+class Level_Range():
+    """A set of items, typically the members of a group, which are only shown between two magnifications."""
+    def __init__(self, min_level: int | None = None, max_level: int | None = None) -> None:
+        self.min_level = min_level
+        self.max_level = max_level
+        self.items = list()
+        self.visible = True
+
+
+    def contains(self, level: int) -> bool:
+        return (
+            (self.min_level is None or level >= self.min_level) and 
+            (self.max_level is None or level <= self.max_level)
+        )
+
+
+class Level_Of_Detail():
+    """
+    Decides how much of each item to paint.
+    The on-screen scale of an item selects its Detail, and the magnification hides whole level ranges.
+    """
+    def __init__(self, full_threshold: float = LOD_FULL, box_threshold: float = LOD_BOX) -> None:
+        self.full_threshold = full_threshold
+        self.box_threshold = box_threshold
+        self.magnification = 0
+        self.ranges = list()
+
+
+    def detail(self, lod: float) -> Detail:
+        if lod >= self.full_threshold:
+            return Detail.FULL
+        if lod >= self.box_threshold:
+            return Detail.BOX
+        return Detail.POINT
+
+
+    def add_range(self, items: list[QGraphicsItem], min_level: int | None = None, max_level: int | None = None):
+        level_range = Level_Range(min_level, max_level)
+        level_range.visible = level_range.contains(self.magnification)
+        self.ranges.append(level_range)
+        self.add_to_range(level_range, items)
+        return level_range
+
+
+    def add_to_range(self, level_range: Level_Range, items: list[QGraphicsItem]):
+        level_range.items.extend(items)
+        for item in items:
+            item.setVisible(level_range.visible)
+
+
+    def remove_range(self, level_range: Level_Range):
+        self.ranges.remove(level_range)
+        for item in level_range.items:
+            item.setVisible(True)
+
+
+    def set_magnification(self, level: int):
+        """Show and hide the level ranges. Only the ranges whose visibility changes touch their items."""
+        self.magnification = level
+        for level_range in self.ranges:
+            visible = level_range.contains(level)
+            if visible == level_range.visible:
+                continue
+            level_range.visible = visible
+            for item in level_range.items:
+                item.setVisible(visible)
+
+
+DEFAULT_LEVEL_OF_DETAIL = Level_Of_Detail()
@@ -11,17 +11,22 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import (
     Qt, 
     QRect,
-    QPoint
+    QPoint,
+    QTimer
 )
 from PySide6.QtGui import QColor
 
 
-from ui.graphics_scene import Graphics_Scene
-from ui.graphics_node import Graphics_Node
-from ui.graphics_view import Graphics_View
+from src.ui.graphics_scene import Graphics_Scene
+from src.ui.graphics_node import Graphics_Node
+from src.ui.graphics_view import Graphics_View
+from src.model.group import Group
+from src.model.parallel_loader import Parallel_Scene_Loader
 
 WINDOW_HEIGHT = 768
 WINDOW_WIDTH = 1024
+# How often the window merges group files which have finished loading in the background.
+LOAD_POLL_MS = 50
 
 
 class Main_Window(QMainWindow):
@@ -89,6 +94,42 @@ class Main_Window(QMainWindow):
         self.status_text.setText(text)
 
 
+    def open_scene(self, filepath: str):
+        """
+        Read the super file and load the group files visible at the view's magnification in a worker pool.
+        The window stays responsive and the model fills in as each group arrives. Zooming to another
+        magnification loads the groups which become visible there.
+        """
+        self.loader = Parallel_Scene_Loader(progress=self._report_load_progress)
+        self.scene = self.loader.load(filepath, self.view.magnification)
+        self.graphics_scene.set_model(self.scene)
+
+        self._load_timer = QTimer(self)
+        self._load_timer.timeout.connect(self._merge_loaded_groups)
+        self.view.magnification_changed.connect(self._load_visible_groups)
+        self._load_timer.start(LOAD_POLL_MS)
+        self._merge_loaded_groups()
+
+
+    def _load_visible_groups(self, level: int):
+        if self.loader.load_visible(level) and not self._load_timer.isActive():
+            self._load_timer.start(LOAD_POLL_MS)
+
+
+    def _merge_loaded_groups(self):
+        if self.loader.merge_ready():
+            self.view.update_visible_items(force=True)
+        if self.loader.finished:
+            self._load_timer.stop()
+            self.loader.close()
+            errors = f", {len(self.loader.errors)} failed" if self.loader.errors else ""
+            self.set_status_bar_text(f"Loaded {len(self.scene.nodes)} nodes in {len(self.scene.groups)} groups{errors}")
+
+
+    def _report_load_progress(self, completed: int, submitted: int, group: Group):
+        self.set_status_bar_text(f"Loading groups {completed}/{submitted}: {group.name}")
+
+
     def define_graphics_scene(self):
         self.view = Graphics_View(self)
         self.top_layout.addWidget(self.view)
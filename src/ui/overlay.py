@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from PySide6.QtCore import (
+    Qt,
+    QLineF,
+    QPointF,
+    QRectF
+)
+from PySide6.QtGui import (
+    QColor,
+    QPainter,
+    QPen
+)
+
+ORIGIN_MARKER_COLOR = 'Yellow'
+RULER_COLOR = '#FF8a8a8a'
+GUIDE_COLOR = '#FF3fa7d6'
+
+
+class Decoration(ABC):
+    """A piece of scene furniture which is painted over the items, rather than being an item itself."""
+    visible = True
+    # Drawn at a fixed place on the device rather than in the scene, so a view showing it must repaint
+    # whole frames: partial updates leave it stale, and scrolling would carry it along.
+    fixed = False
+
+    @abstractmethod
+    def paint(self, painter: QPainter, rect: QRectF) -> None:
+        ...
+
+
+class Origin_Marker(Decoration):
+    def __init__(self, radius: float = 10) -> None:
+        self.radius = radius
+        self._rect = QRectF(-radius, -radius, 2 * radius, 2 * radius)
+        self._pen = QPen(QColor(ORIGIN_MARKER_COLOR))
+
+
+    def paint(self, painter: QPainter, rect: QRectF) -> None:
+        if not rect.intersects(self._rect):
+            return
+        painter.setPen(self._pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawEllipse(self._rect)
+
+
+class Ruler(Decoration):
+    """Tick marks along the top and left edges of the visible area, one per `spacing` scene units."""
+    fixed = True
+
+    def __init__(self, spacing: float = 100, tick_length: float = 8) -> None:
+        self.spacing = spacing
+        self.tick_length = tick_length
+        self._pen = QPen(QColor(RULER_COLOR))
+        self._pen.setCosmetic(True)
+
+
+    def paint(self, painter: QPainter, rect: QRectF) -> None:
+        # Use the whole device rather than the exposed rect, so partial updates don't move the ruler.
+        transform, _ = painter.worldTransform().inverted()
+        rect = transform.mapRect(QRectF(painter.viewport()))
+        scale = painter.worldTransform().m11() or 1
+        spacing = self.spacing
+        # Keep the ticks at least a few pixels apart when zoomed out.
+        while spacing * scale < 4 * self.tick_length:
+            spacing *= 2
+        tick = self.tick_length / scale
+
+        ticks = list()
+        x = math.floor(rect.left() / spacing) * spacing
+        while x <= rect.right():
+            ticks.append(QLineF(x, rect.top(), x, rect.top() + tick))
+            x += spacing
+        y = math.floor(rect.top() / spacing) * spacing
+        while y <= rect.bottom():
+            ticks.append(QLineF(rect.left(), y, rect.left() + tick, y))
+            y += spacing
+
+        painter.setPen(self._pen)
+        painter.drawLines(ticks)
+
+
+class Guide(Decoration):
+    """A straight debug guide line between two scene points."""
+    def __init__(self, start: QPointF, end: QPointF, color: str = GUIDE_COLOR) -> None:
+        self.line = QLineF(start, end)
+        self._pen = QPen(QColor(color))
+        self._pen.setCosmetic(True)
+        self._pen.setStyle(Qt.PenStyle.DashLine)
+
+
+    def paint(self, painter: QPainter, rect: QRectF) -> None:
+        painter.setPen(self._pen)
+        painter.drawLine(self.line)
+
+
+class Overlay():
+    """
+    The decoration layer of a Graphics_Scene. 
+    Decorations are created once and painted from drawForeground, so repainting never adds scene items.
+    """
+    def __init__(self) -> None:
+        self.decorations = list()
+
+
+    def add_decoration(self, decoration: Decoration) -> Decoration:
+        self.decorations.append(decoration)
+        return decoration
+
+
+    def remove_decoration(self, decoration: Decoration):
+        self.decorations.remove(decoration)
+
+
+    def fixed_visible(self) -> bool:
+        return any(decoration.visible and decoration.fixed for decoration in self.decorations)
+
+
+    def paint(self, painter: QPainter, rect: QRectF) -> None:
+        for decoration in self.decorations:
+            if decoration.visible:
+                painter.save()
+                decoration.paint(painter, rect)
+                painter.restore()
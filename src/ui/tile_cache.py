@@ -0,0 +1,228 @@
+"""
+Pre-rendered tiles of a model Scene, for compositing while the view pans and zooms, as map viewers do.
+
+Tiles are TILE_PIXELS square images rendered at the power of two scale at or below the view's, its zoom
+band, so a tile is reused across the zooms within a band and drawn at most twice its size. Items can't be
+painted off the GUI thread, so tiles are rendered from the model instead. The GUI thread looks up the
+nodes in a tile with the spatial index, and a QThreadPool worker paints those rects into a QImage.
+
+Finished tiles go into an LRU cache limited to a memory budget. While a tile is missing, its cached parent
+tile from the next band down is drawn stretched in its place.
+"""
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QRectF, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QColor, QImage, QPainter
+
+from src.model.journal import Changes
+from src.model.node import NODE_HEIGHT, NODE_WIDTH
+from src.model.scene import Scene
+from src.ui.constants import LOD_BOX, LOD_FULL, TILE_CACHE_BUDGET, TILE_PIXELS
+from src.ui.graphics_node import DEFAULT_BACKGROUND_COLOR, DEFAULT_BANNER_COLOR, DEFAULT_BORDER_COLOR
+
+BANNER_HEIGHT = 25
+
+# (zoom band, magnification, column, row)
+Tile_Key = tuple[int, int, int, int]
+
+
+def zoom_band(scale: float) -> int:
+    return math.floor(math.log2(scale))
+
+
+class Tile_Signals(QObject):
+    # Emitted from the worker with the task's key and ticket, and delivered to the cache in the GUI thread.
+    finished = Signal(object, object, QImage)
+
+
+class Tile_Task(QRunnable):
+    """Paint the given nodes into one tile. Only plain data crosses into the worker."""
+    def __init__(
+        self, key: Tile_Key, ticket: int, origin: tuple[float, float], scale: float, nodes: list, signals: Tile_Signals
+    ) -> None:
+        super().__init__()
+        self.key = key
+        self.ticket = ticket
+        self.origin = origin
+        self.scale = scale
+        self.nodes = nodes
+        self.signals = signals
+
+
+    def run(self):
+        image = QImage(TILE_PIXELS, TILE_PIXELS, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        painter.scale(self.scale, self.scale)
+        painter.translate(-self.origin[0], -self.origin[1])
+        background, banner = QColor(DEFAULT_BACKGROUND_COLOR), QColor(DEFAULT_BANNER_COLOR)
+        if self.scale >= LOD_BOX:
+            for x, y, title in self.nodes:
+                painter.fillRect(QRectF(x, y, NODE_WIDTH, NODE_HEIGHT), background)
+                painter.fillRect(QRectF(x, y, NODE_WIDTH, BANNER_HEIGHT), banner)
+            if self.scale >= LOD_FULL:
+                painter.setPen(QColor(DEFAULT_BORDER_COLOR))
+                for x, y, _ in self.nodes:
+                    painter.drawRect(QRectF(x, y, NODE_WIDTH, NODE_HEIGHT))
+                painter.setPen(Qt.GlobalColor.white)
+                for x, y, title in self.nodes:
+                    painter.drawText(QRectF(x + 4, y, NODE_WIDTH - 8, BANNER_HEIGHT), Qt.AlignmentFlag.AlignVCenter, title)
+        else:
+            for x, y, _ in self.nodes:
+                painter.fillRect(QRectF(x, y, NODE_WIDTH, NODE_HEIGHT), banner)
+        painter.end()
+        self.signals.finished.emit(self.key, self.ticket, image)
+
+
+class Tile_Cache(QObject):
+    # A scene rect whose tiles have been rendered, or dropped because the model changed under them.
+    tiles_changed = Signal(QRectF)
+
+    def __init__(
+        self,
+        scene: Scene,
+        budget: int = TILE_CACHE_BUDGET,
+        pool: QThreadPool | None = None,
+        parent: QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.scene = scene
+        self.budget = budget
+        self.pool = pool if pool is not None else QThreadPool.globalInstance()
+        self.tiles = OrderedDict()
+        self.size = 0
+        # Tiles being rendered, with the ticket of the task rendering each.
+        self.pending = dict()
+        self._tickets = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._signals = Tile_Signals()
+        self._signals.finished.connect(self._store)
+
+
+    @staticmethod
+    def tile_rect(key: Tile_Key) -> QRectF:
+        band, _, column, row = key
+        size = TILE_PIXELS / 2**band
+        return QRectF(column * size, row * size, size, size)
+
+
+    @staticmethod
+    def keys(rect: QRectF, band: int, level: int) -> list[Tile_Key]:
+        size = TILE_PIXELS / 2**band
+        columns = range(math.floor(rect.left() / size), math.floor(rect.right() / size) + 1)
+        rows = range(math.floor(rect.top() / size), math.floor(rect.bottom() / size) + 1)
+        return [(band, level, column, row) for row in rows for column in columns]
+
+
+    def clear(self):
+        """Forget every tile, e.g. after the model changed. Tiles still rendering are dropped when they arrive."""
+        self.tiles.clear()
+        self.size = 0
+        self.pending.clear()
+
+
+    def request(self, key: Tile_Key):
+        if key in self.tiles or key in self.pending:
+            return
+        self._tickets += 1
+        self.pending[key] = self._tickets
+        band, level = key[:2]
+        rect = self.tile_rect(key)
+        # Take in nodes which start above or left of the tile and reach into it.
+        query = (rect.x() - NODE_WIDTH, rect.y() - NODE_HEIGHT, rect.width() + NODE_WIDTH, rect.height() + NODE_HEIGHT)
+        nodes = self.scene.nodes
+        shapes = [(node.x, node.y, node.title or "") for node in map(nodes.get, self.scene.nodes_in(query, level)) if node is not None]
+        self.pool.start(Tile_Task(key, self._tickets, (rect.x(), rect.y()), 2**band, shapes, self._signals))
+
+
+    def _store(self, key: Tile_Key, ticket: int, image: QImage):
+        # A tile which was invalidated while it rendered is requested again, under a new ticket.
+        if self.pending.get(key) != ticket:
+            return
+        del self.pending[key]
+        self.tiles[key] = image
+        self.size += image.sizeInBytes()
+        while self.size > self.budget and len(self.tiles) > 1:
+            _, evicted = self.tiles.popitem(last=False)
+            self.size -= evicted.sizeInBytes()
+            self.evictions += 1
+        self.tiles_changed.emit(self.tile_rect(key))
+
+
+    def scene_changed(self, changes: Changes):
+        """Drop the tiles under every node which changed, where it was and where it is now."""
+        rects = [rect for rect, _ in changes.removed.values()] + list(changes.moved.values())
+        nodes = self.scene.nodes
+        rects += [nodes[node_id].rect for node_id in changes.changed if node_id in nodes]
+        self.invalidate(rects)
+
+
+    def invalidate(self, rects: list[tuple[float, float, float, float]]):
+        layers = {key[:2] for key in self.tiles} | {key[:2] for key in self.pending}
+        for x, y, width, height in rects:
+            rect = QRectF(x, y, width, height)
+            for band, level in layers:
+                for key in self.keys(rect, band, level):
+                    image = self.tiles.pop(key, None)
+                    if image is not None:
+                        self.size -= image.sizeInBytes()
+                    self.pending.pop(key, None)
+            self.tiles_changed.emit(rect)
+
+
+    def tile(self, key: Tile_Key) -> QImage | None:
+        """A cached tile, counting hits and misses. A miss requests the tile."""
+        image = self.tiles.get(key)
+        if image is None:
+            self.misses += 1
+            self.request(key)
+            return None
+        self.hits += 1
+        self.tiles.move_to_end(key)
+        return image
+
+
+    def paint(self, painter: QPainter, rect: QRectF, scale: float, level: int) -> bool:
+        """Composite the tiles covering `rect`. Returns whether every one of them was ready."""
+        band = zoom_band(scale)
+        complete = True
+        for key in self.keys(rect, band, level):
+            target = self.tile_rect(key)
+            image = self.tile(key)
+            if image is not None:
+                painter.drawImage(target, image)
+                continue
+            complete = False
+            _, _, column, row = key
+            parent = self.tiles.get((band - 1, level, column // 2, row // 2))
+            if parent is not None:
+                half = TILE_PIXELS / 2
+                source = QRectF((column % 2) * half, (row % 2) * half, half, half)
+                painter.drawImage(target, parent, source)
+        return complete
+
+
+    def prefetch(self, rect: QRectF, scale: float, level: int, motion: tuple[float, float] = (0, 0), zoom: int = 0):
+        """
+        Request the tiles a screen ahead in the direction of `motion`, in scene units. When zooming, also
+        those of the next zoom band and magnification in the direction of `zoom`.
+        """
+        band = zoom_band(scale)
+        dx, dy = motion
+        if dx or dy:
+            ahead = rect.translated(math.copysign(rect.width(), dx) if dx else 0, math.copysign(rect.height(), dy) if dy else 0)
+            for key in self.keys(ahead, band, level):
+                self.request(key)
+        if zoom:
+            step = 1 if zoom > 0 else -1
+            # Zooming in shows the middle of the view, at twice the scale.
+            centre = rect.adjusted(rect.width() / 4, rect.height() / 4, -rect.width() / 4, -rect.height() / 4)
+            for key in self.keys(centre if step > 0 else rect, band + step, level):
+                self.request(key)
+            for key in self.keys(rect, band, level + step):
+                self.request(key)
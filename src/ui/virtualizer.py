@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QPoint, QRectF
+from PySide6.QtWidgets import QGraphicsScene
+
+from src.model.journal import Changes
+from src.model.scene import Scene
+from src.ui.constants import VIRTUAL_MARGIN
+from src.ui.graphics_node import Graphics_Node
+
+
+class Scene_Virtualizer():
+    """
+    Shows a model Scene through a fixed set of Graphics_Nodes, the way list views virtualise their rows.
+
+    Only the nodes the model's spatial index finds in the visible rect, at the current magnification, get
+    an item. Items which scroll out of view are hidden and kept in a pool, and reused for the nodes which
+    scroll in, so the number of items depends on the size of the screen rather than of the graph. The query
+    covers VIRTUAL_MARGIN of a screen around the visible rect, so small pans don't touch the items at all.
+    """
+    def __init__(self, graphics_scene: QGraphicsScene, scene: Scene, margin: float = VIRTUAL_MARGIN) -> None:
+        self.graphics_scene = graphics_scene
+        self.scene = scene
+        self.margin = margin
+        # Node id to the item showing it.
+        self.items = dict()
+        self.pool = list()
+        # Cleared while the view composites pre-rendered tiles in place of the items.
+        self.visible = True
+        self._rect = None
+        self._covered = None
+        self._level = None
+
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+    def update(self, rect: QRectF, level: int, force: bool = False):
+        """Show the nodes in `rect` at magnification `level`. Does nothing while `rect` stays in the area covered."""
+        if not force and level == self._level and self._covered is not None and self._covered.contains(rect):
+            return
+        dx, dy = rect.width() * self.margin, rect.height() * self.margin
+        covered = rect.adjusted(-dx, -dy, dx, dy)
+        wanted = set(self.scene.nodes_in((covered.x(), covered.y(), covered.width(), covered.height()), level))
+        for node_id in [node_id for node_id in self.items if node_id not in wanted]:
+            self._release(node_id)
+        for node_id in wanted:
+            if node_id not in self.items:
+                self._acquire(node_id)
+        self._rect, self._covered, self._level = QRectF(rect), covered, level
+
+
+    def refresh(self):
+        """Show the model's current state from scratch, e.g. after a bulk load which wasn't journalled."""
+        if self._rect is not None:
+            for node_id in list(self.items):
+                self._release(node_id)
+            self.update(self._rect, self._level, force=True)
+
+
+    def scene_changed(self, changes: Changes):
+        """Apply the model's edits to the items, touching only the nodes which changed."""
+        for node_id in changes.removed:
+            if node_id in self.items:
+                self._recycle(self.items.pop(node_id))
+        if self._covered is None:
+            return
+        for node_id in changes.changed:
+            node = self.scene.nodes.get(node_id)
+            if node is None:
+                continue
+            group = self.scene.get_group(node.group)
+            shown = (
+                self._covered.intersects(QRectF(*node.rect)) and 
+                (group is None or group.visible_at(self._level))
+            )
+            item = self.items.get(node_id)
+            if shown and item is None:
+                self._acquire(node_id)
+            elif shown:
+                position = QPoint(round(node.x), round(node.y))
+                if item.position != position or not item.pos().isNull():
+                    item.setPos(0, 0)
+                    item.position = position
+                if item.title != node.title:
+                    item.title = node.title
+            elif item is not None:
+                self._recycle(self.items.pop(node_id))
+
+
+    def set_visible(self, visible: bool):
+        self.visible = visible
+        for item in self.items.values():
+            item.setVisible(visible)
+
+
+    def _acquire(self, node_id: str):
+        node = self.scene.nodes[node_id]
+        if self.pool:
+            item = self.pool.pop()
+            item.title = node.title
+            item.position = QPoint(round(node.x), round(node.y))
+            item.setVisible(self.visible)
+        else:
+            item = Graphics_Node(title=node.title, position=QPoint(round(node.x), round(node.y)))
+            item.setVisible(self.visible)
+            self.graphics_scene.addItem(item)
+        item.node_id = node_id
+        self.items[node_id] = item
+
+
+    def _release(self, node_id: str):
+        item = self.items[node_id]
+        # Selected items stay, so the selection survives scrolling away and back.
+        if item.isSelected():
+            return
+        del self.items[node_id]
+        # Items are dragged with setPos, so write any drag back to the model before reusing the item.
+        if not item.pos().isNull():
+            position = item.scene_position
+            self.scene.move_node(node_id, position.x(), position.y())
+        self._recycle(item)
+
+
+    def _recycle(self, item: Graphics_Node):
+        item.setSelected(False)
+        item.setPos(0, 0)
+        item.hide()
+        self.pool.append(item)
@@ -0,0 +1,88 @@
+import unittest
+
+from src.model import conduits
+from src.model import edge
+from src.model import group
+from src.model import history
+from src.model import node
+from src.model import scene
+
+
+def add_group(new_scene, group_id, min_level, parent=None):
+    new_group = group.Group(new_scene, group_id, parent=parent, min_level=min_level)
+    new_scene.add_group(new_group)
+    if parent is not None:
+        parent.groups.append(group_id)
+    new_node = node.Node(new_scene, f"{group_id}/node", group=group_id)
+    new_group.nodes.append(new_node.id)
+    new_scene.add_node(new_node)
+    return new_group
+
+
+def connect(new_scene, edge_id, start, end):
+    new_scene.add_edge(edge.Edge(new_scene, edge_id, {'node': f"{start}/node"}, {'node': f"{end}/node"}))
+
+
+class Set_0_Conduit_Table(unittest.TestCase):
+    def setUp(test):
+        test.scene = scene.Scene()
+        for top in ("/a", "/b"):
+            add_group(test.scene, f"{top}/x", 1, parent=add_group(test.scene, top, 0))
+        for index in range(3):
+            connect(test.scene, f"x-x-{index}", "/a/x", "/b/x")
+        connect(test.scene, "a-b", "/a", "/b")
+        connect(test.scene, "inside-a", "/a/x", "/a")
+        test.table = test.scene.build_conduit_table()
+
+    def assert_matches_rebuild(test, levels=(-1, 0, 1)):
+        rebuilt = conduits.Conduit_Table(test.scene)
+        for level in levels:
+            test.assertEqual(test.table.at(level), rebuilt.at(level))
+
+    def test_0_counts_per_level(test):
+        test.assertEqual(len(test.table), 5)
+        # Zoomed all the way out only the top level groups are drawn, and everything inside them bundles.
+        test.assertEqual(test.table.at(-1), {("/a", "/b"): 4})
+        # The nodes of the top level groups show, so only the connections between their subgroups bundle.
+        test.assertEqual(test.table.at(0), {("/a/x", "/b/x"): 3})
+        test.assertEqual(test.table.count("/a/x", "/b/x", 0), 3)
+        test.assertEqual(test.table.at(1), {})
+
+    def test_1_edits(test):
+        test.table.at(-1), test.table.at(0)
+        connect(test.scene, "b-a", "/b/x", "/a")
+        test.assertEqual(test.table.at(-1), {("/a", "/b"): 4, ("/b", "/a"): 1})
+        test.assertEqual(test.table.count("/b/x", "/a", 0), 0)
+
+        edits = history.History(test.scene)
+        edits.remove_nodes(["/b/x/node"])
+        test.assertEqual(test.table.at(-1), {("/a", "/b"): 1})
+        test.assertEqual(test.table.at(0), {})
+        test.assert_matches_rebuild()
+        edits.undo()
+        test.assertEqual(test.table.at(-1), {("/a", "/b"): 4, ("/b", "/a"): 1})
+        test.assert_matches_rebuild()
+
+    def test_2_connections_to_missing_nodes(test):
+        test.scene.remove_node("/a/x/node")
+        test.assertEqual(test.table.at(-1), {("/a", "/b"): 1})
+        new_node = node.Node(test.scene, "/a/x/node", group="/a/x")
+        test.scene.add_node(new_node)
+        test.assertEqual(test.table.at(-1), {("/a", "/b"): 4})
+
+        test.scene.remove_nodes(["/a/x/node", "/b/x/node"])
+        test.scene.add_nodes(["/a/x/node", "/b/x/node"], groups=["/a/x", "/b/x"])
+        test.assertEqual(test.table.at(-1), {("/a", "/b"): 4})
+        test.assert_matches_rebuild()
+
+    def test_3_levels_change(test):
+        test.table.at(0)
+        test.scene.get_group("/b").min_level = 1
+        test.scene.index_group(test.scene.get_group("/b"))
+        # /b no longer shows its members at 0, so the connections into them bundle at /b.
+        test.assertEqual(test.table.at(0), {("/a/x", "/b"): 3})
+        test.assert_matches_rebuild()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from src.model import force_layout
+from src.model import layout
+
+
+def overlaps(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def link_length(offsets, links):
+    return sum(abs(offsets[a][0] - offsets[b][0]) + abs(offsets[a][1] - offsets[b][1]) for a, b in links)
+
+
+class Set_0_Force_Layout(unittest.TestCase):
+    def check(test, count):
+        rng = random.Random(count)
+        sizes = [(rng.choice((180, 300)), rng.choice((240, 120))) for _ in range(count)]
+        links = [(i, rng.randrange(max(0, i - 10), i)) for i in range(1, count)]
+        rng.shuffle(links)
+        offsets = force_layout.force_directed(sizes, links)
+
+        rects = [(*offset, *size) for offset, size in zip(offsets, sizes)]
+        for index, rect in enumerate(rects):
+            for other in rects[index + 1:]:
+                test.assertFalse(overlaps(rect, other))
+        test.assertLess(link_length(offsets, links), link_length(layout.shelf_pack(sizes, links), links))
+
+    def test_0_exact(test):
+        test.check(100)
+
+    def test_1_grid(test):
+        test.check(force_layout.EXACT_LIMIT + 200)
+
+    def test_2_as_layout_engine_arrangement(test):
+        from benchmark.synthetic import synthetic_scene
+
+        scene = synthetic_scene(2, 20, 2, 2)
+        layout.Layout_Engine(scene, arrange=force_layout.force_directed).layout()
+        rects = [each.rect for each in scene.nodes.values()]
+        for index, rect in enumerate(rects):
+            for other in rects[index + 1:]:
+                test.assertFalse(overlaps(rect, other))
+
+    def test_3_positions_are_kept(test):
+        # A diagonal, which packing into rows would fold up.
+        sizes = [(180, 120)] * 9
+        forces = force_layout.Force_Layout(sizes, [(i, i + 1) for i in range(8)])
+        forces.positions = [(400.0 * i, 300.0 * i) for i in range(9)] + forces.sizes / 2
+        offsets = forces.offsets()
+        for (x, y), (next_x, next_y) in zip(offsets, offsets[1:]):
+            test.assertGreater(next_x, x)
+            test.assertGreater(next_y, y)
+
+    def test_4_overlaps_are_removed_locally(test):
+        sizes = [(180, 120)] * 4
+        forces = force_layout.Force_Layout(sizes, [])
+        # Two members on top of each other, far from the other two.
+        forces.positions = forces.sizes / 2 + [(0.0, 0.0), (10.0, 0.0), (2000.0, 0.0), (2000.0, 2000.0)]
+        forces.separate()
+        test.assertEqual(forces.overlaps()[0].tolist(), [])
+        far = forces.sizes[2:] / 2 + [(2000.0, 0.0), (2000.0, 2000.0)]
+        test.assertEqual(forces.positions[2:].tolist(), far.tolist())
+        # They overlap least vertically, so they part that way.
+        test.assertEqual(forces.positions[:2, 0].tolist(), [90.0, 100.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import random
+import unittest
+
+from src.model import group
+from src.model import group_tree
+from src.model import scene
+
+
+class Set_0_Group_Tree(unittest.TestCase):
+    def setUp(test):
+        test.scene = scene.Scene()
+        for group_id, parent_id, min_level in (
+            ("/0", None, 0), ("/0/0", "/0", 1), ("/0/0/0", "/0/0", 2), ("/0/1", "/0", 1), ("/1", None, 0),
+        ):
+            test.scene.add_group(group.Group(
+                test.scene, group_id, parent=test.scene.get_group(parent_id), min_level=min_level, max_level=2
+            ))
+        test.tree = test.scene.build_group_tree()
+
+    def test_0_ancestors(test):
+        test.assertTrue(test.tree.is_ancestor("/0", "/0/0/0"))
+        test.assertTrue(test.tree.is_ancestor(None, "/1"))
+        test.assertFalse(test.tree.is_ancestor("/0/1", "/0/0/0"))
+        test.assertEqual(test.tree.ancestors("/0/0/0"), ["/0/0", "/0"])
+        test.assertEqual(test.tree.descendants("/0"), ["/0/0", "/0/0/0", "/0/1"])
+        test.assertEqual(test.tree.group_depth("/0/0/0"), 3)
+
+    def test_1_common_ancestor(test):
+        test.assertEqual(test.tree.common_ancestor("/0/0/0", "/0/1"), "/0")
+        test.assertEqual(test.tree.common_ancestor("/0/0/0", "/0/0"), "/0/0")
+        test.assertEqual(test.tree.common_ancestor("/0/1", "/1"), None)
+        test.assertEqual(test.tree.common_ancestor("/1", "/1"), "/1")
+
+    def test_2_visible_at(test):
+        test.assertEqual(test.tree.visible_at(0), {"/0", "/1"})
+        test.assertEqual(test.tree.visible_at(2), {"/0", "/0/0", "/0/0/0", "/0/1", "/1"})
+        test.tree.set_levels("/1", 1, 1)
+        test.assertEqual(test.tree.visible_at(0), {"/0"})
+        test.assertIn("/1", test.tree.visible_at(1))
+
+    def test_3_edits(test):
+        test.assertEqual(len(test.tree), 5)
+        test.scene.add_group(group.Group(test.scene, "/1/0", parent=test.scene.get_group("/1"), min_level=0))
+        test.assertIn("/1/0", test.tree.visible_at(0))
+        test.assertEqual(test.tree.common_ancestor("/1/0", "/1"), "/1")
+
+        builds = list()
+        build = test.tree._build
+        test.tree._build = lambda: builds.append(None) or build()
+        test.tree.reparent("/0/0", "/1/0")
+        test.assertEqual(builds, [])
+        test.assertEqual(test.tree.common_ancestor("/0/0/0", "/1"), "/1")
+        test.assertEqual(test.tree.ancestors("/0/0/0"), ["/0/0", "/1/0", "/1"])
+        with test.assertRaises(ValueError):
+            test.tree.reparent("/1", "/0/0/0")
+
+        test.tree.add("/1/1", "/1")
+        builds.clear()
+        test.assertEqual(test.tree.remove("/1/0"), ["/1/0", "/0/0", "/0/0/0"])
+        test.assertNotIn("/0/0/0", test.tree)
+        # Edits leave the preorder numbering to be rebuilt by the next query which needs it.
+        test.assertEqual(builds, [])
+        test.assertEqual(test.tree.descendants(None), ["/0", "/0/1", "/1", "/1/1"])
+        test.assertEqual(test.tree.visible_at(2), {"/0", "/0/1", "/1", "/1/1"})
+
+    def test_4_matches_parent_walk(test):
+        rng = random.Random(0)
+        tree = group_tree.Group_Tree()
+        parents = {None: None}
+        for index in range(300):
+            parent_id = rng.choice(list(parents))
+            tree.add(f"g-{index}", parent_id)
+            parents[f"g-{index}"] = parent_id
+
+        def path(group_id):
+            result = [group_id]
+            while group_id is not None:
+                group_id = parents[group_id]
+                result.append(group_id)
+            return result
+
+        for _ in range(200):
+            a, b = rng.choice(list(parents)), rng.choice(list(parents))
+            expected = next(each for each in path(a) if each in path(b))
+            test.assertEqual(tree.common_ancestor(a, b), expected)
+
+    def test_5_edits_between_queries_rarely_rebuild(test):
+        rng = random.Random(1)
+        tree = group_tree.Group_Tree()
+        builds = list()
+        build = tree._build
+        tree._build = lambda: builds.append(None) or build()
+        parents = {None: None}
+        for index in range(1000):
+            group_id, parent_id = f"g-{index}", rng.choice(list(parents))
+            tree.add(group_id, parent_id)
+            parents[group_id] = parent_id
+            # As Scene.index_group asks after each group is loaded.
+            test.assertEqual(tree.descendants(group_id), [])
+            test.assertTrue(tree.is_ancestor(parent_id, group_id))
+            test.assertEqual(tree.common_ancestor(group_id, parent_id), parent_id)
+            test.assertEqual(tree.group_depth(group_id), tree.group_depth(parent_id) + 1)
+        test.assertLess(len(builds), 50)
+
+        # The walks give the same answers as the numbering.
+        tree.add("g-extra", "g-0")
+        expected = tree.descendants(None)
+        tree._build()
+        test.assertEqual(tree.descendants(None), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
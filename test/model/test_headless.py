@@ -0,0 +1,69 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src import headless
+from src.model import snapshot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SUPER_FILE = {
+    "name": "Main File",
+    "groups": [
+        {
+            "group_name": "Group 1",
+            "levels": [0, 1],
+            "nodes": [{"node id": "node-1.1"}, {"node id": "node-1.2"}],
+            "connections": [{"id": "c-1", "start": {"node": "node-1.1"}, "end": {"node": "node-1.2"}}]
+        },
+        {"group_name": "Group 2", "level": 0, "nodes": [{"node id": "node-2.1"}]}
+    ]
+}
+
+
+class Set_0_Headless(unittest.TestCase):
+    def setUp(test) -> None:
+        test.directory = tempfile.TemporaryDirectory()
+        test.super_file = os.path.join(test.directory.name, "super.json")
+        with open(test.super_file, "w") as file:
+            json.dump(SUPER_FILE, file)
+
+    def tearDown(test) -> None:
+        test.directory.cleanup()
+
+    def run_command(test, *argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()):
+            test.assertEqual(headless.main(list(argv)), 0)
+        return output.getvalue()
+
+    def test_0_model_imports_without_qt(test):
+        modules = ["src.headless", "src.model.loader", "src.model.snapshot", "src.model.layout", "src.model.history"]
+        result = subprocess.run(
+            [sys.executable, "-c", f"import sys, {', '.join(modules)}; print('PySide6' in sys.modules)"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        test.assertEqual(result.stdout.strip(), "False")
+
+    def test_1_convert_and_layout(test):
+        converted = os.path.join(test.directory.name, "scene.mlod")
+        laid_out = os.path.join(test.directory.name, "laid-out.mlod")
+        test.run_command("convert", test.super_file, converted)
+        test.assertTrue(headless.is_snapshot(converted))
+        test.assertFalse(headless.is_snapshot(test.super_file))
+        test.assertIn("nodes        3", test.run_command("info", converted))
+
+        test.run_command("layout", converted, laid_out)
+        with snapshot.Snapshot(laid_out) as scene_snapshot:
+            scene = scene_snapshot.to_scene()
+        positions = {(node.x, node.y) for node in scene.nodes.values()}
+        test.assertEqual(len(positions), 3)
+        test.assertIn("connections  1", test.run_command("info", laid_out))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from src.model import edge
+from src.model import group
+from src.model import history
+from src.model import node
+from src.model import scene
+
+
+class Set_0_History(unittest.TestCase):
+    def setUp(test):
+        test.scene = scene.Scene()
+        test.group = group.Group(test.scene, "/g")
+        test.scene.add_group(test.group)
+        for index, node_id in enumerate(("a", "b", "c")):
+            new_node = node.Node(test.scene, node_id, node_id.upper(), group="/g")
+            new_node.x = index * 300
+            test.group.nodes.append(node_id)
+            test.scene.add_node(new_node)
+        test.scene.add_edge(edge.Edge(test.scene, "a-b", {'node': "a"}, {'node': "b"}))
+        test.scene.add_edge(edge.Edge(test.scene, "b-c", {'node': "b"}, {'node': "c"}))
+        test.group.edges.extend(["a-b", "b-c"])
+        test.scene.build_spatial_index()
+        test.history = history.History(test.scene)
+
+    def test_0_add_undo_redo(test):
+        test.history.add_node("d", "D", "/g", 900, 0)
+        test.assertIn("d", test.scene)
+        test.assertEqual(test.scene.nodes_at(950, 10), ["d"])
+        test.history.undo()
+        test.assertNotIn("d", test.scene)
+        test.assertNotIn("d", test.group.nodes)
+        test.assertEqual(test.scene.nodes_at(950, 10), [])
+        test.history.redo()
+        test.assertEqual(test.scene.nodes["d"].title, "D")
+        test.assertIn("d", test.group.nodes)
+
+    def test_1_remove_takes_the_edges(test):
+        test.history.remove_nodes(["b"])
+        test.assertNotIn("b", test.scene)
+        test.assertEqual(test.scene.edges, [])
+        test.assertEqual(test.group.edges, [])
+        test.assertEqual(test.group.rect, (0, 0, 780, node.NODE_HEIGHT))
+        test.history.undo()
+        test.assertEqual(test.scene.nodes["b"].x, 300)
+        test.assertEqual(sorted(edge.id for edge in test.scene.edges), ["a-b", "b-c"])
+        test.assertEqual(sorted(test.group.edges), ["a-b", "b-c"])
+        test.assertEqual(test.scene.nodes_at(350, 10), ["b"])
+        test.history.redo()
+        test.assertNotIn("b", test.scene)
+
+    def test_2_move_and_retitle(test):
+        test.history.move_nodes(["a", "c"], [(10, 20), (30, 40)])
+        test.history.set_node_title("a", "Renamed")
+        test.assertEqual(test.scene.nodes["c"].rect[:2], (30, 40))
+        test.history.undo()
+        test.assertEqual(test.scene.nodes["a"].title, "A")
+        test.history.undo()
+        test.assertEqual(test.scene.nodes["a"].rect[:2], (0, 0))
+        test.assertEqual(test.scene.nodes["c"].rect[:2], (600, 0))
+        test.assertIsNone(test.history.undo())
+        test.history.redo()
+        test.assertEqual(test.scene.nodes["a"].rect[:2], (10, 20))
+
+    def test_3_a_new_edit_forgets_the_undone_ones(test):
+        test.history.set_node_title("a", "One")
+        test.history.undo()
+        test.assertTrue(test.history.can_redo)
+        test.history.set_node_title("a", "Two")
+        test.assertFalse(test.history.can_redo)
+
+    def test_4_history_is_limited(test):
+        limited = history.History(test.scene, limit=5)
+        for step in range(10):
+            limited.move_nodes(["a"], [(step, 0)])
+        while limited.undo():
+            pass
+        test.assertEqual(test.scene.nodes["a"].rect[:2], (4, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
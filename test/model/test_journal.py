@@ -0,0 +1,98 @@
+import unittest
+
+from src.model import group
+from src.model import journal
+from src.model import layout
+from src.model import node
+from src.model import scene
+
+
+class Set_0_Journal(unittest.TestCase):
+    def setUp(test):
+        test.journal = journal.Journal()
+        test.delivered = list()
+        test.journal.subscribe(test.delivered.append)
+
+    def test_0_moves_coalesce(test):
+        test.journal.moved("a", (0, 0, 1, 1))
+        test.journal.moved("a", (5, 5, 1, 1))
+        test.journal.retitled("a")
+        changes = test.journal.flush()
+        test.assertEqual(changes.moved, {"a": (0, 0, 1, 1)})
+        test.assertEqual(changes.retitled, {"a"})
+        test.assertEqual(test.delivered, [changes])
+        test.assertFalse(test.journal.flush())
+        test.assertEqual(len(test.delivered), 1)
+
+    def test_1_added_then_removed_is_nothing(test):
+        test.journal.added("a")
+        test.journal.moved("a", (0, 0, 1, 1))
+        test.journal.removed("a", (5, 5, 1, 1), None)
+        test.assertFalse(test.journal.flush())
+
+    def test_2_removed_keeps_the_first_rect(test):
+        test.journal.moved("a", (0, 0, 1, 1))
+        test.journal.removed("a", (5, 5, 1, 1), "/0")
+        test.journal.added("a")
+        changes = test.journal.flush()
+        test.assertEqual(changes.removed, {"a": ((0, 0, 1, 1), "/0")})
+        test.assertEqual(changes.changed, {"a"})
+
+    def test_3_schedules_one_flush_per_batch(test):
+        scheduled = list()
+        test.journal.schedule = scheduled.append
+        test.journal.added("a")
+        test.journal.added("b")
+        test.assertEqual(len(scheduled), 1)
+        scheduled.pop()()
+        test.journal.added("c")
+        test.assertEqual(len(scheduled), 1)
+
+    def test_4_nothing_is_recorded_without_subscribers(test):
+        test.journal.unsubscribe(test.delivered.append)
+        test.journal.added("a")
+        test.assertFalse(test.journal.pending)
+
+
+class Set_1_Scene_Journal(unittest.TestCase):
+    def setUp(test):
+        test.scene = scene.Scene()
+        test.group = group.Group(test.scene, "/0")
+        test.scene.add_group(test.group)
+        test.delivered = list()
+        test.scene.journal.subscribe(test.delivered.append)
+
+    def add(test, node_id):
+        new_node = node.Node(test.scene, node_id, group="/0")
+        test.group.nodes.append(node_id)
+        test.scene.add_node(new_node)
+
+    def test_0_edits_are_journalled(test):
+        test.add("a")
+        test.add("b")
+        test.scene.journal.flush()
+        test.scene.move_node("a", 10, 10)
+        test.scene.set_node_title("b", "B")
+        test.scene.remove_node("b")
+        changes = test.scene.journal.flush()
+        test.assertEqual(changes.moved, {"a": (0, 0, node.NODE_WIDTH, node.NODE_HEIGHT)})
+        test.assertEqual(changes.removed, {"b": ((0, 0, node.NODE_WIDTH, node.NODE_HEIGHT), "/0")})
+        test.assertEqual(changes.retitled, set())
+        test.assertNotIn("b", test.scene)
+        test.assertEqual(test.group.nodes, ["a"])
+
+    def test_1_layout_follows_membership(test):
+        for node_id in ("a", "b"):
+            test.add(node_id)
+        engine = layout.Layout_Engine(test.scene)
+        engine.layout()
+        test.scene.journal.subscribe(engine.scene_changed)
+        test.scene.journal.flush()
+        test.add("c")
+        test.scene.journal.flush()
+        test.assertEqual(engine.dirty, {"/0"})
+        test.assertIn("/0", engine.update())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import json
+import unittest
+
+from src.model import json_stream
+
+DOCUMENTS = [
+    {"name": "Main File", "ports": [], "groups": [{"group_name": "Group 1", "nodes": [{"node id": "a"}]}]},
+    [1, -2.5, 3e4, True, False, None, "string with \"quotes\" and \\u00e9 é", [], {}],
+    {"nested": {"deeper": [{"a": [1, [2, [3]]]}, "b"]}, "empty": ""},
+    "top level string",
+    12345678901234567890,
+]
+
+
+class Set_0_Json_Stream(unittest.TestCase):
+
+    def test_value_matches_json_module(test):
+        for document in DOCUMENTS:
+            text = json.dumps(document, indent=2, ensure_ascii=False)
+            # A tiny chunk size forces every kind of token to be split across reads.
+            for chunk_size in (1, 3, 7, 1 << 16):
+                stream = json_stream.Json_Stream(io.StringIO(text), chunk_size=chunk_size)
+                test.assertEqual(document, stream.value())
+
+
+    def test_map_keys_and_skip(test):
+        text = json.dumps({"skip": {"a": [1, 2, {"b": None}]}, "keep": [1, 2], "also skip": 3})
+        stream = json_stream.Json_Stream(io.StringIO(text), chunk_size=4)
+        kept = dict()
+        for key in stream.map_keys():
+            if key == "keep":
+                kept[key] = stream.value()
+            else:
+                stream.skip()
+        test.assertEqual({"keep": [1, 2]}, kept)
+
+
+    def test_array_items(test):
+        stream = json_stream.Json_Stream(io.StringIO(json.dumps([{"a": 1}, {"a": 2}, {"a": 3}])))
+        values = [stream.value()["a"] for _ in stream.array_items()]
+        test.assertEqual([1, 2, 3], values)
+
+
+    def test_large_value_is_decoded_once(test):
+        document = {"nodes": [{"node id": f"n-{index}", "name": "} ] \\\" {"} for index in range(2000)]}
+        stream = json_stream.Json_Stream(io.StringIO(json.dumps(document)), chunk_size=7)
+        calls = list()
+        raw_decode = stream._decoder.raw_decode
+        stream._decoder.raw_decode = lambda *args: calls.append(args) or raw_decode(*args)
+        test.assertEqual(document, stream.value())
+        test.assertEqual(len(calls), 1)
+
+
+    def test_truncated_document(test):
+        stream = json_stream.Json_Stream(io.StringIO('{"a": [1, 2'), chunk_size=4)
+        with test.assertRaises(json.JSONDecodeError):
+            stream.value()
+
+
+    def test_malformed_structure(test):
+        for text in (']', '}', '[1}', '{"a": 1]', '[1]]', '[1], 2', '"a": 1'):
+            stream = json_stream.Json_Stream(io.StringIO(text), chunk_size=2)
+            with test.assertRaises(json.JSONDecodeError):
+                while True:
+                    stream.next()
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,92 @@
+import unittest
+
+from benchmark.synthetic import synthetic_scene
+from src.model import edge
+from src.model import layout
+from src.model import node
+from src.model import spatial_index
+
+
+def overlaps(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+class Set_0_Layout(unittest.TestCase):
+    def setUp(test):
+        test.scene = synthetic_scene(3, 12, 3, 2)
+        test.engine = layout.Layout_Engine(test.scene)
+        test.engine.layout()
+
+    def test_0_nodes_inside_their_groups(test):
+        for each in test.scene.nodes.values():
+            group_rect = test.engine.group_rect(each.group)
+            test.assertTrue(spatial_index.contains(group_rect, each.rect))
+        for group in test.scene.groups:
+            if group.parent is not None:
+                test.assertTrue(spatial_index.contains(test.engine.group_rect(group.parent.id), test.engine.group_rect(group.id)))
+
+    def test_1_no_overlaps(test):
+        node_rects = [each.rect for each in test.scene.nodes.values()]
+        group_rects = [test.engine.group_rect(group.id) for group in test.scene.groups if group.parent is None]
+        for rects in (node_rects, group_rects):
+            for index, rect in enumerate(rects):
+                for other in rects[index + 1:]:
+                    test.assertFalse(overlaps(rect, other))
+
+    def test_2_untouched_groups_are_not_relaid(test):
+        group = test.scene.groups[2]
+        test.engine.invalidate(group.id)
+        test.assertEqual(test.engine.update(), [group.id])
+
+    def test_3_incremental_matches_full(test):
+        group = test.scene.groups[2]
+        for index in range(30):
+            new_node = node.Node(test.scene, f"added-{index}", group=group.id)
+            group.nodes.append(new_node.id)
+            test.scene.add_node(new_node)
+        test.engine.invalidate(group.id)
+        relaid = test.engine.update()
+        test.assertEqual(relaid[0], group.id)
+        test.assertIn(None, relaid)
+        incremental = {node_id: (each.x, each.y) for node_id, each in test.scene.nodes.items()}
+
+        layout.Layout_Engine(test.scene).layout()
+        test.assertEqual({node_id: (each.x, each.y) for node_id, each in test.scene.nodes.items()}, incremental)
+
+    def test_4_separate_subtrees_are_all_placed(test):
+        full = {node_id: (each.x, each.y) for node_id, each in test.scene.nodes.items()}
+        for group_id in ('/0/0', '/1/0'):
+            for node_id, each in test.scene.nodes.items():
+                if each.group.startswith(group_id + '/'):
+                    test.scene.move_node(node_id, 0, 0)
+            test.engine.invalidate(group_id)
+        test.assertEqual(sorted(test.engine.update()), ['/0/0', '/1/0'])
+        test.assertEqual({node_id: (each.x, each.y) for node_id, each in test.scene.nodes.items()}, full)
+
+    def test_5_reparented_group_is_relaid(test):
+        # The number of groups and connections stays the same.
+        test.scene.reparent_group('/0/0', '/1')
+        relaid = test.engine.update()
+        test.assertIn('/0', relaid)
+        test.assertIn('/1', relaid)
+        test.assertIn('/0/0', test.engine.layouts['/1'].groups)
+        test.assertNotIn('/0/0', test.engine.layouts['/0'].groups)
+        incremental = {node_id: (each.x, each.y) for node_id, each in test.scene.nodes.items()}
+
+        layout.Layout_Engine(test.scene).layout()
+        test.assertEqual({node_id: (each.x, each.y) for node_id, each in test.scene.nodes.items()}, incremental)
+        with test.assertRaises(ValueError):
+            test.scene.reparent_group('/1', '/0/0/1')
+
+    def test_6_top_level_connections_are_linked(test):
+        test.assertEqual(test.engine.layouts[None].groups['/1'][1], test.engine.layouts[None].groups['/0'][1])
+        test.scene.add_edge(edge.Edge(test.scene, '/connections/0', {'node': '/0/nodes/0'}, {'node': '/2/0/nodes/3'}))
+        test.engine.invalidate(None)
+        test.assertEqual(test.engine.update(), [None])
+        # Linked top level groups are placed next to each other.
+        test.assertEqual(test.engine.layouts[None].groups['/2'][1], test.engine.layouts[None].groups['/0'][1])
+        test.assertNotEqual(test.engine.layouts[None].groups['/1'][1], test.engine.layouts[None].groups['/0'][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.model import loader
+
+SUPER_FILE = {
+    "name": "Main File",
+    "ports": [],
+    "groups": [
+        {
+            "group_name": "Group 1",
+            "ports": [{"type": "conduit", "id": "port-1", "description": "Input String"}],
+            "sub-groups": [{"group_name": "Group 1.1", "nodes": [{"node id": "node-1.1.1", "node name": "Node 1.1.1"}]}],
+            "nodes": [
+                {"node id": "node-1.1", "node name": "Node 1.1", "inputs": [{"type": "socket", "socket id": "s-1"}]},
+                {"node id": "node-1.2", "node name": "Node 1.2"}
+            ],
+            "connections": [
+                {
+                    "id": "",
+                    "start": {"node": "node-1.2", "socket": "s-1"},
+                    "end": {"group": "port-x", "node": "node-x.1", "socket": "s-x"},
+                    "type": "straight"
+                }
+            ]
+        },
+        {
+            "group_name": "Group X",
+            "levels": [1, None],
+            "ports": [{"type": "conduit", "id": "port-x", "description": "Input String"}],
+            "filepath": "group-x/definition.json"
+        }
+    ]
+}
+
+GROUP_FILE = {
+    "name": "Group X",
+    "ports": [
+        {"type": "conduit", "id": "port-x", "description": "Input String"},
+        {"type": "conduit", "id": "port-x2", "description": "Output String"}
+    ],
+    "groups": [
+        {"group_name": "Group X1", "nodes": [{"node id": "node-x.1", "node name": "Node X.1"}]}
+    ]
+}
+
+
+class Set_0_Scene_Loader(unittest.TestCase):
+
+    def setUp(test) -> None:
+        test.directory = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(test.directory.name, "group-x"))
+        test.super_file = os.path.join(test.directory.name, "super.json")
+        with open(test.super_file, "w") as file:
+            json.dump(SUPER_FILE, file)
+        with open(os.path.join(test.directory.name, "group-x", "definition.json"), "w") as file:
+            json.dump(GROUP_FILE, file)
+
+
+    def tearDown(test) -> None:
+        test.directory.cleanup()
+
+
+    def test_load_super_file(test):
+        scene_loader = loader.Scene_Loader(chunk_size=16)
+        test_scene = scene_loader.load(test.super_file)
+
+        test.assertEqual("Main File", test_scene.name)
+        test.assertEqual(["/0", "/0/0", "/1"], [group.id for group in test_scene.groups])
+        test.assertIn("node-1.1", test_scene)
+        test.assertIn("node-1.1.1", test_scene)
+        test.assertEqual("/0", test_scene.nodes["node-1.1"].group)
+        test.assertEqual("s-1", test_scene.nodes["node-1.1"].inputs[0]["socket id"])
+        test.assertEqual(1, len(test_scene.edges))
+        test.assertEqual("/0/connections/0", test_scene.edges[0].id)
+
+
+    def test_group_files_are_lazy(test):
+        scene_loader = loader.Scene_Loader()
+        test_scene = scene_loader.load(test.super_file)
+        group_x = test_scene.groups[-1]
+
+        test.assertFalse(group_x.loaded)
+        test.assertNotIn("node-x.1", test_scene)
+
+        test.assertEqual([], scene_loader.load_visible(0))
+        test.assertEqual([group_x], scene_loader.load_visible(1))
+        test.assertTrue(group_x.loaded)
+        test.assertIn("node-x.1", test_scene)
+        test.assertEqual(["port-x", "port-x2"], [port["id"] for port in group_x.ports])
+        test.assertEqual(["/1/0"], group_x.groups)
+
+
+    def test_eager_load(test):
+        test_scene = loader.load_scene(test.super_file, lazy=False)
+        test.assertIn("node-x.1", test_scene)
+        test.assertEqual([], [group for group in test_scene.groups if not group.loaded])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
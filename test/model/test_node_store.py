@@ -0,0 +1,90 @@
+import unittest
+
+from src.model import group
+from src.model import history
+from src.model import node
+from src.model import node_store
+from src.model import scene
+
+
+class Set_0_Node_Store(unittest.TestCase):
+    def setUp(test):
+        test.scene = scene.Scene()
+        test.outer = group.Group(test.scene, "/0", min_level=1)
+        test.inner = group.Group(test.scene, "/0/0", parent=test.outer, min_level=3, max_level=4)
+        test.scene.add_group(test.outer)
+        test.scene.add_group(test.inner)
+        new_node = node.Node(test.scene, "n-0", "First", group="/0")
+        new_node.x, new_node.y = 10, 20
+        new_node.inputs = [{"socket id": "s-0"}]
+        test.scene.add_node(new_node)
+        test.scene.add_nodes(
+            ["n-1", "n-2", "n-3"], groups=["/0/0", "/0/0", None], positions=[(1, 2), (3, 4), (5, 6)]
+        )
+
+    def test_0_views(test):
+        view = test.scene.nodes["n-0"]
+        test.assertIsInstance(view, node_store.Node_View)
+        test.assertEqual((view.id, view.title, view.group, view.rect[:2]), ("n-0", "First", "/0", (10, 20)))
+        test.assertEqual(view.inputs, [{"socket id": "s-0"}])
+        test.assertEqual(test.scene.nodes["n-1"].outputs, [])
+        test.assertIs(view.scene, test.scene)
+
+        view.x = 100
+        view.group = "/0/0"
+        test.assertEqual(test.scene.nodes["n-0"].x, 100)
+        test.assertEqual(test.scene.nodes.group_codes[0], test.scene.nodes.group_codes[1])
+
+    def test_1_mapping(test):
+        test.assertEqual(list(test.scene.nodes), ["n-0", "n-1", "n-2", "n-3"])
+        test.assertIn("n-2", test.scene)
+        test.assertIsNone(test.scene.nodes.get("missing"))
+        del test.scene.nodes["n-1"]
+        test.assertNotIn("n-1", test.scene)
+        test.assertEqual(len(test.scene.nodes), 3)
+        test.assertEqual([each.id for each in test.scene.nodes.values()], ["n-0", "n-2", "n-3"])
+
+    def test_2_select(test):
+        nodes = test.scene.nodes
+        test.assertEqual(nodes.select("/0/0"), ["n-1", "n-2"])
+        test.assertEqual(nodes.select(None), ["n-3"])
+        test.assertEqual(nodes.select(level=2), ["n-0", "n-3"])
+        test.assertEqual(nodes.select(min_level=3), ["n-1", "n-2"])
+        test.assertEqual(nodes.select("/0", min_level=3), [])
+        test.assertEqual(nodes.select("unknown"), [])
+
+    def test_3_growth(test):
+        store = node_store.Node_Store(capacity=2)
+        store.extend([f"n-{index}" for index in range(10)], positions=[(index, 0) for index in range(10)])
+        test.assertEqual(store.x.tolist(), list(range(10)))
+        test.assertEqual(store.select(), [f"n-{index}" for index in range(10)])
+
+    def test_4_dead_rows_are_reused(test):
+        capacity = len(test.scene.nodes.x)
+        commands = history.History(test.scene)
+        for _ in range(200):
+            commands.push(history.Remove_Nodes(["n-1", "n-2"]))
+            commands.undo()
+            commands.redo()
+            commands.undo()
+        test.assertEqual(len(test.scene.nodes.ids), 4)
+        test.assertEqual(len(test.scene.nodes.x), capacity)
+        test.assertEqual(sorted(test.scene.nodes.select("/0/0")), ["n-1", "n-2"])
+        test.assertEqual(test.scene.nodes["n-2"].rect[:2], (3, 4))
+
+        store = node_store.Node_Store(capacity=8)
+        for cycle in range(100):
+            ids = [f"c{cycle}-{index}" for index in range(6)]
+            store.extend(ids[:3])
+            store.add(node.Node(None, ids[3], group="/0"))
+            store.extend(ids[4:], groups=[None, None])
+            test.assertEqual(sorted(store.select()), sorted(ids))
+            test.assertEqual(store.x.tolist(), [0.0] * len(store.x))
+            for node_id in ids:
+                del store[node_id]
+        test.assertEqual(len(store._x), 8)
+        test.assertEqual(len(store), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
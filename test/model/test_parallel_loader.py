@@ -0,0 +1,186 @@
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.model import loader
+from src.model import parallel_loader
+
+
+def group_file(name, nodes, sub_groups=(), ports=()):
+    return {
+        "name": name,
+        "ports": [{"type": "conduit", "id": port} for port in ports],
+        "groups": list(sub_groups),
+        "nodes": [{"node id": node, "node name": node} for node in nodes],
+        "connections": [
+            {"start": {"node": start, "socket": ""}, "end": {"node": end, "socket": ""}} 
+            for start, end in zip(nodes, nodes[1:])
+        ]
+    }
+
+
+FILES = {
+    "super.json": {
+        "name": "Main File",
+        "groups": [
+            {"group_name": "A", "ports": [{"type": "conduit", "id": "port-a"}], "filepath": "a.json"},
+            {"group_name": "B", "ports": [{"type": "conduit", "id": "port-b"}], "filepath": "b.json"},
+            {"group_name": "Inline", "nodes": [{"node id": "inline-1"}]},
+            {"group_name": "Missing", "filepath": "missing.json"}
+        ]
+    },
+    "a.json": group_file(
+        "A", ["a-1", "a-2", "a-3"], 
+        sub_groups=[
+            {"group_name": "A1", "nodes": [{"node id": "a1-1"}]}, 
+            {"group_name": "A2", "filepath": "nested/a2.json"}
+        ], 
+        ports=["port-a", "port-a-extra"]
+    ),
+    "nested/a2.json": group_file("A2", ["a2-1", "a2-2"]),
+    "b.json": group_file("B", ["b-1", "b-2"]),
+}
+
+
+class Broken_Executor(Executor):
+    """Fails every submission as a process pool does once a worker has died."""
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A worker died"))
+        return future
+
+
+def summary(test_scene):
+    return (
+        [(group.id, group.name, group.loaded, group.nodes, group.groups, group.edges) for group in test_scene.groups],
+        list(test_scene.nodes),
+        [edge.id for edge in test_scene.edges],
+    )
+
+
+class Set_0_Parallel_Loader(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.directory = tempfile.TemporaryDirectory()
+        for filename, document in FILES.items():
+            path = os.path.join(test.directory.name, filename)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                json.dump(document, file)
+        test.super_file = os.path.join(test.directory.name, "super.json")
+
+        # The sequential reference skips the missing file, which the parallel loader reports as an error.
+        test.sequential = loader.Scene_Loader()
+        test.sequential.load(test.super_file)
+        while pending := [group for group in test.sequential.unloaded_groups() if group.name != "Missing"]:
+            for group in pending:
+                test.sequential.load_group(group)
+
+
+    @classmethod
+    def tearDownClass(test) -> None:
+        test.directory.cleanup()
+
+
+    def load_parallel(test, executor, super_file=None):
+        progress = list()
+        scene_loader = parallel_loader.Parallel_Scene_Loader(
+            executor=executor, progress=lambda done, total, group: progress.append((done, total))
+        )
+        scene_loader.load(super_file or test.super_file)
+        test_scene = scene_loader.wait()
+        return scene_loader, test_scene, progress
+
+
+    def test_matches_sequential_load(test):
+        for executor in (ThreadPoolExecutor(max_workers=3), ProcessPoolExecutor(max_workers=2)):
+            with executor:
+                scene_loader, test_scene, progress = test.load_parallel(executor)
+
+            test.assertEqual(summary(test.sequential.scene), summary(test_scene))
+            test.assertIn("a2-2", test_scene)
+            test.assertEqual(["/0", "/1", "/2", "/3", "/0/0", "/0/1"], [group.id for group in test_scene.groups])
+            test.assertEqual(["/0/0", "/0/1"], test_scene.groups[0].groups)
+            test.assertIs(test_scene.groups[0], test_scene.groups[4].parent)
+            test.assertIs(test_scene, test_scene.nodes["a-1"].scene)
+            test.assertEqual(4, len(progress))
+            test.assertEqual((4, 4), progress[-1])
+
+            test.assertIn("/3", scene_loader.errors)
+            test.assertFalse(test_scene.groups[3].loaded)
+            test.assertEqual(test.sequential.warnings, scene_loader.warnings)
+            test.assertIn("/1", scene_loader.warnings)
+            test.assertNotIn("/0", scene_loader.warnings)
+            test.assertEqual(["port-a", "port-a-extra"], [port["id"] for port in test_scene.groups[0].ports])
+
+
+    def test_deterministic_across_runs(test):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = summary(test.load_parallel(executor)[1])
+            second = summary(test.load_parallel(executor)[1])
+        test.assertEqual(first, second)
+
+
+    def test_only_visible_groups_are_loaded(test):
+        with tempfile.TemporaryDirectory() as directory:
+            documents = {
+                "super.json": {"name": "Levels", "groups": [
+                    {"group_name": "Near", "levels": [None, 0], "filepath": "near.json"},
+                    {"group_name": "Far", "levels": [1, None], "filepath": "far.json"},
+                ]},
+                "near.json": group_file("Near", ["near-1"]),
+                "far.json": group_file("Far", ["far-1"]),
+            }
+            for filename, document in documents.items():
+                with open(os.path.join(directory, filename), "w") as file:
+                    json.dump(document, file)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                scene_loader = parallel_loader.Parallel_Scene_Loader(executor=executor)
+                scene_loader.load(os.path.join(directory, "super.json"), level=0)
+                test_scene = scene_loader.wait()
+                test.assertEqual(["near-1"], list(test_scene.nodes))
+                test.assertEqual([], scene_loader.load_visible(0))
+
+                test.assertEqual(["/1"], [group.id for group in scene_loader.load_visible(1)])
+                scene_loader.wait()
+                test.assertEqual(["near-1", "far-1"], list(test_scene.nodes))
+
+
+    def test_malformed_group_file(test):
+        with tempfile.TemporaryDirectory() as directory:
+            documents = {
+                "super.json": {"name": "Malformed", "groups": [
+                    {"group_name": "Bad", "filepath": "bad.json"},
+                    {"group_name": "Good", "filepath": "good.json"},
+                ]},
+                # A connection without a start.
+                "bad.json": {
+                    "name": "Bad", "nodes": [{"node id": "bad-1"}], "connections": [{"end": {"node": "bad-1"}}]
+                },
+                "good.json": group_file("Good", ["good-1"]),
+            }
+            for filename, document in documents.items():
+                with open(os.path.join(directory, filename), "w") as file:
+                    json.dump(document, file)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                scene_loader, test_scene, progress = test.load_parallel(executor, os.path.join(directory, "super.json"))
+            test.assertIsInstance(scene_loader.errors["/0"], KeyError)
+            test.assertEqual(["good-1"], list(test_scene.nodes))
+            test.assertEqual((2, 2), progress[-1])
+
+
+    def test_broken_pool_fails_the_pending_groups(test):
+        scene_loader, test_scene, progress = test.load_parallel(Broken_Executor())
+        test.assertEqual({"/0", "/1", "/3"}, set(scene_loader.errors))
+        test.assertTrue(all(isinstance(error, BrokenProcessPool) for error in scene_loader.errors.values()))
+        test.assertTrue(scene_loader.finished)
+        test.assertEqual((3, 3), progress[-1])
+        test.assertEqual(["inline-1"], list(test_scene.nodes))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
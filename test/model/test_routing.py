@@ -0,0 +1,97 @@
+import unittest
+
+from src.model import edge
+from src.model import group
+from src.model import node
+from src.model import routing
+from src.model import scene
+
+
+def add_group(new_scene, group_id, x, y, parent=None):
+    new_group = group.Group(new_scene, group_id, parent=parent)
+    new_scene.add_group(new_group)
+    if parent is not None:
+        parent.groups.append(group_id)
+    new_node = node.Node(new_scene, f"{group_id}/node", group=group_id)
+    new_node.x, new_node.y = x, y
+    new_group.nodes.append(new_node.id)
+    new_scene.add_node(new_node)
+    return new_group
+
+
+class Set_0_Router(unittest.TestCase):
+    def setUp(test):
+        test.scene = scene.Scene()
+        add_group(test.scene, "/a", 0, 0)
+        add_group(test.scene, "/b", 2000, 0)
+        # Right between the other two.
+        add_group(test.scene, "/wall", 1000, -50)
+        for index in range(3):
+            test.scene.add_edge(edge.Edge(test.scene, f"a-b-{index}", {'node': "/a/node"}, {'node': "/b/node"}))
+        test.scene.add_edge(edge.Edge(test.scene, "wall-b", {'node': "/wall/node"}, {'node': "/b/node"}))
+        test.scene.build_spatial_index()
+        test.router = routing.Router(test.scene)
+        test.router.route_all()
+
+    def test_0_routes_avoid_other_groups(test):
+        wall = test.scene.get_group("/wall").rect
+        points = test.router.routes["a-b-0"].points
+        test.assertEqual(points[0], (node.NODE_WIDTH, node.NODE_HEIGHT / 2))
+        test.assertEqual(points[-1], (2000, node.NODE_HEIGHT / 2))
+        for a, b in zip(points, points[1:]):
+            test.assertTrue(a[0] == b[0] or a[1] == b[1])
+            test.assertFalse(routing.segment_hits(a, b, wall))
+
+    def test_1_conduits_bundle(test):
+        test.assertEqual(test.router.conduits[("/a", "/b")], {"a-b-0", "a-b-1", "a-b-2"})
+        routes = [test.router.routes[f"a-b-{index}"].points for index in range(3)]
+        test.assertEqual(routes[0], routes[1])
+        test.assertEqual(test.router.routes["a-b-0"].conduit, ("/a", "/b"))
+
+    def test_2_only_affected_edges_reroute(test):
+        test.scene.move_node("/b/node", 2000, 100)
+        test.router.node_moved("/b/node")
+        test.assertEqual(set(test.router.update()), {"a-b-0", "a-b-1", "a-b-2", "wall-b"})
+        test.assertEqual(test.router.routes["a-b-0"].points[-1], (2000, 100 + node.NODE_HEIGHT / 2))
+
+        test.scene.move_node("/a/node", 0, 20)
+        test.router.node_moved("/a/node")
+        test.assertEqual(set(test.router.update()), {"a-b-0", "a-b-1", "a-b-2"})
+
+    def test_3_budget(test):
+        test.router.node_moved("/b/node")
+        test.assertEqual(len(test.router.update(budget_ms=0)), 1)
+        test.assertEqual(len(test.router.dirty), 3)
+
+    def test_4_connections_added_and_removed_are_followed(test):
+        test.scene.add_edge(edge.Edge(test.scene, "a-wall", {'node': "/a/node"}, {'node': "/wall/node"}))
+        test.assertEqual(test.router.update(), ["a-wall"])
+        test.assertEqual(test.router.routes["a-wall"].conduit, ("/a", "/wall"))
+
+        test.scene.remove_node_edges(["/wall/node"])
+        test.assertNotIn("a-wall", test.router.routes)
+        test.assertNotIn("wall-b", test.router.routes)
+        test.assertNotIn("/wall/node", test.router._node_edges)
+        test.router.node_moved("/b/node")
+        test.assertEqual(set(test.router.update()), {"a-b-0", "a-b-1", "a-b-2"})
+
+    def test_5_groups_without_bounds_are_routed_directly(test):
+        # As though /b were still to be laid out.
+        test.scene.get_group("/b").rect = None
+        router = routing.Router(test.scene)
+        test.assertIsNone(router.conduit_route(("/a", "/b")))
+        route = router.route(test.scene.edges[0])
+        test.assertIsNone(route.conduit)
+        test.assertEqual(route.points[-1], (2000, node.NODE_HEIGHT / 2))
+
+    def test_6_routes_follow_conduits(test):
+        wall = (400, -200, 200, 400)
+        # Round the top is as short as round the bottom, and is found first.
+        test.assertEqual(test.router._search((0, 0), (1000, 0), [wall])[2], (380, -220))
+        conduit = [(300, 260), (700, 260)]
+        points = test.router._search((0, 0), (1000, 0), [wall], [conduit])
+        test.assertIn(((300, 260), (1000, 260)), list(zip(points, points[1:])))
+
+
+if __name__ == '__main__':
+    unittest.main()
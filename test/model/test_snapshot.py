@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.model import loader
+from src.model import scene
+from src.model import snapshot
+
+SUPER_FILE = {
+    "name": "Main File",
+    "ports": [{"type": "conduit", "id": "main-port"}],
+    "groups": [
+        {
+            "group_name": "Group 1",
+            "levels": [0, None],
+            "ports": [{"type": "conduit", "id": "port-1", "description": "Input String"}],
+            "sub-groups": [{"group_name": "Group 1.1", "level": 2, "nodes": [{"node id": "node-1.1.1"}]}],
+            "nodes": [
+                {"node id": "node-1.1", "node name": "Node 1.1", "inputs": [{"type": "socket", "socket id": "s-1"}]},
+                {"node id": "node-1.2", "node name": "Nœud 1.2", "outputs": [{"socket id": "s-2"}]}
+            ],
+            "connections": [
+                {
+                    "id": "",
+                    "start": {"node": "node-1.2", "socket": "s-2"},
+                    "end": {"group": "port-x", "node": "node-x.1", "socket": "s-x"},
+                    "type": "bezier",
+                    "knots": [{"x": 1, "y": 2}]
+                }
+            ]
+        },
+        {"group_name": "Group X", "filepath": "group-x.json"}
+    ],
+    "nodes": [{"node id": "standalone", "node name": "Standalone"}]
+}
+
+
+def summary(test_scene):
+    return (
+        test_scene.name,
+        test_scene.ports,
+        [
+            (
+                group.id, group.name, group.parent.id if group.parent else None, group.min_level, group.max_level,
+                group.filepath, group.loaded, group.ports, group.nodes, group.groups, group.edges
+            )
+            for group in test_scene.groups
+        ],
+        [(node.id, node.title, node.group, node.inputs, node.outputs) for node in test_scene.nodes.values()],
+        [(edge.id, edge.start, edge.end, edge.type, edge.knots) for edge in test_scene.edges],
+    )
+
+
+class Set_0_Snapshot(unittest.TestCase):
+
+    def setUp(test) -> None:
+        test.directory = tempfile.TemporaryDirectory()
+        test.super_file = os.path.join(test.directory.name, "super.json")
+        with open(test.super_file, "w") as file:
+            json.dump(SUPER_FILE, file)
+        test.snapshot_file = os.path.join(test.directory.name, "scene.mlod")
+
+
+    def tearDown(test) -> None:
+        test.directory.cleanup()
+
+
+    def test_round_trip(test):
+        # Group X's file doesn't exist, so it stays unloaded, which the snapshot must also record.
+        original = loader.load_scene(test.super_file)
+        snapshot.write_snapshot(original, test.snapshot_file)
+
+        with snapshot.Snapshot(test.snapshot_file) as scene_snapshot:
+            test.assertEqual(4, scene_snapshot.node_count)
+            test.assertEqual(summary(original), summary(scene_snapshot.to_scene()))
+
+
+    def test_round_trip_twice(test):
+        original = loader.load_scene(test.super_file)
+        snapshot.write_snapshot(original, test.snapshot_file)
+        with snapshot.Snapshot(test.snapshot_file) as scene_snapshot:
+            copy = scene_snapshot.to_scene()
+        second_file = os.path.join(test.directory.name, "copy.mlod")
+        snapshot.write_snapshot(copy, second_file)
+        with open(test.snapshot_file, "rb") as first, open(second_file, "rb") as second:
+            test.assertEqual(first.read(), second.read())
+
+
+    def test_ends_without_sockets(test):
+        # An end may leave its socket out, or give it empty, and the JSON loader keeps either as it was.
+        super_file = json.loads(json.dumps(SUPER_FILE))
+        super_file["groups"][0]["connections"] += [
+            {"id": "no-socket", "start": {"node": "node-1.1"}, "end": {"node": "node-1.2", "socket": ""}},
+            {"id": "group-end", "start": {"node": "node-1.2", "socket": ""}, "end": {"group": "port-1"}}
+        ]
+        with open(test.super_file, "w") as file:
+            json.dump(super_file, file)
+        original = loader.load_scene(test.super_file)
+        snapshot.write_snapshot(original, test.snapshot_file)
+
+        with snapshot.Snapshot(test.snapshot_file) as scene_snapshot:
+            test.assertEqual(summary(original), summary(scene_snapshot.to_scene()))
+            test.assertEqual({"node": "node-1.1"}, scene_snapshot.edge(1).start)
+            test.assertEqual({"node": "node-1.2", "socket": ""}, scene_snapshot.edge(1).end)
+            test.assertEqual({"group": "port-1"}, scene_snapshot.edge(2).end)
+
+
+    def test_node_lookup(test):
+        snapshot.write_snapshot(loader.load_scene(test.super_file), test.snapshot_file)
+        with snapshot.Snapshot(test.snapshot_file) as scene_snapshot:
+            for node_id in ("node-1.1", "node-1.2", "node-1.1.1", "standalone"):
+                test.assertEqual(node_id, scene_snapshot.get_node(node_id).id)
+            test.assertEqual("Nœud 1.2", scene_snapshot.get_node("node-1.2").title)
+            test.assertIsNone(scene_snapshot.get_node("missing"))
+            test.assertEqual(
+                ["node-1.1", "node-1.2"], 
+                [scene_snapshot.node_id(index) for index in scene_snapshot.group_node_indexes(0)]
+            )
+
+
+    def test_empty_scene(test):
+        snapshot.write_snapshot(scene.Scene(), test.snapshot_file)
+        with snapshot.Snapshot(test.snapshot_file) as scene_snapshot:
+            test.assertEqual(0, scene_snapshot.node_count)
+            test.assertIsNone(scene_snapshot.get_node("missing"))
+
+
+    def test_not_a_snapshot(test):
+        with test.assertRaises(ValueError):
+            snapshot.Snapshot(test.super_file)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,98 @@
+import random
+import unittest
+
+from src.model import group
+from src.model import node
+from src.model import scene
+from src.model import spatial_index
+
+
+class Set_0_Quadtree(unittest.TestCase):
+    def test_0_query_matches_linear_scan(test):
+        rng = random.Random(0)
+        rects = {i: (rng.uniform(-5000, 5000), rng.uniform(-5000, 5000), 180, 240) for i in range(2000)}
+        tree = spatial_index.Quadtree()
+        tree.bulk_load(list(rects.items()))
+        for _ in range(20):
+            query = (rng.uniform(-5000, 5000), rng.uniform(-5000, 5000), 1500, 1000)
+            expected = {key for key, rect in rects.items() if spatial_index.intersects(query, rect)}
+            test.assertEqual(set(tree.query(query)), expected)
+
+    def test_1_incremental_matches_bulk(test):
+        rng = random.Random(1)
+        tree = spatial_index.Quadtree()
+        rects = dict()
+        for i in range(500):
+            rects[i] = (rng.uniform(-1000, 1000), rng.uniform(-1000, 1000), 10, 10)
+            tree.insert(i, rects[i])
+        for i in range(0, 500, 3):
+            rects[i] = (rng.uniform(-1000, 1000), rng.uniform(-1000, 1000), 10, 10)
+            tree.move(i, rects[i])
+        for i in range(1, 500, 7):
+            tree.remove(i)
+            del rects[i]
+        test.assertEqual(len(tree), len(rects))
+        query = (-500, -500, 1000, 1000)
+        expected = {key for key, rect in rects.items() if spatial_index.intersects(query, rect)}
+        test.assertEqual(set(tree.query(query)), expected)
+
+    def test_2_outside_bounds(test):
+        tree = spatial_index.Quadtree((0, 0, 100, 100))
+        tree.insert("far", (1000, 1000, 10, 10))
+        test.assertEqual(tree.query((995, 995, 10, 10)), ["far"])
+
+
+class Set_1_Spatial_Index(unittest.TestCase):
+    def test_0_levels(test):
+        index = spatial_index.Spatial_Index()
+        index.bulk_load([("a", (0, 0, 10, 10), None, None), ("b", (0, 0, 10, 10), 2, None), ("c", (0, 0, 10, 10), 0, 1)])
+        test.assertEqual(set(index.at(5, 5)), {"a", "b", "c"})
+        test.assertEqual(set(index.at(5, 5, 0)), {"a", "c"})
+        test.assertEqual(set(index.at(5, 5, 3)), {"a", "b"})
+        index.set_levels("b", None, 0)
+        test.assertEqual(set(index.at(5, 5, 0)), {"a", "b", "c"})
+
+
+class Set_2_Scene(unittest.TestCase):
+    def setUp(test):
+        test.scene = scene.Scene()
+        test.outer = group.Group(test.scene, "/0", min_level=0, max_level=None)
+        test.inner = group.Group(test.scene, "/0/0", parent=test.outer, min_level=2, max_level=None)
+        test.outer.groups.append(test.inner.id)
+        test.scene.add_group(test.outer)
+        test.scene.add_group(test.inner)
+        for node_id, owner, x in (("n-0", test.outer, 0), ("n-1", test.inner, 1000), ("n-2", test.inner, 2000)):
+            new_node = node.Node(test.scene, node_id, group=owner.id)
+            new_node.x = x
+            owner.nodes.append(node_id)
+            test.scene.add_node(new_node)
+        test.scene.build_spatial_index()
+
+    def test_0_query_by_level(test):
+        test.assertEqual(set(test.scene.nodes_in((0, 0, 3000, 100))), {"n-0", "n-1", "n-2"})
+        test.assertEqual(test.scene.nodes_in((0, 0, 3000, 100), 1), ["n-0"])
+        test.assertEqual(test.scene.nodes_at(1050, 50, 2), ["n-1"])
+
+    def test_1_group_bounds(test):
+        test.assertEqual(test.inner.rect, (1000, 0, 1000 + node.NODE_WIDTH, node.NODE_HEIGHT))
+        test.assertEqual(test.outer.rect, (0, 0, 2000 + node.NODE_WIDTH, node.NODE_HEIGHT))
+        test.assertEqual(set(test.scene.groups_in((1500, 0, 10, 10))), {"/0", "/0/0"})
+
+    def test_2_move_node(test):
+        test.scene.move_node("n-2", 1000, 5000)
+        test.assertEqual(test.scene.nodes_in((2000, 0, 100, 100)), [])
+        test.assertEqual(test.scene.nodes_at(1050, 5050), ["n-2"])
+        test.assertEqual(test.inner.rect, (1000, 0, node.NODE_WIDTH, 5000 + node.NODE_HEIGHT))
+        test.assertEqual(test.outer.rect, (0, 0, 1000 + node.NODE_WIDTH, 5000 + node.NODE_HEIGHT))
+
+    def test_3_add_node(test):
+        new_node = node.Node(test.scene, "n-3", group=test.inner.id)
+        new_node.x, new_node.y = -500, -500
+        test.inner.nodes.append(new_node.id)
+        test.scene.add_node(new_node)
+        test.assertEqual(test.scene.nodes_at(-450, -450, 2), ["n-3"])
+        test.assertEqual(test.outer.rect[:2], (-500, -500))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from src.model import scene
+from src.ui.export import INDEX_FILE, Scene_Exporter
+from src.ui.level_of_detail import level_scale
+
+COLUMNS = 4
+SPACING = 300
+TILE_PIXELS = 256
+
+
+class Set_0_Scene_Exporter(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.directory = tempfile.TemporaryDirectory()
+        test.model = scene.Scene()
+        test.model.name = "Export"
+        test.model.add_nodes(
+            [f"n-{index}" for index in range(COLUMNS * COLUMNS)],
+            positions=[((index % COLUMNS) * SPACING, (index // COLUMNS) * SPACING) for index in range(COLUMNS * COLUMNS)]
+        )
+        test.exporter = Scene_Exporter(test.model, test.directory.name, tile_pixels=TILE_PIXELS, workers=2)
+
+
+    def tearDown(test) -> None:
+        test.directory.cleanup()
+
+
+    def test_levels_are_cut_into_tiles(test):
+        index = test.exporter.export([-1, 0])
+        test.assertEqual(test.exporter.errors, [])
+        with open(os.path.join(test.directory.name, INDEX_FILE)) as file:
+            test.assertEqual(json.load(file), index)
+        test.assertEqual([entry["level"] for entry in index["levels"]], [-1, 0])
+        for entry in index["levels"]:
+            test.assertAlmostEqual(entry["scale"], level_scale(entry["level"]))
+            tiles = os.listdir(os.path.join(test.directory.name, str(entry["level"])))
+            test.assertEqual(len(tiles), entry["columns"] * entry["rows"])
+            image = QImage(os.path.join(test.directory.name, entry["tiles"].format(column=0, row=0)))
+            test.assertEqual((image.width(), image.height()), (TILE_PIXELS, TILE_PIXELS))
+        test.assertLess(index["levels"][0]["columns"], index["levels"][1]["columns"])
+
+
+    def test_svg_is_one_file_per_level(test):
+        index = test.exporter.export([0], svg=True, scale=0.5)
+        path = os.path.join(test.directory.name, index["levels"][0]["file"])
+        with open(path, encoding="utf-8") as file:
+            test.assertIn("<svg", file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication, QGraphicsScene
+
+from src.model import edge
+from src.model import routing
+from src.model import scene
+from src.model.node import NODE_HEIGHT, NODE_WIDTH
+from src.ui.graphics_edges import Graphics_Edges
+from src.ui.graphics_scene import Graphics_Scene
+from src.ui.level_of_detail import Detail
+
+
+def render(scene, source, size=(400, 400)):
+    image = QImage(*size, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(0)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(image.rect()), source)
+    painter.end()
+    return image
+
+
+class Set_0_Graphics_Edges(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.edges = Graphics_Edges(tile_size=100)
+        test.edges.set_routes([
+            ('a', [(0, 0), (50, 0), (50, 50)], False),
+            ('b', [(1000, 1000), (1100, 1000)], True),
+        ])
+
+
+    def test_routes_are_bucketed_into_tiles(test):
+        test.assertEqual(len(test.edges), 2)
+        test.assertEqual(test.edges.visible_tiles(QRectF(-10, -10, 100, 100)), [(0, 0)])
+        test.assertEqual(test.edges.boundingRect().contains(QRectF(0, 0, 1100, 1000)), True)
+
+
+    def test_detail_decides_the_lines(test):
+        test.assertEqual(len(test.edges.tile_lines((0, 0), Detail.BOX)), 2)
+        test.assertEqual(len(test.edges.tile_lines((0, 0), Detail.POINT)), 1)
+        # Curved connections are drawn as curves at full detail, not as lines.
+        test.assertEqual(test.edges.tile_lines((10, 10), Detail.FULL), [])
+        test.assertEqual(len(test.edges.tile_lines((10, 10), Detail.BOX)), 1)
+
+
+    def test_moving_a_route_changes_its_tile(test):
+        test.edges.tile_lines((0, 0), Detail.BOX)
+        test.edges.set_route('a', [(500, 500), (550, 500)])
+        test.assertEqual(test.edges.tile_lines((0, 0), Detail.BOX), [])
+        test.assertEqual(len(test.edges.tile_lines((5, 5), Detail.BOX)), 1)
+
+        test.edges.remove_route('a')
+        test.assertEqual(len(test.edges), 1)
+        test.assertEqual(test.edges.tile_lines((5, 5), Detail.BOX), [])
+
+
+    def test_removals_shrink_the_bounds(test):
+        test.edges.set_route('c', [(1000, 1000), (1050, 1800)])
+        test.edges.remove_routes(['b', 'c'])
+        test.assertEqual(test.edges.visible_tiles(QRectF(900, 900, 1000, 1000)), [])
+        test.assertEqual(test.edges.boundingRect().united(QRectF(0, 0, 50, 50)), test.edges.boundingRect())
+        test.assertLess(test.edges.boundingRect().right(), 100)
+
+
+    def test_geometry_changes_only_with_the_bounds(test):
+        changes = list()
+        prepare_geometry_change = test.edges.prepareGeometryChange
+        test.edges.prepareGeometryChange = lambda: changes.append(None) or prepare_geometry_change()
+
+        # Moved, added and removed inside the bounds, which stay as they were.
+        test.edges.set_route('a', [(0, 0), (20, 0), (20, 50)])
+        test.edges.set_route('c', [(500, 500), (600, 600)])
+        test.edges.remove_route('c')
+        test.assertEqual(changes, [])
+
+        test.edges.set_route('c', [(500, 500), (1500, 600)])
+        test.assertEqual(len(changes), 1)
+        test.edges.remove_route('c')
+        test.assertEqual(len(changes), 2)
+        test.assertLess(test.edges.boundingRect().right(), 1200)
+
+
+    def test_paints_only_visible_connections(test):
+        scene = QGraphicsScene()
+        scene.addItem(test.edges)
+        image = render(scene, QRectF(-10, -10, 100, 100))
+        test.assertNotEqual(image.pixel(200, 40), 0)
+        test.assertEqual(image.pixel(200, 300), 0)
+
+
+class Set_1_Scene_Edges(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.model = scene.Scene()
+        test.model.add_nodes(["a", "b", "c"], positions=[(0, 0), (1000, 0), (1000, 1000)])
+        test.model.add_edge(edge.Edge(test.model, "a-b", {'node': "a"}, {'node': "b"}))
+        test.model.add_edge(edge.Edge(test.model, "a-c", {'node': "a"}, {'node': "c"}, type="bezier"))
+        test.scene = Graphics_Scene()
+        test.scene.set_model(test.model)
+        test.edges = test.scene.graphics_edges
+
+
+    def test_model_connections_are_drawn(test):
+        test.assertIs(test.edges.scene(), test.scene)
+        test.assertEqual(len(test.edges), 2)
+        test.assertEqual(len(test.edges.tile_lines((0, 0), Detail.BOX)), 2)
+        # Only the bezier is drawn as a curve up close.
+        test.assertEqual(len(test.edges.tile_lines((0, 0), Detail.FULL)), 1)
+        test.assertEqual(test.edges.visible_tiles(QRectF(NODE_WIDTH, 0, 10, NODE_HEIGHT)), [(0, 0)])
+
+
+    def test_connections_follow_their_nodes(test):
+        test.model.move_node("b", 1000, 5000)
+        test.model.journal.flush()
+        test.assertTrue(test.edges.boundingRect().contains(QPointF(1000, 5000 + NODE_HEIGHT / 2)))
+
+        test.scene.history.remove_nodes(["c"])
+        test.model.journal.flush()
+        test.assertEqual(len(test.edges), 1)
+        test.assertLess(test.edges.boundingRect().bottom(), 5000 + NODE_HEIGHT)
+
+
+    def test_routed_connections_follow_the_router(test):
+        test.model.build_spatial_index()
+        router = routing.Router(test.model)
+        router.route_all()
+        test.scene.refresh_edges()
+        segments = sum(len(router.routes[edge_id].points) - 1 for edge_id in ("a-b", "a-c"))
+        test.assertGreater(segments, 2)
+        test.assertEqual(len(test.edges.tile_lines((0, 0), Detail.BOX)), segments)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, QRectF
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmapCache
+from PySide6.QtWidgets import QApplication
+
+from src.ui import graphics_node
+from src.ui import graphics_scene
+
+
+class Set_0_Node_Geometry_Cache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.node = graphics_node.Graphics_Node(title="Node", position=QPoint(10, 20))
+
+
+    def test_paths_are_reused(test):
+        test.assertIs(test.node.paths, test.node.paths)
+
+
+    def test_geometry_change_invalidates_paths(test):
+        for attribute, value in (("width", 100), ("height", 50), ("radius", 2), ("position", QPoint(5, 5))):
+            paths = test.node.paths
+            setattr(test.node, attribute, value)
+            test.assertIsNot(paths, test.node.paths)
+
+        test.assertEqual(QRectF(5, 5, 100, 50), test.node.paths[2].boundingRect())
+        test.assertEqual(QRectF(5, 5, 100, 50), QRectF(test.node.rect))
+        test.assertTrue(test.node.boundingRect().contains(test.node.paths[2].boundingRect()))
+
+
+    def test_cache_modes_paint(test):
+        scene = graphics_scene.Graphics_Scene()
+        image = QImage(400, 400, QImage.Format.Format_ARGB32_Premultiplied)
+        for cache_mode in graphics_node.Cache_Mode:
+            node = graphics_node.Graphics_Node(title="Node", position=QPoint(0, 0), cache_mode=cache_mode)
+            scene.add_node(node)
+            painter = QPainter(image)
+            scene.render(painter, QRectF(image.rect()), QRectF(-50, -50, 400, 400))
+            painter.end()
+            node.remove()
+
+
+    def _render(test, node) -> QImage:
+        scene = graphics_scene.Graphics_Scene()
+        scene.add_node(node)
+        image = QImage(200, 200, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(0)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        scene.render(painter, QRectF(image.rect()), QRectF(-50, -50, 200, 200))
+        painter.end()
+        node.remove()
+        return image
+
+
+    def test_shared_pixmap_keeps_the_outer_border(test):
+        images = [
+            test._render(graphics_node.Graphics_Node(title="Node", position=QPoint(0, 0), cache_mode=cache_mode))
+            for cache_mode in (graphics_node.Cache_Mode.NONE, graphics_node.Cache_Mode.SHARED)
+        ]
+        # Half the border pen lies outside the node's rect, left of x = 0 in the scene.
+        outside = QPoint(49, 50 + test.node.height // 2)
+        test.assertNotEqual(0, images[0].pixel(outside))
+        test.assertEqual(images[0].pixel(outside), images[1].pixel(outside))
+
+
+    def test_shared_pixmap_is_keyed_by_border_color(test):
+        QPixmapCache.clear()
+        pixels = list()
+        for color in ("red", "blue"):
+            node = graphics_node.Graphics_Node(title="Node", position=QPoint(0, 0), cache_mode=graphics_node.Cache_Mode.SHARED)
+            node._default_border_pen.setColor(QColor(color))
+            pixels.append(test._render(node).pixel(QPoint(50, 50 + node.height // 2)))
+        test.assertNotEqual(pixels[0], pixels[1])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,133 @@
+import os
+import resource
+import unittest
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, QRectF
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmap
+from PySide6.QtWidgets import QApplication, QGraphicsScene
+
+from src.ui import graphics_node
+from src.ui import graphics_scene
+
+REPAINTS = 200
+NO_INDEX = QGraphicsScene.ItemIndexMethod.NoIndex
+BSP_TREE_INDEX = QGraphicsScene.ItemIndexMethod.BspTreeIndex
+
+
+def render(scene, image, source):
+    painter = QPainter(image)
+    scene.render(painter, QRectF(image.rect()), source)
+    painter.end()
+
+
+class Set_0_Scene_Repaint(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.scene = graphics_scene.Graphics_Scene()
+        test.image = QImage(640, 480, QImage.Format.Format_ARGB32_Premultiplied)
+
+
+    def test_repaint_adds_no_items(test):
+        render(test.scene, test.image, QRectF(-320, -240, 640, 480))
+        item_count = len(test.scene.items())
+
+        for i in range(REPAINTS):
+            render(test.scene, test.image, QRectF(-320 + i, -240 + i, 640, 480))
+
+        test.assertEqual(item_count, len(test.scene.items()))
+
+
+    def test_repaint_memory_is_constant(test):
+        # Warm up the grid tile cache before measuring.
+        render(test.scene, test.image, QRectF(-320, -240, 640, 480))
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        for i in range(REPAINTS):
+            render(test.scene, test.image, QRectF(-320 + i, -240 + i, 640, 480))
+
+        # ru_maxrss is in kilobytes on Linux; allow for allocator noise only.
+        test.assertLess(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_rss, 8 * 1024)
+
+
+    def test_origin_marker_is_not_an_item(test):
+        test.assertIn(test.scene.origin_marker, test.scene.overlay.decorations)
+        test.assertEqual(0, len(test.scene.items()))
+
+
+    def test_grid_tiles_meet_at_fractional_zoom(test):
+        scale, period = 0.373, 100
+        tile = QPixmap(int(np.ceil(period * scale)), int(np.ceil(period * scale)))
+        tile.fill(QColor(255, 0, 0, 128))
+        test.image.fill(0)
+        painter = QPainter(test.image)
+        painter.translate(0.3, 0.6)
+        painter.scale(scale, scale)
+        test.scene.draw_grid_tiles(painter, QRectF(0, 0, 1000, 1000), tile, period)
+        painter.end()
+        # A gap would leave a pixel clear, and an overlap would draw it twice.
+        alphas = {QColor.fromRgba(test.image.pixel(x, y)).alpha() for x in range(1, 360) for y in range(1, 360)}
+        test.assertEqual({128}, alphas)
+
+
+
+class Set_1_Scene_Positions(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def test_bulk_positions_are_indexed(test):
+        scene = graphics_scene.Graphics_Scene()
+        nodes = [graphics_node.Graphics_Node(f"Node {i}", position=QPoint(0, 300 * i)) for i in range(100)]
+        for node in nodes:
+            scene.add_node(node)
+        scene.items()
+        index_methods = list()
+        set_index_method = scene.setItemIndexMethod
+        scene.setItemIndexMethod = lambda method: index_methods.append(method) or set_index_method(method)
+
+        # A handful of nodes are moved in the index, and all of them with it switched off and rebuilt once.
+        for count, switched in ((10, []), (100, [NO_INDEX, BSP_TREE_INDEX])):
+            index_methods.clear()
+            scene.set_node_positions(nodes[:count], np.array([(1000 * i, 500.4 + count) for i in range(count)]))
+            test.assertEqual(index_methods, switched)
+            test.assertEqual(scene.itemIndexMethod(), BSP_TREE_INDEX)
+            found = [item for item in scene.items(QRectF(3010, 510 + count, 10, 10)) if isinstance(item, graphics_node.Graphics_Node)]
+            test.assertEqual(found, [nodes[3]])
+            test.assertEqual(nodes[3].scene_position, QPoint(3000, 500 + count))
+            # Moved like a drag, so the painter paths are kept.
+            test.assertEqual(nodes[3].position, QPoint(0, 900))
+        test.assertEqual(nodes[50].scene_position, QPoint(50_000, 600))
+
+
+    def test_bulk_removal(test):
+        scene = graphics_scene.Graphics_Scene()
+        nodes = [graphics_node.Graphics_Node(f"Node {i}") for i in range(500)]
+        for node in nodes:
+            scene.add_node(node)
+        changes = list()
+        scene.selectionChanged.connect(lambda: changes.append(len(scene.selectedItems())))
+
+        scene.select_items(nodes[:300])
+        scene.remove_items(scene.selectedItems())
+
+        test.assertEqual(changes, [300, 0])
+        test.assertFalse(any(node.isVisible() for node in nodes[:300]))
+        scene.flush_removed_items()
+        test.assertEqual(len(scene.items()), 2 * 200)
+        test.assertIsNone(nodes[0].scene())
+        test.assertIs(nodes[300].scene(), scene)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
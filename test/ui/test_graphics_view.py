@@ -0,0 +1,47 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, QPointF, Qt
+from PySide6.QtGui import QWheelEvent
+from PySide6.QtWidgets import QApplication, QGraphicsScene, QWidget
+
+from src.ui import graphics_view
+
+
+class Status_Bar_Parent(QWidget):
+    def set_status_bar_text(self, text: str):
+        pass
+
+
+def wheel_event(delta: int) -> QWheelEvent:
+    return QWheelEvent(
+        QPointF(10, 10), QPointF(10, 10), QPoint(0, 0), QPoint(0, delta),
+        Qt.MouseButton.NoButton, Qt.KeyboardModifier.NoModifier, Qt.ScrollPhase.NoScrollPhase, False
+    )
+
+
+class Set_0_View_Scenes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def test_interaction_without_a_graphics_scene(test):
+        view = graphics_view.Graphics_View(Status_Bar_Parent())
+        for scene in (None, QGraphicsScene()):
+            if scene is not None:
+                view.setScene(scene)
+            view.begin_interaction()
+            test.assertEqual(view.renderHints(), graphics_view.INTERACTION_RENDER_HINTS)
+            for _ in range(graphics_view.LARGE_GRID):
+                view.wheelEvent(wheel_event(120))
+            view.end_interaction()
+            test.assertEqual(view.renderHints(), graphics_view.DEFAULT_RENDER_HINTS)
+            view.update_visible_items()
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
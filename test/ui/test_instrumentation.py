@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, QRectF
+from PySide6.QtWidgets import QApplication, QGraphicsView, QWidget
+
+from src.ui import graphics_node
+from src.ui import graphics_scene
+from src.ui import graphics_view
+from src.ui import instrumentation
+
+
+class Status_Bar_Parent(QWidget):
+    def set_status_bar_text(self, text: str):
+        pass
+
+
+class Set_0_Instrumentation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.instruments = instrumentation.INSTRUMENTS
+        test.instruments.clear()
+
+
+    def tearDown(test) -> None:
+        test.instruments.set_enabled(False)
+        test.instruments.clear()
+
+
+    def test_nothing_is_recorded_while_disabled(test):
+        @instrumentation.instrumented("handler")
+        def handler(value):
+            return value * 2
+
+        test.assertEqual(handler(2), 4)
+        test.assertEqual(len(test.instruments.events), 0)
+        test.instruments.set_enabled(True)
+        test.assertEqual(handler(3), 6)
+        test.assertEqual([event["name"] for event in test.instruments.events], ["handler"])
+        test.assertIn("handler", test.instruments.durations)
+
+
+    def test_frames_are_traced(test):
+        parent = Status_Bar_Parent()
+        parent.resize(400, 300)
+        view = graphics_view.Graphics_View(parent)
+        view.resize(400, 300)
+        scene = graphics_scene.Graphics_Scene(view)
+        view.setScene(scene)
+        for index in range(5):
+            scene.add_node(graphics_node.Graphics_Node(f"Node {index}", position=QPoint(index * 50, 0)))
+        view.centerOn(0, 0)
+        parent.show()
+        test.app.processEvents()
+        scene.toggle_hud()
+        test.assertTrue(test.instruments.enabled)
+
+        # The view caches its background, so have it drawn again.
+        view.resetCachedContent()
+        view.viewport().repaint()
+        view.viewport().repaint()
+        counters = test.instruments.frame_counters
+        test.assertGreater(counters.get("painted Graphics_Node", 0), 0)
+        test.assertIn("drawBackground", test.instruments.durations)
+        test.assertIn("frame", test.instruments.durations)
+        test.assertEqual(test.instruments.values["items"], 10)
+        test.assertTrue(any("frame" in line for line in scene.hud.lines()))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            scene.export_trace(path=path)
+            with open(path, encoding="utf-8") as file:
+                trace = json.load(file)
+        phases = {event["ph"] for event in trace["traceEvents"]}
+        test.assertEqual(phases, {"X", "C"})
+
+        scene.toggle_hud()
+        test.assertFalse(test.instruments.enabled)
+        parent.close()
+
+
+    def test_hud_is_repainted_every_frame(test):
+        parent = Status_Bar_Parent()
+        view = graphics_view.Graphics_View(parent)
+        view.resize(400, 300)
+        scene = graphics_scene.Graphics_Scene(view)
+        view.setScene(scene)
+        parent.show()
+        test.app.processEvents()
+        test.assertEqual(view.viewportUpdateMode(), graphics_view.DEFAULT_UPDATE_MODE)
+        scene.toggle_hud()
+        test.assertEqual(view.viewportUpdateMode(), QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+
+        shown = list()
+        paint = scene.hud.paint
+        def record(painter, rect):
+            shown.append((rect, scene.hud.lines()[0]))
+            paint(painter, rect)
+        scene.hud.paint = record
+        for _ in range(5):
+            # A small update, which would otherwise repaint only that corner and leave the HUD as it was.
+            scene.update(QRectF(100, 100, 1, 1))
+            test.app.processEvents()
+        test.assertTrue(all(rect.contains(view.visible_rect().adjusted(1, 1, -1, -1)) for rect, _ in shown))
+        test.assertGreater(len({line for _, line in shown}), 1)
+
+        scene.toggle_hud()
+        test.assertEqual(view.viewportUpdateMode(), graphics_view.DEFAULT_UPDATE_MODE)
+        parent.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
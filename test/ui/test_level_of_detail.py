@@ -0,0 +1,49 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QGraphicsRectItem
+
+from src.ui import level_of_detail
+from src.ui.level_of_detail import Detail
+
+
+class Set_0_Level_Of_Detail(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.lod = level_of_detail.Level_Of_Detail(full_threshold=0.5, box_threshold=0.1)
+
+
+    def test_detail_thresholds(test):
+        test.assertEqual(Detail.FULL, test.lod.detail(1.0))
+        test.assertEqual(Detail.BOX, test.lod.detail(0.2))
+        test.assertEqual(Detail.POINT, test.lod.detail(0.05))
+
+
+    def test_magnification_from_zoom(test):
+        test.assertEqual(0, level_of_detail.magnification_from_zoom(0))
+        test.assertEqual(0, level_of_detail.magnification_from_zoom(4))
+        test.assertEqual(1, level_of_detail.magnification_from_zoom(5))
+        test.assertEqual(-1, level_of_detail.magnification_from_zoom(-1))
+
+
+    def test_level_range_hides_members(test):
+        items = [QGraphicsRectItem() for _ in range(3)]
+        test.lod.add_range(items, min_level=1, max_level=2)
+        test.assertFalse(any(item.isVisible() for item in items))
+
+        test.lod.set_magnification(1)
+        test.assertTrue(all(item.isVisible() for item in items))
+
+        test.lod.set_magnification(3)
+        test.assertFalse(any(item.isVisible() for item in items))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
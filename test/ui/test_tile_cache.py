@@ -0,0 +1,113 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRectF, QThreadPool
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication
+
+from src.model import scene
+from src.ui import graphics_scene
+from src.ui import tile_cache
+from src.ui.constants import TILE_PIXELS
+
+
+class Set_0_Tile_Cache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.model = scene.Scene()
+        test.model.add_nodes(["a", "b"], titles=["A", "B"], positions=[(0, 0), (1000, 0)])
+        test.pool = QThreadPool()
+        test.cache = tile_cache.Tile_Cache(test.model, pool=test.pool)
+
+
+    def finish(test):
+        test.pool.waitForDone()
+        test.app.processEvents()
+
+
+    def test_0_misses_render_in_the_background(test):
+        key = (0, 0, 0, 0)
+        test.assertIsNone(test.cache.tile(key))
+        test.assertEqual((test.cache.hits, test.cache.misses), (0, 1))
+        test.finish()
+        image = test.cache.tile(key)
+        test.assertEqual((test.cache.hits, test.cache.misses), (1, 1))
+        # The first node is drawn in the top left of the tile at scale 1.
+        test.assertNotEqual(image.pixel(10, 50), 0)
+        test.assertEqual(image.pixel(TILE_PIXELS - 10, TILE_PIXELS - 10), 0)
+
+
+    def test_1_lru_budget(test):
+        size = TILE_PIXELS * TILE_PIXELS * 4
+        test.cache.budget = 2 * size
+        for column in range(3):
+            test.cache.request((0, 0, column, 0))
+            test.finish()
+        test.assertEqual(list(test.cache.tiles), [(0, 0, 1, 0), (0, 0, 2, 0)])
+        test.assertEqual((test.cache.size, test.cache.evictions), (2 * size, 1))
+
+
+    def test_2_prefetch(test):
+        view = QRectF(0, 0, TILE_PIXELS, TILE_PIXELS)
+        test.cache.prefetch(view, 1.0, 0, motion=(10, 0))
+        test.assertEqual(set(test.cache.pending), {(0, 0, 1, 0), (0, 0, 1, 1), (0, 0, 2, 0), (0, 0, 2, 1)})
+        test.finish()
+        test.cache.prefetch(view, 1.0, 0, zoom=1)
+        test.assertIn((1, 0, 0, 0), test.cache.pending)
+        test.assertIn((0, 1, 0, 0), test.cache.pending)
+        test.finish()
+
+
+    def test_3_paint_falls_back_to_the_coarser_band(test):
+        test.cache.request((0, 0, 0, 0))
+        test.finish()
+        image = QImage(TILE_PIXELS, TILE_PIXELS, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(0)
+        painter = QPainter(image)
+        painter.scale(2, 2)
+        complete = test.cache.paint(painter, QRectF(0, 0, TILE_PIXELS / 2, TILE_PIXELS / 2), 2.0, 0)
+        painter.end()
+        test.assertFalse(complete)
+        test.assertNotEqual(image.pixel(10, 100), 0)
+        test.finish()
+        test.assertIn((1, 0, 0, 0), test.cache.tiles)
+
+
+class Set_1_Compositing(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def test_items_are_swapped_for_tiles(test):
+        model = scene.Scene()
+        model.add_nodes(["a", "b"], positions=[(0, 0), (300, 0)])
+        test.scene = graphics_scene.Graphics_Scene()
+        test.scene.set_model(model)
+        test.scene.update_visible_items(QRectF(0, 0, 1000, 1000))
+        items = list(test.scene.virtualizer.items.values())
+        test.assertEqual(len(items), 2)
+
+        test.scene.begin_compositing()
+        test.assertFalse(any(item.isVisible() for item in items))
+        image = QImage(200, 200, QImage.Format.Format_ARGB32_Premultiplied)
+        painter = QPainter(image)
+        test.scene.render(painter, QRectF(image.rect()), QRectF(0, 0, 1000, 1000))
+        painter.end()
+        test.assertGreater(test.scene.tile_cache.misses, 0)
+
+        test.scene.end_compositing()
+        test.assertTrue(all(item.isVisible() for item in items))
+        test.scene.tile_cache.pool.waitForDone()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QRectF, Qt
+from PySide6.QtGui import QKeyEvent
+from PySide6.QtWidgets import QApplication
+
+from src.model import group
+from src.model import scene
+from src.ui import graphics_scene
+
+COLUMNS = 50
+SPACING = 200
+
+
+class Set_0_Scene_Virtualizer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(test) -> None:
+        test.app = QApplication.instance() or QApplication([])
+
+
+    def setUp(test) -> None:
+        test.model = scene.Scene()
+        test.model.add_group(group.Group(test.model, "/deep", min_level=2))
+        test.model.add_nodes(
+            [f"n-{index}" for index in range(COLUMNS * COLUMNS)],
+            groups=["/deep" if index == 0 else None for index in range(COLUMNS * COLUMNS)],
+            positions=[((index % COLUMNS) * SPACING, (index // COLUMNS) * SPACING) for index in range(COLUMNS * COLUMNS)]
+        )
+        test.scene = graphics_scene.Graphics_Scene()
+        test.scene.set_model(test.model)
+        test.virtualizer = test.scene.virtualizer
+
+
+    def test_only_visible_nodes_get_items(test):
+        test.scene.update_visible_items(QRectF(0, 0, 1000, 1000))
+        count = len(test.virtualizer)
+        test.assertGreater(count, 0)
+        test.assertLess(count, COLUMNS * COLUMNS / 10)
+        # A title for each node, and the item drawing the connections.
+        test.assertEqual(len(test.scene.items()), count * 2 + 1)
+        # The first node is in a group which is only visible from magnification 2.
+        test.assertNotIn("n-0", test.virtualizer.items)
+        test.scene.set_magnification(2)
+        test.scene.update_visible_items(QRectF(0, 0, 1000, 1000))
+        test.assertIn("n-0", test.virtualizer.items)
+
+
+    def test_panning_recycles_items(test):
+        test.scene.update_visible_items(QRectF(1000, 1000, 1000, 1000))
+        created = len(test.scene.items())
+        for step in range(1, 20):
+            test.scene.update_visible_items(QRectF(1000 + step * 400, 1000 + step * 300, 1000, 1000))
+        test.assertLessEqual(len(test.scene.items()), created * 1.2)
+        item = test.virtualizer.items[f"n-{(1000 + 19 * 300) // SPACING * COLUMNS + (1000 + 19 * 400) // SPACING}"]
+        test.assertTrue(item.isVisible())
+        test.assertEqual(item.position.x(), 1000 + 19 * 400)
+
+
+    def test_drags_are_written_back(test):
+        test.scene.update_visible_items(QRectF(0, 0, 1000, 1000))
+        test.virtualizer.items["n-1"].setPos(5000, 0)
+        test.scene.update_visible_items(QRectF(20_000, 20_000, 1000, 1000))
+        test.assertNotIn("n-1", test.virtualizer.items)
+        test.assertEqual(test.model.nodes["n-1"].x, SPACING + 5000)
+
+
+    def test_edits_are_followed(test):
+        test.scene.update_visible_items(QRectF(0, 0, 1000, 1000))
+        test.model.move_node(f"n-{COLUMNS * COLUMNS - 1}", 100, 100)
+        test.model.set_node_title("n-1", "Renamed")
+        test.model.remove_node("n-2")
+        test.model.move_node("n-3", 30_000, 30_000)
+        test.model.journal.flush()
+
+        items = test.virtualizer.items
+        test.assertEqual(items[f"n-{COLUMNS * COLUMNS - 1}"].position.x(), 100)
+        test.assertEqual(items["n-1"].title, "Renamed")
+        test.assertNotIn("n-2", items)
+        test.assertNotIn("n-3", items)
+
+
+    def test_deletes_can_be_undone(test):
+        test.scene.update_visible_items(QRectF(0, 0, 1000, 1000))
+        test.virtualizer.items["n-1"].setSelected(True)
+        test.scene.delete_selected(QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_Delete, Qt.KeyboardModifier.NoModifier))
+        test.model.journal.flush()
+        test.assertNotIn("n-1", test.model)
+        test.assertNotIn("n-1", test.virtualizer.items)
+
+        test.scene.undo()
+        test.model.journal.flush()
+        test.assertIn("n-1", test.virtualizer.items)
+
+
+if __name__ == '__main__':
+    unittest.main()